@@ -103,6 +103,10 @@ DATABASES = {
     }
 }
 
+# PostgreSQL에서는 검색(movies.search_index)이 쓰는 trigram_similar 등 lookup 등록 (psycopg 필요)
+if DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+    INSTALLED_APPS.append('django.contrib.postgres')
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -149,6 +153,87 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 TMDB_API_KEY = os.getenv('TMDB_API_KEY')
 TMDB_BASE_URL = os.getenv('TMDB_BASE_URL', 'https://api.themoviedb.org/3')
 
+# TMDB HTTP 커넥션 풀 설정
+TMDB_HTTP_POOL_SIZE = int(os.getenv('TMDB_HTTP_POOL_SIZE', '10'))
+TMDB_HTTP_MAX_RETRIES = int(os.getenv('TMDB_HTTP_MAX_RETRIES', '3'))
+TMDB_HTTP_BACKOFF_FACTOR = float(os.getenv('TMDB_HTTP_BACKOFF_FACTOR', '0.5'))
+TMDB_HTTP_TIMEOUT = (3.05, 10)  # (connect, read) 초
+
+# TMDB 응답 캐시 (1단계: 프로세스 LRU, 2단계: Django 캐시 백엔드)
+# 워커 간 공유하려면 CACHES에 Redis/Memcached 등을 지정하고 TMDB_CACHE_ALIAS로 선택
+TMDB_CACHE_ALIAS = 'default'
+TMDB_CACHE_MAX_ENTRIES = 1024
+TMDB_CACHE_STALE_TTL = 60 * 10  # TTL 만료 후 백그라운드 갱신하며 재사용할 시간(초)
+TMDB_CACHE_TTLS = {
+    'genres': 60 * 60 * 24,
+    'details': 60 * 60 * 6,
+    'lists': 60 * 15,
+    'search': 60 * 5,
+}
+
+# TMDB 클라이언트 측 속도 제한 (토큰 버킷)
+# shared=True 이면 TMDB_CACHE_ALIAS 캐시로 워커 전체 초당 요청 수도 제한
+TMDB_RATE_LIMIT = {
+    'rate': int(os.getenv('TMDB_RATE_LIMIT_RATE', '40')),  # 초당 요청 수
+    'burst': 40,
+    'shared': os.getenv('TMDB_RATE_LIMIT_SHARED', 'False') == 'True',
+    'max_wait': {'high': 10.0, 'normal': 5.0, 'low': 0.0},  # 우선순위별 최대 대기(초)
+    'low_priority_headroom': 0.25,  # 낮은 우선순위는 버킷에 25% 이상 남아 있을 때만 사용
+}
+
+# 이중 언어 검색
+TMDB_BILINGUAL_CONCURRENT = os.getenv('TMDB_BILINGUAL_CONCURRENT', 'False') == 'True'  # 한/영 동시 검색
+TMDB_SEARCH_WORKERS = 8  # 동시 검색 스레드 수
+
+# 비동기 TMDB 클라이언트 (ASGI)
+TMDB_ASYNC_MAX_CONNECTIONS = 100
+
+# 카탈로그 일괄 적재 (manage.py ingest_tmdb_catalog)
+TMDB_INGEST_WORKERS = 8  # 상세 정보 동시 요청 수 (속도 제한은 TMDB_RATE_LIMIT가 적용)
+TMDB_INGEST_MAX_ATTEMPTS = 3  # 상세 조회 실패 영화를 다음 실행에서 다시 시도하는 최대 횟수
+
+# 성격 분석 보고서/점수 캐시 (키에 사용자별 평점 버전이 들어가므로 평점이 바뀌면 자동 무효화)
+PERSONALITY_CACHE_ALIAS = 'default'
+PERSONALITY_CACHE_TTL = 60 * 60 * 24
+
+# 분석 이메일 발송 큐 (manage.py run_email_worker)
+ANALYSIS_EMAIL_FROM = 'noreply@movie-personality.com'
+ANALYSIS_EMAIL_MAX_ATTEMPTS = 5
+ANALYSIS_EMAIL_RETRY_BACKOFF = 30  # 첫 재시도까지 대기(초), 이후 2배씩 증가
+ANALYSIS_EMAIL_CLAIM_TIMEOUT = 60 * 10  # 워커가 이 시간 안에 끝내지 못한 작업은 다른 워커가 다시 가져감
+
+# 로컬 영화 검색 색인: 'auto'(SQLite=FTS5, PostgreSQL=pg_trgm) | 'fts5' | 'postgres' | 'icontains'
+MOVIE_SEARCH_BACKEND = os.getenv('MOVIE_SEARCH_BACKEND', 'auto')
+
+# 자동완성 메모리 색인 (프로세스별, 다른 프로세스의 영화 저장은 주기적 재구축으로 반영)
+AUTOCOMPLETE_MAX_RESULTS = 20
+AUTOCOMPLETE_REFRESH_SECONDS = 60 * 10
+
+# 목록 API 페이지 크기 (movie_list, preferences GET의 ?page_size=, 다음 페이지는 ?cursor=)
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# 평점 일괄 가져오기/내보내기 (preferences/import/, preferences/export/)
+RATING_IMPORT_CHUNK_SIZE = 500  # 영화 조회/평점 upsert 한 묶음 크기
+RATING_IMPORT_MAX_ROWS = 50_000  # 요청 하나에 허용하는 최대 줄 수
+RATING_EXPORT_CHUNK_SIZE = 2000  # 내보내기 시 DB에서 한 번에 읽는 행 수
+
+# 임시 영화 상세 정보 채우기 (manage.py run_movie_backfill, 동시 요청 수는 TMDB_INGEST_WORKERS)
+MOVIE_BACKFILL_MAX_ATTEMPTS = 5
+MOVIE_BACKFILL_RETRY_BACKOFF = 60  # 첫 재시도까지 대기(초), 이후 2배씩 증가
+MOVIE_BACKFILL_CLAIM_TIMEOUT = 60 * 10
+
+# 평점 기반 추천 (manage.py build_recommendations로 이웃 미리 계산)
+RECOMMENDER_NEIGHBORS = 50  # 영화마다 저장할 유사 영화 수
+RECOMMENDER_MAX_SEED_RATINGS = 200  # 추천 근거로 쓰는 최근 평점 수
+
+# 콘텐츠 기반 유사 영화 (manage.py build_similar_movies로 이웃 미리 계산)
+SIMILAR_MOVIES_NEIGHBORS = 20  # 영화마다 저장할 유사 영화 수
+
+# 성격 점수가 비슷한 사용자 메모리 색인 (프로세스별 KD-트리, 주기적으로 백그라운드 재구축)
+SIMILAR_USERS_MAX_RESULTS = 50
+SIMILAR_USERS_REFRESH_SECONDS = 60 * 10
+
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
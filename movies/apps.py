@@ -0,0 +1,13 @@
+# movies/apps.py - movies 앱 설정
+from django.apps import AppConfig
+from django.core.signals import request_started
+
+
+class MoviesConfig(AppConfig):
+    name = 'movies'
+    verbose_name = '영화'
+
+    def ready(self):
+        # 자동완성 색인은 첫 검색어 입력 전에 백그라운드로 미리 구축 (서버 프로세스의 첫 요청 때 시작)
+        from .autocomplete import WARM_UP_DISPATCH_UID, warm_up_on_first_request
+        request_started.connect(warm_up_on_first_request, dispatch_uid=WARM_UP_DISPATCH_UID)
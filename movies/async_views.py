@@ -0,0 +1,145 @@
+# movies/async_views.py - ASGI에서 실행되는 비동기 뷰
+#
+# DRF의 @api_view는 async 함수를 지원하지 않으므로 Django 기본 async 뷰로 작성한다.
+# 응답 형식은 views.py의 동기 버전과 동일하다. (WSGI에서도 동작하지만 이점은 ASGI에서만 있음)
+
+import asyncio
+import json
+import traceback
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponseNotAllowed, JsonResponse
+
+from .movie_backfill import get_or_create_placeholder
+from .personality_profile import save_rating
+from .search_index import search_local_movies
+from .serialization import movie_detail_queryset, serialize_db_movie, serialize_tmdb_movie
+from .tmdb_async import async_tmdb_service
+
+
+@sync_to_async
+def _search_db_movies(query):
+    # Django 4.2의 async 반복은 prefetch_related를 지원하지 않아 스레드에서 조회
+    return search_local_movies(query, limit=5, queryset=movie_detail_queryset())
+
+
+async def search_movies_tmdb_async(request):
+    """search_movies_tmdb의 비동기 버전 - DB 검색과 TMDB 검색을 동시에 진행"""
+    # Django 4.2의 require_GET 등은 async 뷰를 지원하지 않아 직접 확인
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+
+    try:
+        query = request.GET.get('search', '').strip()
+        if not query:
+            return JsonResponse({
+                'success': False,
+                'error': '검색어를 입력해주세요.',
+                'results': []
+            }, status=400)
+
+        print(f"🔍 비동기 뷰에서 영화 검색: '{query}'")
+
+        db_movies, tmdb_results = await asyncio.gather(
+            _search_db_movies(query),
+            async_tmdb_service.search_movies(query),
+        )
+        movie_data = [serialize_db_movie(movie) for movie in db_movies]
+
+        existing_tmdb_ids = {movie.tmdb_id for movie in db_movies}
+        for tmdb_movie in tmdb_results[:10]:  # 최대 10개
+            if tmdb_movie['id'] not in existing_tmdb_ids:
+                movie_data.append(serialize_tmdb_movie(tmdb_movie))
+
+        return JsonResponse({
+            'success': True,
+            'results': movie_data,
+            'count': len(movie_data),
+            'message': f"'{query}' 검색 완료 (총 {len(movie_data)}개)",
+            'debug': {
+                'db_results': len(db_movies),
+                'tmdb_results': len(movie_data) - len(db_movies),
+                'api_key_configured': bool(async_tmdb_service.api_key)
+            }
+        })
+
+    except Exception as e:
+        print(f"❌ search_movies_tmdb_async 오류: {e}")
+        traceback.print_exc()
+        return JsonResponse({
+            'success': False,
+            'error': f'검색 실패: {str(e)}',
+            'results': []
+        }, status=500)
+
+
+async def save_tmdb_movie_async(request):
+    """save_tmdb_movie의 비동기 버전 (세션 인증 필요)"""
+    if request.method != 'POST':
+        return HttpResponseNotAllowed(['POST'])
+
+    try:
+        user = await sync_to_async(lambda: request.user if request.user.is_authenticated else None)()
+        if user is None:
+            return JsonResponse({
+                'success': False,
+                'error': '로그인이 필요합니다.'
+            }, status=401)
+
+        try:
+            data = json.loads(request.body or b'{}')
+        except ValueError:
+            data = request.POST
+
+        tmdb_id = data.get('tmdb_id')
+        rating = data.get('rating')
+
+        if not tmdb_id or not rating:
+            return JsonResponse({
+                'success': False,
+                'error': 'tmdb_id와 rating이 필요합니다.'
+            }, status=400)
+
+        try:
+            rating = int(rating)
+            if rating not in [1, 2, 3, 4, 5]:
+                raise ValueError()
+        except (ValueError, TypeError):
+            return JsonResponse({
+                'success': False,
+                'error': 'rating은 1-5 사이의 정수여야 합니다.'
+            }, status=400)
+
+        try:
+            tmdb_id = int(tmdb_id)
+            if tmdb_id <= 0:
+                raise ValueError()
+        except (ValueError, TypeError):
+            return JsonResponse({
+                'success': False,
+                'error': 'tmdb_id는 양의 정수여야 합니다.'
+            }, status=400)
+
+        # DB에 없으면 임시 영화를 만들고 TMDB 상세 조회는 예약만 한다 (run_movie_backfill이 채움)
+        movie, details_pending = await sync_to_async(get_or_create_placeholder)(tmdb_id)
+
+        # 평점 저장 + 성격 프로필 증분 갱신 (트랜잭션이 필요해 스레드에서 실행)
+        await sync_to_async(save_rating)(user, movie, rating)
+
+        return JsonResponse({
+            'success': True,
+            'message': f'{movie.title or tmdb_id} 평점이 저장되었습니다.',
+            'movie': {
+                'id': movie.id,
+                'title': movie.title,
+                'genres': [genre.name async for genre in movie.genres.all()],
+                'details_pending': details_pending,
+            }
+        })
+
+    except Exception as e:
+        print(f"❌ TMDB 영화 비동기 저장 오류: {e}")
+        return JsonResponse({
+            'success': False,
+            'error': f'저장 실패: {str(e)}'
+        }, status=500)
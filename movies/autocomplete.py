@@ -0,0 +1,259 @@
+# movies/autocomplete.py - 입력 중 검색어 자동완성용 메모리 내 접두어 색인
+import heapq
+import logging
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import connection
+
+from .models import Movie
+
+logger = logging.getLogger(__name__)
+
+# 한글 음절 분해 (유니코드 음절 = 0xAC00 + (초성*21 + 중성)*28 + 종성)
+_HANGUL_BASE, _HANGUL_LAST = 0xAC00, 0xD7A3
+_CHOSEONG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+_JUNGSEONG = ['ㅏ', 'ㅐ', 'ㅑ', 'ㅒ', 'ㅓ', 'ㅔ', 'ㅕ', 'ㅖ', 'ㅗ', 'ㅗㅏ', 'ㅗㅐ', 'ㅗㅣ', 'ㅛ', 'ㅜ', 'ㅜㅓ', 'ㅜㅔ',
+              'ㅜㅣ', 'ㅠ', 'ㅡ', 'ㅡㅣ', 'ㅣ']
+_JONGSEONG = ['', 'ㄱ', 'ㄲ', 'ㄱㅅ', 'ㄴ', 'ㄴㅈ', 'ㄴㅎ', 'ㄷ', 'ㄹ', 'ㄹㄱ', 'ㄹㅁ', 'ㄹㅂ', 'ㄹㅅ', 'ㄹㅌ', 'ㄹㅍ',
+              'ㄹㅎ', 'ㅁ', 'ㅂ', 'ㅂㅅ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ']
+# 사용자가 직접 입력한 겹모음/겹받침 자모도 같은 방식으로 풀어 쓴다
+_COMPOUND_JAMO = {
+    'ㅘ': 'ㅗㅏ', 'ㅙ': 'ㅗㅐ', 'ㅚ': 'ㅗㅣ', 'ㅝ': 'ㅜㅓ', 'ㅞ': 'ㅜㅔ', 'ㅟ': 'ㅜㅣ', 'ㅢ': 'ㅡㅣ',
+    'ㄳ': 'ㄱㅅ', 'ㄵ': 'ㄴㅈ', 'ㄶ': 'ㄴㅎ', 'ㄺ': 'ㄹㄱ', 'ㄻ': 'ㄹㅁ', 'ㄼ': 'ㄹㅂ', 'ㄽ': 'ㄹㅅ', 'ㄾ': 'ㄹㅌ',
+    'ㄿ': 'ㄹㅍ', 'ㅀ': 'ㄹㅎ', 'ㅄ': 'ㅂㅅ',
+}
+
+WARM_UP_DISPATCH_UID = 'autocomplete-warm-up'
+
+# 이 길이 이하의 짧은 접두어는 일치 범위가 넓으므로 상위 k개를 계산해 두고 재사용
+SHORT_PREFIX_LEN = 3
+
+
+def normalize_title(text):
+    """자동완성 키: 소문자, 한글은 자모 단위로 분해, 공백/문장부호 제거
+
+    '기생충' -> 'ㄱㅣㅅㅐㅇㅊㅜㅇ' 이므로 입력 중인 '깃', '기새' 도 접두어로 일치한다.
+    """
+    chars = []
+    for char in unicodedata.normalize('NFC', text or '').lower():
+        code = ord(char)
+        if _HANGUL_BASE <= code <= _HANGUL_LAST:
+            offset = code - _HANGUL_BASE
+            chars.append(_CHOSEONG[offset // 588])
+            chars.append(_JUNGSEONG[offset % 588 // 28])
+            chars.append(_JONGSEONG[offset % 28])
+        elif char in _COMPOUND_JAMO:
+            chars.append(_COMPOUND_JAMO[char])
+        elif char.isalnum():
+            chars.append(char)
+    return ''.join(chars)
+
+
+def title_keys(*titles):
+    """제목의 각 단어 시작 위치부터의 키 ('다크 나이트' -> 다크나이트, 나이트)"""
+    keys = set()
+    for title in titles:
+        words = [normalize_title(word) for word in (title or '').split()]
+        words = [word for word in words if word]
+        for i in range(len(words)):
+            keys.add(''.join(words[i:]))
+    return keys
+
+
+class TitlePrefixIndex:
+    """정렬된 (키, 영화 id) 배열 위의 접두어 검색
+
+    - 조회: bisect로 접두어 범위를 찾고 인기도 상위 k개 (짧은 접두어는 결과를 메모)
+    - 갱신: 영화 저장/삭제 시 해당 영화 키만 insort/삭제 - 전체 재구축 없음
+    - 프로세스마다 하나씩 있으므로 다른 프로세스의 저장은 AUTOCOMPLETE_REFRESH_SECONDS 주기 재구축으로 반영
+    """
+
+    def __init__(self, refresh_seconds=None, max_results=None):
+        self.refresh_seconds = (
+            refresh_seconds if refresh_seconds is not None
+            else getattr(settings, 'AUTOCOMPLETE_REFRESH_SECONDS', 60 * 10)
+        )
+        self.max_results = max_results or getattr(settings, 'AUTOCOMPLETE_MAX_RESULTS', 20)
+        self._lock = threading.RLock()
+        self._keys = []  # [(키, 영화 id)] 정렬 유지
+        self._movies = {}  # 영화 id -> (인기도, 응답용 dict, 키 목록)
+        self._top_cache = {}  # 짧은 접두어 -> 인기도 순 영화 id 목록 (최대 max_results개)
+        self._built_at = None
+        self._build_lock = threading.Lock()  # 구축은 한 번에 하나만 (조회는 _lock만 잡으므로 막히지 않음)
+        self._pending = None  # 구축 중 들어온 갱신/삭제 영화 id - 교체 후 다시 적용
+
+    # ---- 구축/갱신 ---------------------------------------------------------
+
+    def rebuild(self):
+        """목록에 나오는 영화 전체(Movie.objects.listed())로 다시 구축. 반환값: 색인한 영화 수"""
+        with self._build_lock:
+            return self._rebuild()
+
+    def _rebuild(self):
+        started = time.perf_counter()
+        with self._lock:
+            self._pending = set()  # 아래 조회 이후의 변경을 놓치지 않도록 조회 전에 기록 시작
+        try:
+            movies, keys = {}, []
+            for row in self._movie_rows(Movie.objects.listed()):
+                movie_id, entry = self._entry(row)
+                movies[movie_id] = entry
+                keys.extend((key, movie_id) for key in entry[2])
+            keys.sort()
+        except Exception:
+            with self._lock:
+                self._pending = None
+            raise
+        with self._lock:
+            self._movies, self._keys = movies, keys
+            self._top_cache.clear()
+            self._built_at = time.monotonic()
+            pending, self._pending = self._pending, None
+        # 구축하는 동안 저장/삭제된 영화는 새 색인에 빠져 있을 수 있으므로 현재 DB 값으로 다시 반영
+        self.update_movies(pending)
+        logger.info(f"자동완성 색인 구축: 영화 {len(movies)}편, 키 {len(keys)}개, "
+                    f"구축 중 변경 {len(pending)}편, {time.perf_counter() - started:.2f}초")
+        return len(movies)
+
+    def update_movies(self, movie_ids):
+        """영화들의 키를 현재 DB 값으로 교체 (커밋 후 저장 시그널 / 일괄 저장 경로에서 호출)
+
+        DB에 없거나 목록에서 빠진 영화는 색인에서도 빠진다.
+        """
+        if not movie_ids:
+            return
+        with self._lock:
+            if self._pending is not None:
+                self._pending.update(movie_ids)
+            if self._built_at is None:
+                return  # 첫 구축 전이면 구축이 끝난 뒤 위 기록으로 반영된다
+        rows = self._movie_rows(Movie.objects.listed().filter(id__in=movie_ids))
+        with self._lock:
+            self._remove(movie_ids)
+            for row in rows:
+                movie_id, entry = self._entry(row)
+                self._movies[movie_id] = entry
+                for key in entry[2]:
+                    insort(self._keys, (key, movie_id))
+                self._invalidate(entry[2])
+
+    def remove_movies(self, movie_ids):
+        with self._lock:
+            if self._pending is not None:
+                self._pending.update(movie_ids)  # 교체 후 update_movies가 DB에 없는 영화를 다시 지운다
+            if self._built_at is not None:
+                self._remove(movie_ids)
+
+    def _remove(self, movie_ids):
+        for movie_id in movie_ids:
+            entry = self._movies.pop(movie_id, None)
+            if entry is None:
+                continue
+            for key in entry[2]:
+                position = bisect_left(self._keys, (key, movie_id))
+                if position < len(self._keys) and self._keys[position] == (key, movie_id):
+                    del self._keys[position]
+            self._invalidate(entry[2])
+
+    def _invalidate(self, keys):
+        for key in keys:
+            for length in range(1, SHORT_PREFIX_LEN + 1):
+                self._top_cache.pop(key[:length], None)
+
+    @staticmethod
+    def _movie_rows(queryset):
+        return list(queryset.order_by().values_list(
+            'id', 'tmdb_id', 'title', 'original_title', 'release_date', 'poster_path', 'popularity'))
+
+    @staticmethod
+    def _entry(row):
+        movie_id, tmdb_id, title, original_title, release_date, poster_path, popularity = row
+        suggestion = {
+            'id': movie_id,
+            'tmdb_id': tmdb_id,
+            'title': title,
+            'original_title': original_title,
+            'year': release_date.year if release_date else None,
+            'poster_url': f"https://image.tmdb.org/t/p/w500{poster_path}" if poster_path else '',
+        }
+        return movie_id, (popularity, suggestion, sorted(title_keys(title, original_title)))
+
+    # ---- 조회 ---------------------------------------------------------------
+
+    def ensure_built(self):
+        built_at = self._built_at
+        if built_at is None:
+            # 미리 구축(warm_up)이 진행 중이면 중복 구축 없이 끝나기를 기다린다
+            with self._build_lock:
+                if self._built_at is None:
+                    self._rebuild()
+        elif self.refresh_seconds and time.monotonic() - built_at > self.refresh_seconds:
+            self._built_at = time.monotonic()  # 다른 요청이 중복으로 재구축하지 않도록 먼저 갱신
+            self._start_background(self.rebuild)
+
+    def warm_up(self):
+        """첫 조회를 기다리지 않고 백그라운드에서 첫 구축 시작"""
+        if self._built_at is None:
+            self._start_background(self.ensure_built)
+
+    def _start_background(self, build):
+        threading.Thread(target=self._build_in_background, args=(build,),
+                         name='autocomplete-rebuild', daemon=True).start()
+
+    @staticmethod
+    def _build_in_background(build):
+        try:
+            build()
+        except Exception as e:
+            logger.warning(f"자동완성 색인 구축 실패 (기존 색인 유지, 첫 조회 때 다시 시도): {e}")
+        finally:
+            connection.close()  # 스레드 전용 DB 연결 정리
+
+    def suggest(self, query, limit=10):
+        """접두어가 일치하는 영화를 인기도 순으로 최대 limit개"""
+        prefix = normalize_title(query)
+        if not prefix:
+            return []
+        limit = max(1, min(limit, self.max_results))
+        self.ensure_built()
+        with self._lock:
+            if len(prefix) <= SHORT_PREFIX_LEN:
+                ranked = self._top_cache.get(prefix)
+                if ranked is None:
+                    ranked = self._top_cache[prefix] = self._rank(prefix, self.max_results)
+            else:
+                ranked = self._rank(prefix, limit)
+            return [self._movies[movie_id][1] for movie_id in ranked[:limit]]
+
+    def _rank(self, prefix, limit):
+        start = bisect_left(self._keys, (prefix,))
+        end = bisect_left(self._keys, (prefix + '\U0010ffff',), start)
+        movie_ids = {movie_id for _, movie_id in self._keys[start:end]}
+        return heapq.nlargest(limit, movie_ids, key=lambda movie_id: self._movies[movie_id][0])
+
+    def info(self):
+        with self._lock:
+            return {
+                'movies': len(self._movies),
+                'keys': len(self._keys),
+                'cached_prefixes': len(self._top_cache),
+                'built': self._built_at is not None,
+            }
+
+
+# 전역 자동완성 색인 인스턴스
+title_index = TitlePrefixIndex()
+
+
+def warm_up_on_first_request(**kwargs):
+    """request_started 수신기 (apps.MoviesConfig.ready에서 연결) - 프로세스의 첫 요청 때 한 번만 백그라운드 구축 시작
+
+    관리 명령(migrate 등)에서는 요청이 없으므로 DB를 건드리지 않는다.
+    """
+    request_started.disconnect(dispatch_uid=WARM_UP_DISPATCH_UID)
+    title_index.warm_up()
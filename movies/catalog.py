@@ -0,0 +1,140 @@
+# movies/catalog.py - TMDB 응답을 Movie/Genre 테이블에 일괄 저장
+import logging
+
+from django.db import transaction
+from django.utils.dateparse import parse_date
+
+from .autocomplete import title_index
+from .models import Genre, Movie, MovieDetailRequest, UserPersonalityProfile
+from .personality_profile import apply_genre_links
+from .search_index import index_movies
+from .services import MovieCategoryMapper
+
+logger = logging.getLogger(__name__)
+
+# TMDB 상세 응답에서 그대로 옮기는 Movie 필드 + 카테고리 점수 필드
+MOVIE_UPDATE_FIELDS = [
+    'title', 'original_title', 'overview', 'release_date', 'poster_path', 'backdrop_path',
+    'vote_average', 'vote_count', 'popularity', 'adult', 'video', 'runtime',
+    'melodrama_score', 'comic_score', 'violent_score', 'imaginative_score', 'exciting_score',
+]
+
+
+def movie_fields_from_tmdb(movie_data):
+    """TMDB 응답을 Movie 필드 dict로 변환 (카테고리 점수 포함)"""
+    genre_ids = [genre['id'] for genre in movie_data.get('genres', [])] or movie_data.get('genre_ids', [])
+    try:
+        release_date = parse_date(movie_data.get('release_date') or '')
+    except ValueError:
+        release_date = None
+
+    return {
+        'title': movie_data.get('title') or movie_data.get('original_title', ''),
+        'original_title': movie_data.get('original_title') or '',
+        'overview': movie_data.get('overview') or '',
+        'release_date': release_date,
+        'poster_path': movie_data.get('poster_path') or '',
+        'backdrop_path': movie_data.get('backdrop_path') or '',
+        'vote_average': movie_data.get('vote_average') or 0.0,
+        'vote_count': movie_data.get('vote_count') or 0,
+        'popularity': movie_data.get('popularity') or 0.0,
+        'adult': movie_data.get('adult', False),
+        'video': movie_data.get('video', False),
+        'runtime': movie_data.get('runtime'),
+        **MovieCategoryMapper.calculate_category_scores(genre_ids),
+    }
+
+
+def upsert_tmdb_movies(payloads, batch_size=500):
+    """TMDB 상세 응답 여러 개를 한 트랜잭션으로 저장
+
+    batch_size편마다 쿼리 수가 고정된다 (영화 수와 장르 수에 무관):
+    - 기존 영화 수 조회 1회 (생성/수정 집계용)
+    - Genre upsert 1회 + pk 조회 1회
+    - Movie upsert 1회 (bulk_create(update_conflicts=True)) + pk 조회 1회
+    - 장르 연결(through 테이블) 삭제 1회 + bulk_create 1회
+    - 성격 특성 점수 갱신 3회 (영화/장르 조회 + bulk_update)
+    - 이 영화들을 평가한 사용자의 분석 캐시 무효화 1회
+    - 검색 색인(FTS5) 교체: 영화 조회 1회 + 삭제/삽입 executemany
+    배치로 나누는 이유는 DB의 바인드 변수 수 제한(SQLite 등) 때문이다.
+    반환값: (생성 수, 수정 수)
+    """
+    payloads = [payload for payload in payloads if payload and payload.get('id')]
+    if not payloads:
+        return 0, 0
+
+    # 같은 영화가 여러 번 들어오면 마지막 응답 사용
+    payloads = list({payload['id']: payload for payload in payloads}.values())
+
+    created = updated = 0
+    with transaction.atomic():
+        for start in range(0, len(payloads), batch_size):
+            batch_created, batch_updated = _upsert_batch(payloads[start:start + batch_size])
+            created += batch_created
+            updated += batch_updated
+    return created, updated
+
+
+def _upsert_batch(payloads):
+    tmdb_ids = [payload['id'] for payload in payloads]
+    existing = Movie.objects.filter(tmdb_id__in=tmdb_ids).count()
+
+    genres_by_tmdb_id = _upsert_genres(payloads)
+
+    # created_at은 update_fields에 없으므로 기존 행의 값이 유지된다
+    Movie.objects.bulk_create(
+        [Movie(tmdb_id=payload['id'], **movie_fields_from_tmdb(payload)) for payload in payloads],
+        update_conflicts=True,
+        unique_fields=['tmdb_id'],
+        update_fields=MOVIE_UPDATE_FIELDS + ['updated_at'],
+    )
+    # 충돌로 갱신된 행은 백엔드에 따라 pk가 채워지지 않으므로 다시 조회
+    movie_ids = dict(Movie.objects.filter(tmdb_id__in=tmdb_ids).order_by().values_list('tmdb_id', 'id'))
+
+    # 상세 응답에 장르 정보가 있는 영화만 연결을 교체
+    with_genres = [payload for payload in payloads if 'genres' in payload]
+    Through = Movie.genres.through
+    links = Through.objects.filter(movie_id__in=[movie_ids[payload['id']] for payload in with_genres])
+    old_links = set(links.values_list('movie_id', 'genre__name'))
+    links.delete()
+    Through.objects.bulk_create([
+        Through(movie_id=movie_ids[payload['id']], genre_id=genres_by_tmdb_id[genre['id']])
+        for payload in with_genres
+        for genre in payload['genres']
+    ], ignore_conflicts=True)
+    new_links = set(links.values_list('movie_id', 'genre__name'))
+
+    # bulk 경로는 m2m_changed 시그널이 없으므로 성격 특성 점수와 평가한 사용자 프로필을 직접 갱신
+    Movie.objects.filter(id__in=movie_ids.values()).refresh_personality_scores()
+    apply_genre_links(old_links - new_links, -1)
+    apply_genre_links(new_links - old_links, +1)
+    UserPersonalityProfile.bump_ratings_version(movie_ids=[movie_ids[payload['id']] for payload in with_genres])
+
+    # 임시 영화였다면 상세 정보가 채워졌으므로 예약을 지워 목록/검색에 나오게 한다 (조회 실패로 포기한 것 포함)
+    MovieDetailRequest.objects.filter(tmdb_id__in=tmdb_ids).delete()
+
+    # bulk_create는 post_save를 보내지 않으므로 검색/자동완성 색인도 직접 갱신
+    # 롤백된 upsert의 색인 행/제목이 남지 않도록 upsert_tmdb_movies 트랜잭션이 커밋된 뒤에
+    ids = list(movie_ids.values())
+    transaction.on_commit(lambda: index_movies(ids))
+    transaction.on_commit(lambda: title_index.update_movies(ids))
+
+    return len(payloads) - existing, existing
+
+
+def _upsert_genres(payloads):
+    """응답에 등장한 장르를 upsert하고 {tmdb_id: pk} 반환"""
+    names = {}
+    for payload in payloads:
+        for genre in payload.get('genres', []):
+            names[genre['id']] = genre.get('name', '')
+    if not names:
+        return {}
+
+    Genre.objects.bulk_create(
+        [Genre(tmdb_id=tmdb_id, name=name) for tmdb_id, name in names.items()],
+        update_conflicts=True,
+        unique_fields=['tmdb_id'],
+        update_fields=['name'],
+    )
+    return dict(Genre.objects.filter(tmdb_id__in=names).values_list('tmdb_id', 'id'))
@@ -0,0 +1,194 @@
+# movies/content_similarity.py - 장르/카테고리 기반 유사 영화 (콘텐츠 기반, 미리 계산)
+"""영화마다 카테고리 점수 5개 + 장르 원-핫 + 인기도를 한 행으로 묶은 float32 행렬을 만들고,
+코사인 유사도 상위 k개를 MovieNeighbor(kind='content')에 저장해 조회는 인덱스 한 번으로 끝낸다.
+
+- 특징: 카테고리/장르 묶음을 각각 단위 길이로 맞춘 뒤 가중치를 곱하고, 행 전체를 다시 단위 길이로
+  (그래서 행렬 곱 하나가 곧 코사인 유사도). 장르도 카테고리도 없는 임시 영화는 제외한다
+- 계산: 영화 묶음 × 전체 영화 행렬 곱 (묶음 크기는 BLOCK_CELLS로 제한 - 메모리 사용량 일정)
+- 갱신: 마지막 계산 이후 수정된 영화의 목록과, 그 영화 때문에 상위 k가 바뀔 수 있는 영화의 목록만
+  다시 계산 (refresh_content_neighbors). 코사인은 대칭이라 수정된 영화 묶음의 곱에서 바로 판단된다
+"""
+import logging
+import time
+
+import numpy as np
+from django.conf import settings
+from django.db.models import Count, Max, Min
+from django.utils import timezone
+
+from .models import Movie, MovieNeighbor
+from .recommender import save_neighbors
+from .serialization import movie_list_queryset
+
+logger = logging.getLogger(__name__)
+
+CATEGORY_SCORE_FIELDS = ['melodrama_score', 'comic_score', 'violent_score', 'imaginative_score', 'exciting_score']
+# 특징 묶음 가중치 - 장르가 같으면 가장 비슷하고, 인기도는 비슷한 점수 사이의 순서를 가르는 정도
+CATEGORY_WEIGHT = 1.0
+GENRE_WEIGHT = 1.5
+POPULARITY_WEIGHT = 0.2
+POPULARITY_SCALE = 1000.0  # log1p(인기도) / log1p(이 값)을 0~1로 잘라 쓴다 (다른 영화와 무관하게 정규화)
+BLOCK_CELLS = 4_000_000  # 묶음 유사도 행렬(묶음 영화 수 × 전체 영화 수) 최대 칸 수
+FULL_REFRESH_RATIO = 0.3  # 수정된 영화가 이 비율을 넘으면 변경분 대신 전체 계산
+
+
+def _unit_rows(block):
+    norms = np.linalg.norm(block, axis=1, keepdims=True)
+    return np.divide(block, norms, out=np.zeros_like(block), where=norms > 0)
+
+
+class ContentFeatures:
+    """영화별 특징 벡터 행렬 (행 = movie_ids 순서, 행마다 단위 길이)"""
+
+    def __init__(self, movie_ids, categories, popularity, link_movies, link_genres):
+        movie_ids = np.asarray(movie_ids, dtype=np.int64)
+        categories = np.asarray(categories, dtype=np.float32).reshape(len(movie_ids), len(CATEGORY_SCORE_FIELDS))
+        popularity = np.asarray(popularity, dtype=np.float32)
+
+        # 장르 원-핫 (id 순서로 정렬된 영화에 대해 searchsorted로 행 위치 계산)
+        genres, genre_col = np.unique(np.asarray(link_genres, dtype=np.int64), return_inverse=True)
+        link_rows = np.searchsorted(movie_ids, np.asarray(link_movies, dtype=np.int64))
+        one_hot = np.zeros((len(movie_ids), len(genres)), dtype=np.float32)
+        one_hot[link_rows, genre_col] = 1.0
+
+        keep = one_hot.any(axis=1) | categories.any(axis=1)
+        scaled_popularity = np.clip(np.log1p(np.maximum(popularity, 0)) / np.log1p(POPULARITY_SCALE), 0, 1)
+        matrix = np.hstack([
+            np.sqrt(CATEGORY_WEIGHT) * _unit_rows(categories[keep]),
+            np.sqrt(GENRE_WEIGHT) * _unit_rows(one_hot[keep]),
+            np.sqrt(POPULARITY_WEIGHT) * scaled_popularity[keep, None],
+        ])
+        self.movie_ids = movie_ids[keep]  # 행 인덱스 -> Movie id (오름차순)
+        self.matrix = np.ascontiguousarray(_unit_rows(matrix), dtype=np.float32)
+        self.n_items = len(self.movie_ids)
+
+    @classmethod
+    def from_db(cls, chunk_size=20_000):
+        """영화 1쿼리 + 장르 연결 1쿼리로 적재"""
+        columns = 2 + len(CATEGORY_SCORE_FIELDS)
+        rows = Movie.objects.order_by('id').values_list('id', 'popularity', *CATEGORY_SCORE_FIELDS).iterator(
+            chunk_size=chunk_size)
+        table = np.array(list(rows), dtype=np.float64).reshape(-1, columns)
+        movie_ids = table[:, 0].astype(np.int64)
+        links = np.fromiter(
+            Movie.genres.through.objects.values_list('movie_id', 'genre_id').iterator(chunk_size=chunk_size),
+            dtype=[('movie', np.int64), ('genre', np.int64)],
+        )
+        # 영화를 읽은 뒤 추가된 영화의 장르 연결은 다음 갱신 때 반영
+        links = links[np.isin(links['movie'], movie_ids)]
+        return cls(movie_ids, table[:, 2:], table[:, 1], links['movie'], links['genre'])
+
+    def rows_for(self, movie_ids):
+        """Movie id 목록 -> 행 인덱스 (특징이 없어 제외된 영화는 빠진다)"""
+        return np.flatnonzero(np.isin(self.movie_ids, np.asarray(movie_ids, dtype=np.int64)))
+
+
+def content_neighbors(features, rows=None, k=20, reach=None):
+    """행 rows(기본: 전체)의 코사인 상위 k개 이웃 - (행, 이웃 행 배열, 유사도 배열)을 차례로
+
+    reach가 주어지면 각 영화가 rows 중 어느 영화와 가장 비슷한지(열별 최댓값)를 누적한다.
+    """
+    rows = np.arange(features.n_items) if rows is None else np.asarray(rows, dtype=np.int64)
+    top = min(k, features.n_items - 1)
+    block_size = max(1, BLOCK_CELLS // max(features.n_items, 1))
+    for start in range(0, len(rows), block_size):
+        block = rows[start:start + block_size]
+        similarity = features.matrix[block] @ features.matrix.T
+        similarity[np.arange(len(block)), block] = -np.inf  # 자기 자신 제외
+        if reach is not None:
+            np.maximum(reach, similarity.max(axis=0), out=reach)
+        if top <= 0:
+            continue
+        candidates = np.argpartition(-similarity, top - 1, axis=1)[:, :top]
+        for row, item in enumerate(block):
+            neighbor = candidates[row]
+            score = similarity[row, neighbor]
+            keep = score > 0
+            neighbor, score = neighbor[keep], score[keep].astype(np.float64)
+            order = np.argsort(-score, kind='stable')
+            yield item, neighbor[order], score[order]
+
+
+def affected_rows(features, reach, changed_rows, thresholds, listing_rows):
+    """수정된 영화 때문에 상위 k가 바뀔 수 있는 (수정되지 않은) 영화 행
+
+    - 수정된 영화와의 유사도가 현재 k번째 유사도(thresholds)보다 크면 새로 들어올 수 있다
+    - 현재 목록에 수정된 영화가 있으면(listing_rows) 그 유사도가 바뀌었거나 빠져야 한다
+    """
+    affected = reach > thresholds
+    affected[listing_rows] = True
+    affected[changed_rows] = False
+    return np.flatnonzero(affected)
+
+
+# ---- DB 저장/조회 ----------------------------------------------------------
+
+def _incremental_neighbors(features, changed_rows, changed_ids, k):
+    reach = np.full(features.n_items, -np.inf, dtype=np.float32)
+    yield from content_neighbors(features, changed_rows, k=k, reach=reach)
+
+    # 목록이 k개보다 짧은 영화는 양수 유사도면 무엇이든 들어갈 수 있다
+    thresholds = np.zeros(features.n_items, dtype=np.float32)
+    stats = (
+        MovieNeighbor.objects.filter(kind=MovieNeighbor.KIND_CONTENT).values('movie_id')
+        .annotate(count=Count('id'), low=Min('score')).filter(count__gte=k).values_list('movie_id', 'low')
+    )
+    for movie_id, low in stats:
+        row = np.searchsorted(features.movie_ids, movie_id)
+        if row < features.n_items and features.movie_ids[row] == movie_id:
+            thresholds[row] = low
+    listing = MovieNeighbor.objects.filter(
+        kind=MovieNeighbor.KIND_CONTENT, neighbor_id__in=changed_ids.tolist()).values_list('movie_id', flat=True)
+    listing_rows = features.rows_for(list(set(listing)))
+
+    rows = affected_rows(features, reach, changed_rows, thresholds, listing_rows)
+    logger.info(f"콘텐츠 이웃 변경분: 수정된 영화 {len(changed_rows)}편, 영향받은 영화 {len(rows)}편")
+    yield from content_neighbors(features, rows, k=k)
+
+
+def refresh_content_neighbors(full=False, k=None):
+    """콘텐츠 기반 이웃 재계산 - 기본은 마지막 계산 이후 수정된 영화와 그 영향을 받는 영화만
+
+    반환값: (다시 계산한 영화 수, 소요 초)
+    """
+    started = time.perf_counter()
+    k = k or getattr(settings, 'SIMILAR_MOVIES_NEIGHBORS', 20)
+    kind = MovieNeighbor.KIND_CONTENT
+    last_computed = None if full else MovieNeighbor.objects.filter(kind=kind).aggregate(
+        last=Max('computed_at'))['last']
+
+    computed_at = timezone.now()
+    features = ContentFeatures.from_db()
+    changed_ids = None
+    if last_computed is not None:
+        changed_ids = np.fromiter(
+            Movie.objects.filter(updated_at__gt=last_computed).values_list('id', flat=True), dtype=np.int64)
+        if not changed_ids.size:
+            return 0, time.perf_counter() - started
+        if changed_ids.size > FULL_REFRESH_RATIO * max(features.n_items, 1):
+            changed_ids = None
+
+    if changed_ids is None:
+        # 특징이 없어진(장르가 모두 빠진) 영화나 삭제된 영화의 목록 정리
+        MovieNeighbor.objects.filter(kind=kind).exclude(movie_id__in=features.movie_ids.tolist()).delete()
+        neighbor_iter = content_neighbors(features, k=k)
+    else:
+        dropped = np.setdiff1d(changed_ids, features.movie_ids)
+        if dropped.size:
+            MovieNeighbor.objects.filter(kind=kind, movie_id__in=dropped.tolist()).delete()
+        neighbor_iter = _incremental_neighbors(features, features.rows_for(changed_ids), changed_ids, k)
+
+    saved = save_neighbors(features, neighbor_iter, kind=kind, computed_at=computed_at)
+    elapsed = time.perf_counter() - started
+    logger.info(f"콘텐츠 기반 이웃 계산: 영화 {saved}편 ({'전체' if changed_ids is None else '변경분'}), "
+                f"{elapsed:.1f}초")
+    return saved, elapsed
+
+
+def similar_movies_for(movie_id, limit=20):
+    """저장된 콘텐츠 기반 이웃 - [(movie, 유사도)] (이웃 조회 1쿼리 + 영화 정보 1쿼리)"""
+    neighbors = list(
+        MovieNeighbor.objects.filter(kind=MovieNeighbor.KIND_CONTENT, movie_id=movie_id)
+        .order_by('rank').values_list('neighbor_id', 'score')[:limit])
+    movies = movie_list_queryset().in_bulk([neighbor_id for neighbor_id, _ in neighbors])
+    return [(movies[neighbor_id], score) for neighbor_id, score in neighbors if neighbor_id in movies]
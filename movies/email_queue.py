@@ -0,0 +1,110 @@
+# movies/email_queue.py - 성격 분석 이메일 발송 큐 (DB 기반, 외부 브로커 불필요)
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import AnalysisEmailJob
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FROM_EMAIL = 'noreply@movie-personality.com'
+
+
+def enqueue_analysis_email(to_email, username):
+    """발송 작업만 저장하고 바로 반환 (실제 발송은 run_email_worker)"""
+    return AnalysisEmailJob.objects.create(to_email=to_email, username=username)
+
+
+def claim_jobs(batch_size):
+    """발송할 작업을 batch_size개까지 이 워커에 할당
+
+    대기 중이고 재시도 시각이 지난 작업, 또는 할당된 뒤 CLAIM_TIMEOUT이 지나도록
+    끝나지 않은(워커가 죽은) 작업을 가져온다. 상태 조건을 건 update로 할당하므로
+    워커가 여러 개여도 같은 작업을 두 번 보내지 않는다.
+    """
+    now = timezone.now()
+    claim_timeout = getattr(settings, 'ANALYSIS_EMAIL_CLAIM_TIMEOUT', 60 * 10)
+    claimable = (
+        Q(status=AnalysisEmailJob.STATUS_PENDING, available_at__lte=now)
+        | Q(status=AnalysisEmailJob.STATUS_SENDING, claimed_at__lt=now - timedelta(seconds=claim_timeout))
+    )
+    with transaction.atomic():
+        candidates = list(AnalysisEmailJob.objects.filter(claimable).values_list('id', flat=True)[:batch_size])
+        claimed = AnalysisEmailJob.objects.filter(claimable, id__in=candidates).update(
+            status=AnalysisEmailJob.STATUS_SENDING, claimed_at=now)
+    if not claimed:
+        return []
+    return list(AnalysisEmailJob.objects.filter(id__in=candidates, claimed_at=now,
+                                                status=AnalysisEmailJob.STATUS_SENDING))
+
+
+def process_batch(batch_size=50):
+    """작업 한 묶음을 SMTP 연결 하나로 발송. 반환값: (성공 수, 실패 수)"""
+    jobs = claim_jobs(batch_size)
+    if not jobs:
+        return 0, 0
+
+    # 보고서는 평점 버전별로 캐시되므로 같은 사용자 작업이 여러 개여도 한 번만 계산
+    from .mcp_tools import MoviePersonalityTools
+    tools = MoviePersonalityTools()
+    from_email = getattr(settings, 'ANALYSIS_EMAIL_FROM', DEFAULT_FROM_EMAIL)
+
+    sent = failed = 0
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+        for job in jobs:
+            try:
+                message = EmailMessage(
+                    subject=f'{job.username}님의 영화 성격 분석 결과',
+                    body=tools.generate_personality_report(job.username),
+                    from_email=from_email,
+                    to=[job.to_email],
+                    connection=connection,
+                )
+                message.send()
+            except Exception as e:  # SMTP/보고서 생성 오류 모두 재시도 대상
+                _mark_failed(job, e)
+                failed += 1
+            else:
+                _mark_sent(job)
+                sent += 1
+    except Exception as e:
+        # 연결 자체가 안 되면 남은 작업을 모두 재시도로 돌린다
+        for job in jobs:
+            if job.status == AnalysisEmailJob.STATUS_SENDING:
+                _mark_failed(job, e)
+                failed += 1
+    finally:
+        connection.close()
+    return sent, failed
+
+
+def _mark_sent(job):
+    job.status = AnalysisEmailJob.STATUS_SENT
+    job.attempts += 1
+    job.sent_at = timezone.now()
+    job.last_error = ''
+    job.save(update_fields=['status', 'attempts', 'sent_at', 'last_error'])
+
+
+def _mark_failed(job, error):
+    """최대 시도 횟수 전까지는 지수 백오프로 다시 대기열에 넣는다"""
+    max_attempts = getattr(settings, 'ANALYSIS_EMAIL_MAX_ATTEMPTS', 5)
+    backoff = getattr(settings, 'ANALYSIS_EMAIL_RETRY_BACKOFF', 30)
+
+    job.attempts += 1
+    job.last_error = str(error)
+    if job.attempts >= max_attempts:
+        job.status = AnalysisEmailJob.STATUS_FAILED
+        logger.error(f"분석 이메일 발송 포기 (job {job.id}, {job.attempts}회): {error}")
+    else:
+        job.status = AnalysisEmailJob.STATUS_PENDING
+        job.available_at = timezone.now() + timedelta(seconds=backoff * 2 ** (job.attempts - 1))
+        logger.warning(f"분석 이메일 발송 실패, 재시도 예약 (job {job.id}, {job.attempts}회): {error}")
+    job.save(update_fields=['status', 'attempts', 'last_error', 'available_at'])
@@ -0,0 +1,90 @@
+# movies/management/commands/analyze_all_users.py
+"""전체 사용자 성격 점수 일괄 계산 (야간 배치용)
+
+    python manage.py analyze_all_users --workers 4 --shard-size 500 --time-budget 1800
+
+평점이 있는 사용자를 user_id 구간(샤드)으로 나눠 프로세스 풀에서 계산하고
+UserPersonalityProfile에 저장한다. --time-budget을 넘기면 새 샤드는 시작하지 않고
+이미 시작한 샤드만 마무리한다 (이미 저장된 샤드 결과는 유지).
+SQLite는 동시 쓰기에 약하므로 운영 DB가 SQLite라면 --workers 1을 권장한다.
+"""
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from movies.personality_batch import analyze_user_shard, init_worker, user_id_shards
+
+
+class Command(BaseCommand):
+    help = '모든 사용자의 성격 점수를 계산해 UserPersonalityProfile에 저장합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4, help='프로세스 수 (1이면 현재 프로세스에서 실행)')
+        parser.add_argument('--shard-size', type=int, default=500, help='샤드당 사용자 수')
+        parser.add_argument('--time-budget', type=float, default=None,
+                            help='이 시간(초)이 지나면 새 샤드를 시작하지 않음')
+
+    def handle(self, *args, **options):
+        if options['workers'] < 1 or options['shard_size'] < 1:
+            raise CommandError('--workers, --shard-size는 1 이상이어야 합니다.')
+
+        shards = user_id_shards(options['shard_size'])
+        if not shards:
+            self.stdout.write('평점이 있는 사용자가 없습니다.')
+            return
+
+        started = time.monotonic()
+        budget = options['time_budget']
+        saved = skipped = changed = done = 0
+
+        def over_budget():
+            return budget is not None and time.monotonic() - started > budget
+
+        def report(result):
+            nonlocal saved, skipped, changed, done
+            saved += result[0]
+            skipped += result[1]
+            changed += result[2]
+            done += 1
+            elapsed = time.monotonic() - started
+            self.stdout.write(
+                f"🧠 샤드 {done}/{len(shards)}: 누적 {saved + skipped}명 "
+                f"({(saved + skipped) / max(elapsed, 1e-6):.1f}명/초)"
+            )
+
+        if options['workers'] == 1:
+            for first_id, last_id in shards:
+                if over_budget():
+                    break
+                report(analyze_user_shard(first_id, last_id))
+        else:
+            # fork된 자식이 부모의 DB 연결을 공유하지 않도록 먼저 닫는다
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=options['workers'], initializer=init_worker) as executor:
+                pending_shards = iter(shards)
+                running = set()
+                while True:
+                    while len(running) < options['workers'] and not over_budget():
+                        shard = next(pending_shards, None)
+                        if shard is None:
+                            break
+                        running.add(executor.submit(analyze_user_shard, *shard))
+                    if not running:
+                        break
+                    finished, running = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        report(future.result())
+
+        elapsed = time.monotonic() - started
+        message = (
+            f"✅ 성격 프로필 저장 {saved + skipped}명 (평점 부족 {skipped}명), "
+            f"{elapsed:.1f}초 ({(saved + skipped) / max(elapsed, 1e-6):.1f}명/초)"
+        )
+        if done < len(shards):
+            self.stdout.write(self.style.WARNING(f"⏱️ 시간 예산 초과: {len(shards) - done}개 샤드 미처리"))
+        if changed:
+            # 계산 중 평점이 저장/삭제된 사용자 - 증분 갱신된 기존 프로필이 더 최신이라 그대로 둔다
+            self.stdout.write(f"↪️ 계산 중 평점이 바뀌어 건너뛴 사용자 {changed}명")
+        self.stdout.write(self.style.SUCCESS(message))
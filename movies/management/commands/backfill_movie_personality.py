@@ -0,0 +1,34 @@
+# movies/management/commands/backfill_movie_personality.py
+"""영화별 Big Five 성격 특성 점수 일괄 재계산
+
+    python manage.py backfill_movie_personality
+
+장르 변경은 m2m_changed 시그널로 자동 반영되지만, 필드 추가 직후나 장르 이름/
+매핑(GENRE_PERSONALITY_MAP)이 바뀐 뒤에는 이 명령으로 전체를 다시 계산한다.
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from movies.models import Movie
+
+
+class Command(BaseCommand):
+    help = '모든 영화의 성격 특성 점수(*_score)를 장르 기준으로 다시 계산합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        last_id, total = 0, 0
+        while True:
+            # pk 범위로 잘라 메모리 사용량을 배치 크기로 제한
+            ids = list(Movie.objects.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:batch_size])
+            if not ids:
+                break
+            with transaction.atomic():
+                total += Movie.objects.filter(id__in=ids).refresh_personality_scores(batch_size=batch_size)
+            last_id = ids[-1]
+            self.stdout.write(f"🔄 {total}편 갱신")
+
+        self.stdout.write(self.style.SUCCESS(f"✅ 성격 특성 점수 재계산 완료: {total}편"))
@@ -0,0 +1,78 @@
+# movies/management/commands/benchmark_movie_search.py
+"""로컬 영화 검색 벤치마크: title__icontains 전체 스캔 vs 검색 색인
+
+    python manage.py benchmark_movie_search --movies 100000 --queries 기생 parasite 겨울왕국
+
+합성 영화 N편을 만들고 검색어마다 두 방식의 평균 응답 시간을 비교한다.
+모든 쓰기(영화와 색인 행)는 롤백된다.
+"""
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from movies.models import Movie
+from movies.search_index import create_search_index, index_movies, search_backend, search_local_movies
+
+SYNTHETIC_ID_BASE = 900_000_000
+TITLE_WORDS = ['기생충', '겨울왕국', '어벤져스', '인터스텔라', '올드보이', '라라랜드', '매트릭스', '타이타닉',
+               'Parasite', 'Frozen', 'Avengers', 'Interstellar', 'Oldboy', 'Matrix', 'Titanic', 'Dream']
+OVERVIEW_WORDS = ['가족', '우주', '사랑', '복수', '모험', '비밀', 'family', 'space', 'love', 'revenge', 'secret']
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'title__icontains와 검색 색인의 검색 속도를 비교합니다 (변경 사항은 롤백).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--movies', type=int, default=100_000)
+        parser.add_argument('--queries', nargs='+', default=['기생', 'parasite', '겨울왕국', '우주'])
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"검색 방식: {search_backend()}, 영화 {options['movies']}편")
+        try:
+            with transaction.atomic():
+                create_search_index()  # 색인 테이블이 없던 DB에서는 만든 것도 함께 롤백
+                self._create_movies(options['movies'])
+                self.stdout.write(f"{'검색어':>12}{'방식':>12}{'결과':>6}{'ms':>10}")
+                for query in options['queries']:
+                    self._compare(query, options['repeat'])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _compare(self, query, repeat):
+        runs = {
+            'icontains': lambda: list(Movie.objects.filter(title__icontains=query)[:20]),
+            'index': lambda: search_local_movies(query, limit=20),
+        }
+        for name, run in runs.items():
+            run()  # 워밍업 (페이지 캐시)
+            started = time.perf_counter()
+            for _ in range(repeat):
+                results = run()
+            elapsed = (time.perf_counter() - started) / repeat * 1000
+            self.stdout.write(f"{query:>12}{name:>12}{len(results):>6}{elapsed:>10.2f}")
+
+    @staticmethod
+    def _create_movies(count):
+        rng = random.Random(count)
+        Movie.objects.bulk_create([
+            Movie(
+                tmdb_id=SYNTHETIC_ID_BASE + i,
+                title=f"{' '.join(rng.sample(TITLE_WORDS, 2))} {i}",
+                original_title=rng.choice(TITLE_WORDS),
+                overview=' '.join(rng.choices(OVERVIEW_WORDS, k=12)),
+                popularity=rng.random() * 100,
+            )
+            for i in range(count)
+        ], batch_size=1000)
+        # bulk_create는 시그널을 보내지 않으므로 색인은 직접 채운다
+        ids = list(Movie.objects.filter(tmdb_id__gte=SYNTHETIC_ID_BASE).values_list('id', flat=True))
+        for start in range(0, len(ids), 2000):
+            index_movies(ids[start:start + 2000])
@@ -0,0 +1,119 @@
+# movies/management/commands/benchmark_personality_engine.py
+"""성격 점수 계산 벤치마크: 기존 행 단위 집계 vs 행렬 연산
+
+    python manage.py benchmark_personality_engine --sizes 10 1000 50000
+
+사용자 한 명에 평점 N개를 만든 뒤 두 방식의 소요 시간과 쿼리 수를 비교하고
+결과(장르별 평균, Big Five 점수)가 같은지 확인한다. 모든 쓰기는 롤백된다.
+"""
+import random
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from movies.mcp_tools import AnalysisContext
+from movies.models import GENRE_PERSONALITY_MAP, Genre, Movie, UserMoviePreference
+from movies.personality_engine import PERSONALITY_BASE_SCORE, TRAIT_GENRE_WEIGHTS, RatingMatrix, personality_scores
+
+SYNTHETIC_ID_BASE = 900_000_000
+BENCHMARK_USERNAME = '__personality_benchmark__'
+
+
+class _Rollback(Exception):
+    pass
+
+
+def legacy_scores(user):
+    """기존 구현: 평점마다 장르를 순회하며 dict에 평점 목록을 쌓는 방식"""
+    preferences = UserMoviePreference.objects.filter(user=user).select_related('movie').prefetch_related(
+        'movie__genres')
+    genre_ratings = {}
+    for pref in preferences:
+        for genre in pref.movie.genres.all():
+            genre_ratings.setdefault(genre.name, []).append(pref.rating)
+    averages = {name: round(sum(ratings) / len(ratings), 1) for name, ratings in genre_ratings.items()}
+
+    scores = {}
+    for trait, weights in TRAIT_GENRE_WEIGHTS.items():
+        score = PERSONALITY_BASE_SCORE
+        for genre, weight in weights:
+            if genre in averages:
+                score += (averages[genre] - 3) * weight
+        scores[trait] = max(0, min(100, round(score, 1)))
+    return averages, scores
+
+
+class Command(BaseCommand):
+    help = '성격 점수 계산(기존 방식 vs 행렬 연산)의 쿼리 수와 소요 시간을 측정합니다 (변경 사항은 롤백).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[10, 1000, 50000])
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'평점 수':>10}{'방식':>10}{'쿼리':>8}{'초':>10}")
+        for size in options['sizes']:
+            try:
+                with transaction.atomic():
+                    user = self._create_user_with_ratings(size)
+                    self._compare(user, size)
+                    raise _Rollback
+            except _Rollback:
+                pass
+
+    def _compare(self, user, size):
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            legacy_averages, legacy_traits = legacy_scores(user)
+            elapsed = time.perf_counter() - started
+        self.stdout.write(f"{size:>10}{'legacy':>10}{len(queries):>8}{elapsed:>10.3f}")
+
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            matrix = RatingMatrix.for_user(user)
+            averages = matrix.genre_averages()
+            traits = personality_scores(averages)
+            elapsed = time.perf_counter() - started
+        self.stdout.write(f"{size:>10}{'matrix':>10}{len(queries):>8}{elapsed:>10.3f}")
+
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            # 캐시를 거치지 않고 매번 계산 (롤백된 이전 크기의 결과가 캐시에 남아 있을 수 있다)
+            analysis = AnalysisContext.load(user.username, use_cache=False).analysis
+            elapsed = time.perf_counter() - started
+        self.stdout.write(f"{size:>10}{'analysis':>10}{len(queries):>8}{elapsed:>10.3f}")
+
+        if averages != legacy_averages or traits != legacy_traits:
+            raise CommandError(f'{size}개 평점에서 결과가 기존 구현과 다릅니다.')
+        if 'error' not in analysis and averages != {
+                name: stats['average_rating'] for name, stats in analysis['genre_preferences'].items()}:
+            raise CommandError(f'{size}개 평점에서 get_user_movie_analysis 결과가 다릅니다.')
+
+    @staticmethod
+    def _create_user_with_ratings(size):
+        rng = random.Random(size)
+        user = User.objects.create(username=BENCHMARK_USERNAME)
+
+        genre_names = list(GENRE_PERSONALITY_MAP)
+        Genre.objects.bulk_create([
+            Genre(tmdb_id=SYNTHETIC_ID_BASE + i, name=name) for i, name in enumerate(genre_names)
+        ])
+        genre_ids = list(Genre.objects.filter(tmdb_id__gte=SYNTHETIC_ID_BASE).values_list('id', flat=True))
+
+        Movie.objects.bulk_create([
+            Movie(tmdb_id=SYNTHETIC_ID_BASE + i, title=f'벤치마크 영화 {i}') for i in range(size)
+        ], batch_size=1000)
+        movie_ids = list(Movie.objects.filter(tmdb_id__gte=SYNTHETIC_ID_BASE).values_list('id', flat=True))
+
+        Through = Movie.genres.through
+        Through.objects.bulk_create([
+            Through(movie_id=movie_id, genre_id=genre_id)
+            for movie_id in movie_ids
+            for genre_id in rng.sample(genre_ids, rng.randint(1, 3))
+        ], batch_size=1000)
+        UserMoviePreference.objects.bulk_create([
+            UserMoviePreference(user=user, movie_id=movie_id, rating=rng.randint(1, 5)) for movie_id in movie_ids
+        ], batch_size=1000)
+        return user
@@ -0,0 +1,72 @@
+# movies/management/commands/benchmark_similar_users.py
+"""유사 사용자 KD-트리 오프라인 벤치마크 (DB 사용 안 함)
+
+    python manage.py benchmark_similar_users --users 100000 --neighbors 10 --radius 5
+
+합성 Big Five 점수로 트리를 만든 뒤 상위 k / 반경 조회 시간(p50/p95)을 전체 거리 계산과 비교하고
+두 방식의 결과가 같은지 확인한다.
+"""
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from movies.user_similarity import LEAF_SIZE, TraitKDTree
+
+
+def synthetic_scores(users, seed=0):
+    """실제 분포처럼 50점 근처에 몰리고 0~100으로 잘린 5차원 점수"""
+    rng = np.random.default_rng(seed)
+    return np.clip(rng.normal(50, 15, size=(users, 5)), 0, 100)
+
+
+def brute_force_distances(points, point):
+    diff = points - point
+    return np.sqrt(np.einsum('ij,ij->i', diff, diff))
+
+
+class Command(BaseCommand):
+    help = '합성 성격 점수로 유사 사용자 KD-트리 조회 속도를 전체 탐색과 비교합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100_000)
+        parser.add_argument('--neighbors', type=int, default=10)
+        parser.add_argument('--radius', type=float, default=5.0)
+        parser.add_argument('--leaf-size', type=int, default=LEAF_SIZE)
+        parser.add_argument('--queries', type=int, default=500)
+
+    def handle(self, *args, **options):
+        points = synthetic_scores(options['users'])
+        started = time.perf_counter()
+        tree = TraitKDTree(points, leaf_size=options['leaf_size'])
+        self.stdout.write(f"트리 구축: 사용자 {len(points):,}명, {time.perf_counter() - started:.2f}초")
+
+        k, radius = options['neighbors'], options['radius']
+        rng = np.random.default_rng(1)
+        timings = {'tree_knn': [], 'brute_knn': [], 'tree_radius': [], 'brute_radius': []}
+        for point in points[rng.choice(len(points), size=min(options['queries'], len(points)), replace=False)]:
+            began = time.perf_counter()
+            _, distances = tree.query(point, k)
+            timings['tree_knn'].append(time.perf_counter() - began)
+
+            began = time.perf_counter()
+            all_distances = brute_force_distances(points, point)
+            expected = np.sort(all_distances[np.argpartition(all_distances, k - 1)[:k]])
+            timings['brute_knn'].append(time.perf_counter() - began)
+            if not np.allclose(distances, expected):
+                raise CommandError('상위 k 결과가 전체 탐색과 다릅니다.')
+
+            began = time.perf_counter()
+            found, _ = tree.query_radius(point, radius)
+            timings['tree_radius'].append(time.perf_counter() - began)
+
+            began = time.perf_counter()
+            inside = np.flatnonzero(brute_force_distances(points, point) <= radius)
+            timings['brute_radius'].append(time.perf_counter() - began)
+            if set(found.tolist()) != set(inside.tolist()):
+                raise CommandError('반경 조회 결과가 전체 탐색과 다릅니다.')
+
+        for name, values in timings.items():
+            p50, p95 = np.percentile(np.array(values) * 1000, [50, 95])
+            self.stdout.write(f"  {name:<13} p50 {p50:.3f}ms  p95 {p95:.3f}ms")
+        self.stdout.write(self.style.SUCCESS('✅ KD-트리 결과가 전체 탐색과 일치합니다.'))
@@ -0,0 +1,86 @@
+# movies/management/commands/benchmark_tmdb_upsert.py
+"""TMDB 일괄 저장(upsert_tmdb_movies) 벤치마크
+
+    python manage.py benchmark_tmdb_upsert --sizes 10 1000 100000
+
+합성 TMDB 응답으로 신규 저장과 재저장(전부 갱신)을 각각 측정해 쿼리 수와
+소요 시간을 출력한다. 비교용으로 영화 1편씩 save_movie_from_tmdb를 호출하는
+경로도 --compare-single 로 함께 측정할 수 있다. 모든 쓰기는 롤백된다.
+"""
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from movies.catalog import upsert_tmdb_movies
+from movies.services import MovieCategoryMapper
+from movies.tmdb_service import tmdb_service
+
+# 실제 TMDB id와 겹치지 않는 영역
+SYNTHETIC_ID_BASE = 900_000_000
+
+
+class _Rollback(Exception):
+    pass
+
+
+def synthetic_payloads(count, seed=0):
+    """get_movie_details 형태의 합성 응답 count개"""
+    rng = random.Random(seed)
+    genre_ids = sorted({genre_id for ids in MovieCategoryMapper.GENRE_MAPPINGS.values() for genre_id in ids})
+    payloads = []
+    for i in range(count):
+        genres = rng.sample(genre_ids, rng.randint(1, 3))
+        payloads.append({
+            'id': SYNTHETIC_ID_BASE + i,
+            'title': f'벤치마크 영화 {i}',
+            'original_title': f'Benchmark Movie {i}',
+            'overview': '',
+            'release_date': f'{rng.randint(1950, 2025)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}',
+            'poster_path': '',
+            'backdrop_path': '',
+            'vote_average': round(rng.uniform(0, 10), 1),
+            'vote_count': rng.randint(0, 20000),
+            'popularity': round(rng.uniform(0, 500), 3),
+            'adult': False,
+            'video': False,
+            'runtime': rng.randint(70, 180),
+            'genres': [{'id': genre_id, 'name': f'장르 {genre_id}'} for genre_id in genres],
+        })
+    return payloads
+
+
+class Command(BaseCommand):
+    help = 'TMDB 영화 일괄 저장 경로의 쿼리 수와 소요 시간을 측정합니다 (변경 사항은 롤백).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[10, 1000, 100000])
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--compare-single', action='store_true',
+                            help='영화 1편씩 save_movie_from_tmdb 호출도 측정 (1,000편 이하 크기만)')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'경로':<10}{'영화 수':>10}{'단계':>8}{'쿼리':>10}{'초':>10}{'편/초':>12}")
+        for size in options['sizes']:
+            payloads = synthetic_payloads(size)
+            self._run('bulk', payloads, lambda: upsert_tmdb_movies(payloads, batch_size=options['batch_size']))
+            if options['compare_single'] and size <= 1000:
+                self._run('single', payloads, lambda: [tmdb_service.save_movie_from_tmdb(p) for p in payloads])
+
+    def _run(self, label, payloads, save):
+        try:
+            with transaction.atomic():
+                for phase in ('insert', 'update'):
+                    with CaptureQueriesContext(connection) as queries:
+                        started = time.perf_counter()
+                        save()
+                        elapsed = time.perf_counter() - started
+                    self.stdout.write(
+                        f"{label:<10}{len(payloads):>10}{phase:>8}{len(queries):>10}"
+                        f"{elapsed:>10.3f}{len(payloads) / max(elapsed, 1e-9):>12.0f}"
+                    )
+                raise _Rollback
+        except _Rollback:
+            pass
@@ -0,0 +1,28 @@
+# movies/management/commands/build_recommendations.py
+"""평점 기반 유사 영화(item-item) 계산
+
+    python manage.py build_recommendations          # 마지막 계산 이후 평점이 바뀐 영화만
+    python manage.py build_recommendations --full   # 전체 다시 계산
+
+변경분 갱신은 평점이 바뀐 영화의 이웃 목록만 다시 계산한다. 다른 영화의 목록에서
+그 영화의 순위는 다음 전체 계산 때 반영되므로, 짧은 주기로 변경분을 돌리고
+하루 한 번 정도 --full을 돌리면 된다.
+"""
+from django.core.management.base import BaseCommand
+
+from movies.recommender import refresh_rating_neighbors
+
+
+class Command(BaseCommand):
+    help = '평점으로 영화 간 유사도를 계산해 추천용 이웃 테이블을 갱신합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='모든 영화의 이웃을 다시 계산')
+        parser.add_argument('--neighbors', type=int, default=None, help='영화마다 저장할 이웃 수')
+
+    def handle(self, *args, **options):
+        saved, elapsed = refresh_rating_neighbors(full=options['full'], k=options['neighbors'])
+        if saved:
+            self.stdout.write(self.style.SUCCESS(f"✅ 유사 영화 갱신: {saved}편, {elapsed:.1f}초"))
+        else:
+            self.stdout.write(f"변경된 평점이 없습니다 ({elapsed:.1f}초)")
@@ -0,0 +1,28 @@
+# movies/management/commands/build_similar_movies.py
+"""장르/카테고리 기반 유사 영화 계산
+
+    python manage.py build_similar_movies          # 마지막 계산 이후 수정된 영화와 그 영향을 받는 영화만
+    python manage.py build_similar_movies --full   # 전체 다시 계산
+
+변경분 갱신은 수정된 영화의 목록과, 수정된 영화가 상위 k에 새로 들어가거나 빠질 수 있는
+영화의 목록만 다시 계산하므로 결과는 전체 계산과 같다. 영화 삭제로 짧아진 목록은
+--full 때 다시 채워진다.
+"""
+from django.core.management.base import BaseCommand
+
+from movies.content_similarity import refresh_content_neighbors
+
+
+class Command(BaseCommand):
+    help = '장르/카테고리 점수로 영화 간 코사인 유사도를 계산해 유사 영화 테이블을 갱신합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='모든 영화의 이웃을 다시 계산')
+        parser.add_argument('--neighbors', type=int, default=None, help='영화마다 저장할 이웃 수')
+
+    def handle(self, *args, **options):
+        saved, elapsed = refresh_content_neighbors(full=options['full'], k=options['neighbors'])
+        if saved:
+            self.stdout.write(self.style.SUCCESS(f"✅ 유사 영화 갱신: {saved}편, {elapsed:.1f}초"))
+        else:
+            self.stdout.write(f"수정된 영화가 없습니다 ({elapsed:.1f}초)")
@@ -0,0 +1,60 @@
+# movies/management/commands/check_personality_profiles.py
+"""증분 갱신된 성격 프로필 정합성 검사
+
+    python manage.py check_personality_profiles          # 차이만 출력
+    python manage.py check_personality_profiles --fix    # 다시 계산한 값으로 덮어쓰기
+
+평점 전체로 프로필을 다시 계산해 저장된 UserPersonalityProfile과 비교한다.
+영화 장르가 평점 이후에 바뀌었거나, 시그널 없이 평점을 지운 경우 차이가 생길 수 있다.
+"""
+from django.core.management.base import BaseCommand
+
+from movies.models import UserPersonalityProfile
+from movies.personality_batch import PROFILE_UPDATE_FIELDS, iter_rebuilt_profiles, save_profiles, user_id_shards
+
+COMPARED_FIELDS = [field for field in PROFILE_UPDATE_FIELDS if field != 'computed_at']
+
+
+class Command(BaseCommand):
+    help = '저장된 사용자 성격 프로필을 평점 전체로 다시 계산한 값과 비교합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fix', action='store_true', help='차이가 나는 프로필을 다시 계산한 값으로 저장')
+        parser.add_argument('--shard-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        checked = mismatched = 0
+
+        for first_id, last_id in user_id_shards(options['shard_size']):
+            stored = UserPersonalityProfile.objects.filter(user_id__gte=first_id, user_id__lte=last_id).in_bulk(
+                field_name='user_id')
+            to_fix = []
+            for user_id, fields in iter_rebuilt_profiles(first_id, last_id):
+                checked += 1
+                if self._report_diff(user_id, stored.get(user_id), fields):
+                    mismatched += 1
+                    to_fix.append(UserPersonalityProfile(user_id=user_id, **fields))
+            if options['fix']:
+                # 검사 중 평점이 바뀐 사용자는 건너뛴다 (stored를 평점보다 먼저 읽었다)
+                save_profiles(to_fix, {user_id: profile.ratings_version for user_id, profile in stored.items()})
+
+        summary = f"검사 {checked}명, 불일치 {mismatched}명"
+        if mismatched and options['fix']:
+            self.stdout.write(self.style.SUCCESS(f"✅ {summary} - 모두 다시 계산해 저장했습니다."))
+        elif mismatched:
+            self.stdout.write(self.style.WARNING(f"⚠️ {summary} (--fix로 복구)"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"✅ {summary}"))
+
+    def _report_diff(self, user_id, profile, fields):
+        """차이가 있으면 출력하고 True"""
+        if profile is None:
+            self.stdout.write(f"user {user_id}: 프로필 없음")
+            return True
+        diffs = [
+            f"{field} {getattr(profile, field)!r} -> {fields[field]!r}"
+            for field in COMPARED_FIELDS if getattr(profile, field) != fields[field]
+        ]
+        if diffs:
+            self.stdout.write(f"user {user_id}: " + ', '.join(diffs))
+        return bool(diffs)
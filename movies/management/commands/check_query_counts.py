@@ -0,0 +1,140 @@
+# movies/management/commands/check_query_counts.py
+"""목록/검색 API의 쿼리 수 검사
+
+    python manage.py check_query_counts
+
+합성 영화/평점을 적은 수와 많은 수로 만들어 각 엔드포인트와 성격 분석 도구(보고서 + 점수)를
+호출하고, 쿼리 수가 정해진 값과 같은지(= 결과 수와 무관한지) 확인한다.
+N+1 조회나 COUNT 같은 추가 쿼리가 다시 생기면 실패(종료 코드 1)한다.
+TMDB 호출은 API 키를 비워 건너뛰고, 모든 쓰기는 롤백된다.
+"""
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from movies import views
+from movies.mcp_tools import MoviePersonalityTools
+from movies.models import Genre, Movie, UserMoviePreference, UserPersonalityProfile
+from movies.personality_engine import MIN_RATINGS_FOR_ANALYSIS
+from movies.search_index import index_movies, search_backend
+
+SYNTHETIC_ID_BASE = 900_000_000
+BENCHMARK_USERNAME = '__query_count_check__'
+SEARCH_WORD = '쿼리검사'
+
+
+class _Rollback(Exception):
+    pass
+
+
+def expected_counts():
+    """엔드포인트별 기대 쿼리 수 (FTS5는 색인 조회 1쿼리, PostgreSQL은 검색 savepoint 2쿼리가 더 있다)"""
+    index_query = {'fts5': 1, 'postgres': 2}.get(search_backend(), 0)
+    return {
+        'movie_list': 1,
+        'movie_list ?search=': 1 + index_query,
+        'search_movies_tmdb': 2 + index_query,  # 영화 + 장르 prefetch
+        'preferences GET': 1,
+        # generate_personality_report + calculate_personality_scores (도구 호출마다 사용자+프로필 1쿼리)
+        '보고서+점수 (프로필 생성)': 6,  # + 평점 행렬 2 + 프로필 INSERT/조회 2
+        '보고서+점수 (캐시 없음)': 4,  # + 평점 행렬 2
+        '보고서+점수 (캐시)': 2,
+    }
+
+
+class Command(BaseCommand):
+    help = '목록/검색 API의 쿼리 수가 결과 수와 무관하게 고정인지 검사합니다 (변경 사항은 롤백).'
+
+    def add_arguments(self, parser):
+        # 가장 작은 크기도 성격 분석 최소 편수 이상이어야 보고서 경로를 잰다
+        parser.add_argument('--sizes', type=int, nargs='+', default=[MIN_RATINGS_FOR_ANALYSIS, 50])
+
+    def handle(self, *args, **options):
+        expected = expected_counts()
+        failures = []
+        self.stdout.write(f"{'엔드포인트':<24}{'데이터 수':>10}{'결과':>6}{'쿼리':>6}{'기대':>6}")
+        for size in options['sizes']:
+            try:
+                with transaction.atomic():
+                    user = self._create_data(size)
+                    measured = {**self._measure(user), **self._measure_personality(user)}
+                    for name, (count, results) in measured.items():
+                        ok = count == expected[name]
+                        if not ok:
+                            failures.append(f'{name} ({size}개: {count}쿼리)')
+                        line = f"{name:<24}{size:>10}{results:>6}{count:>6}{expected[name]:>6}"
+                        self.stdout.write(line if ok else self.style.ERROR(line))
+                    raise _Rollback
+            except _Rollback:
+                pass
+
+        if failures:
+            raise CommandError(f"쿼리 수가 기대와 다릅니다: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS("✅ 모든 엔드포인트의 쿼리 수가 고정입니다."))
+
+    def _measure(self, user):
+        factory = APIRequestFactory()
+        calls = {
+            'movie_list': (views.movie_list, '/movies/', {}),
+            'movie_list ?search=': (views.movie_list, '/movies/', {'search': SEARCH_WORD}),
+            'search_movies_tmdb': (views.search_movies_tmdb, '/movies/search/', {'search': SEARCH_WORD}),
+            'preferences GET': (views.preferences_handler, '/movies/preferences/', {}),
+        }
+
+        def call(view, path, params):
+            request = factory.get(path, params)
+            force_authenticate(request, user=user)
+            return view(request)
+
+        measured = {}
+        with override_settings(TMDB_API_KEY=''):
+            for name, args in calls.items():
+                call(*args)  # 워밍업 (검색 색인 테이블 확인 등 프로세스당 1회 쿼리 제외)
+                with CaptureQueriesContext(connection) as queries:
+                    response = call(*args)
+                if response.status_code != 200:
+                    raise CommandError(f'{name} 응답 오류 {response.status_code}: {response.data}')
+                measured[name] = (len(queries), len(response.data['results']))
+        return measured
+
+    @staticmethod
+    def _measure_personality(user):
+        """같은 도구 인스턴스로 보고서와 점수를 차례로 - 프로필이 없을 때, 평점이 바뀐 직후, 캐시 적중"""
+        def call():
+            tools = MoviePersonalityTools()
+            with CaptureQueriesContext(connection) as queries:
+                report = tools.generate_personality_report(user.username)
+                scores = tools.calculate_personality_scores(user.username)
+            if 'error' in scores:
+                raise CommandError(f"성격 분석 오류: {scores['error']}")
+            return len(queries), len(report.splitlines())
+
+        measured = {'보고서+점수 (프로필 생성)': call()}
+        UserPersonalityProfile.bump_ratings_version(user_ids=[user.id])  # 평점 변경과 같은 효과
+        measured['보고서+점수 (캐시 없음)'] = call()
+        measured['보고서+점수 (캐시)'] = call()
+        return measured
+
+    @staticmethod
+    def _create_data(size):
+        user = User.objects.create(username=BENCHMARK_USERNAME)
+        Genre.objects.bulk_create([
+            Genre(tmdb_id=SYNTHETIC_ID_BASE + i, name=f'검사 장르 {i}') for i in range(3)
+        ])
+        Movie.objects.bulk_create([
+            Movie(tmdb_id=SYNTHETIC_ID_BASE + i, title=f'{SEARCH_WORD} 영화 {i}', popularity=float(i))
+            for i in range(size)
+        ])
+        movie_ids = list(Movie.objects.filter(tmdb_id__gte=SYNTHETIC_ID_BASE).values_list('id', flat=True))
+        genre_ids = list(Genre.objects.filter(tmdb_id__gte=SYNTHETIC_ID_BASE).values_list('id', flat=True))
+        Through = Movie.genres.through
+        Through.objects.bulk_create([
+            Through(movie_id=movie_id, genre_id=genre_id) for movie_id in movie_ids for genre_id in genre_ids[:2]
+        ])
+        UserMoviePreference.objects.bulk_create([
+            UserMoviePreference(user=user, movie_id=movie_id, rating=3) for movie_id in movie_ids
+        ])
+        index_movies(movie_ids)  # bulk_create는 시그널이 없으므로 검색 색인 직접 갱신
+        return user
@@ -0,0 +1,190 @@
+# movies/management/commands/check_query_plans.py
+"""뷰/작업에서 자주 실행되는 쿼리의 실행 계획 검사
+
+    python manage.py check_query_plans            # 계획 출력, 전체 스캔이 있으면 실패(종료 코드 1)
+    python manage.py check_query_plans --show-plans  # 통과한 쿼리의 계획도 출력
+
+SQLite는 EXPLAIN QUERY PLAN, PostgreSQL은 enable_seqscan=off 상태의 EXPLAIN으로
+각 쿼리가 인덱스를 쓰는지 확인한다.
+- 뷰: 샘플 데이터를 만들어 실제 뷰를 호출하고, 그때 실행된 SQL을 그대로 검사한다 (쓰기는 롤백)
+- 백그라운드 작업: 작업이 만드는 쿼리셋 모양을 검사한다
+테이블 전체 스캔이나 정렬용 임시 B-tree가 나오면 실패한다. 커서/필터 쿼리는 인덱스를
+처음부터 훑는 것(SCAN ... USING INDEX)도 실패로 보고, 커서 페이지는 정렬 컬럼의
+범위로 인덱스를 검색(SEARCH ... (popularity<?))해야 통과한다.
+"""
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from movies import views
+from movies.models import (
+    AnalysisEmailJob, Movie, MovieDetailRequest, UserMoviePreference, UserPersonalityProfile,
+)
+
+SYNTHETIC_ID_BASE = 900_000_000
+CHECK_USERNAME = '__query_plan_check__'
+SAMPLE_ID = 1
+
+
+def hot_queries():
+    """(이름, 쿼리셋, 허용) - 백그라운드 작업이 만드는 쿼리 모양 그대로 (뷰 쿼리는 view_calls)
+
+    허용: 'sort' = 인덱스로 좁힌 소수의 행만 정렬 (OR 조건 등), 'index-scan' = 조건 없이 인덱스 순서로
+    앞에서부터 읽는 쿼리. 둘 다 없으면 인덱스 범위 검색(SEARCH)이어야 한다.
+    """
+    Through = Movie.genres.through
+    now = timezone.now()
+    return [
+        ('영화 기본 정렬', Movie.objects.all()[:20], {'index-scan'}),
+        ('영화 tmdb_id 조회', Movie.objects.filter(tmdb_id=SAMPLE_ID), set()),
+        ('영화 tmdb_id 일괄 조회 (catalog)', Movie.objects.filter(tmdb_id__in=[SAMPLE_ID, SAMPLE_ID + 1])
+         .order_by().values_list('tmdb_id', 'id'), set()),
+        ('평점 조회 (save_rating)', UserMoviePreference.objects.filter(user_id=SAMPLE_ID, movie_id=SAMPLE_ID), set()),
+        ('영화별 평가 사용자 (캐시 무효화)', UserMoviePreference.objects.filter(movie_id__in=[SAMPLE_ID])
+         .order_by().values('user_id'), set()),
+        ('영화 장르 (through, 영화 기준)', Through.objects.filter(movie_id=SAMPLE_ID).values_list('genre__name'), set()),
+        ('장르별 영화 (through, 장르 기준)', Through.objects.filter(genre_id=SAMPLE_ID).values_list('movie_id'), set()),
+        ('성격 프로필 조회', UserPersonalityProfile.objects.filter(user_id=SAMPLE_ID), set()),
+        ('사용자 조회 (분석 도구)', User.objects.filter(username='sample'), set()),
+        ('이메일 작업 할당 (claim_jobs)', AnalysisEmailJob.objects.filter(
+            Q(status=AnalysisEmailJob.STATUS_PENDING, available_at__lte=now)
+            | Q(status=AnalysisEmailJob.STATUS_SENDING, claimed_at__lt=now)).values_list('id')[:50], {'sort'}),
+        ('영화 상세 예약 할당 (movie_backfill)', MovieDetailRequest.objects.filter(
+            Q(status=MovieDetailRequest.STATUS_PENDING, available_at__lte=now)
+            | Q(status=MovieDetailRequest.STATUS_FETCHING, claimed_at__lt=now)).values_list('id')[:100], {'sort'}),
+    ]
+
+
+def view_calls(movie_id):
+    """(이름, 뷰, 경로, GET 인자, 뷰 인자, 허용, 범위 컬럼)
+
+    cursor 자리는 앞 호출의 응답 커서로 채운다. 범위 컬럼이 있으면 그 컬럼의 범위로 인덱스를
+    검색해야 통과한다 (커서 페이지가 인덱스를 처음부터 다시 훑지 않는지).
+    """
+    return [
+        ('movie_list 첫 페이지', views.movie_list, '/movies/', {'page_size': 1}, {}, {'index-scan'}, None),
+        ('movie_list 다음 페이지 (커서)', views.movie_list, '/movies/', {'page_size': 1, 'cursor': None}, {}, set(),
+         'popularity'),
+        ('preferences GET 첫 페이지', views.preferences_handler, '/movies/preferences/', {'page_size': 1}, {},
+         set(), None),
+        ('preferences GET 다음 페이지 (커서)', views.preferences_handler, '/movies/preferences/',
+         {'page_size': 1, 'cursor': None}, {}, set(), 'created_at'),
+        ('유사 영화 조회 (similar_movies)', views.similar_movies, f'/movies/{movie_id}/similar/', {},
+         {'movie_id': movie_id}, set(), None),
+    ]
+
+
+def explain(sql, params, allow=frozenset()):
+    """실행 계획 줄 목록과 문제(전체 스캔/인덱스 처음부터 훑기/임시 정렬) 목록"""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            plan = [row[-1] for row in cursor.fetchall()]
+            problems = [
+                line for line in plan
+                if (line.startswith('SCAN ') and ('USING' not in line or 'index-scan' not in allow))
+                or ('sort' not in allow and 'USE TEMP B-TREE FOR ORDER BY' in line)
+            ]
+        elif connection.vendor == 'postgresql':
+            # 작은 테이블은 인덱스가 있어도 Seq Scan을 고르므로, 인덱스를 쓸 수 있는지만 본다
+            with transaction.atomic():
+                cursor.execute('SET LOCAL enable_seqscan = off')
+                cursor.execute(f'EXPLAIN {sql}', params)
+                plan = [row[0] for row in cursor.fetchall()]
+            problems = [line.strip() for line in plan if 'Seq Scan' in line]
+            if 'index-scan' not in allow and not any('Index Cond' in line for line in plan):
+                problems.append('인덱스 범위 조건(Index Cond) 없음')
+        else:
+            raise CommandError(f'{connection.vendor} 데이터베이스는 지원하지 않습니다 (sqlite/postgresql).')
+    return plan, problems
+
+
+def _recorder(statements):
+    """뷰가 실행한 (SQL, 인자)를 그대로 모은다
+
+    인자를 채운 문자열(CaptureQueriesContext)로 EXPLAIN하면 SQLite가 상수로 범위를 추론해
+    실제 실행(바인딩 인자)과 다른 계획이 나온다.
+    """
+    def wrapper(execute, sql, params, many, context):
+        statements.append((sql, params))
+        return execute(sql, params, many, context)
+    return wrapper
+
+
+def seeks_on(plan, column):
+    """계획에 column 범위로 인덱스를 검색하는 단계가 있는지 (커서 페이지가 처음부터 훑지 않는지)"""
+    if connection.vendor == 'postgresql':
+        return any('Index Cond' in line and f'{column} <' in line for line in plan)
+    return any(line.startswith('SEARCH ') and f'{column}<' in line for line in plan)
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = '자주 쓰는 쿼리가 인덱스를 타는지 실행 계획으로 검사합니다 (전체 스캔이면 실패).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--show-plans', action='store_true', help='통과한 쿼리의 실행 계획도 출력')
+
+    def handle(self, *args, **options):
+        self.show_plans = options['show_plans']
+        self.failures = []
+        for name, queryset, allow in hot_queries():
+            self._check(name, [queryset.query.sql_with_params()], allow)
+        try:
+            with transaction.atomic():
+                self._check_views()
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        if self.failures:
+            raise CommandError(f"전체 스캔/정렬이 필요한 쿼리 {len(self.failures)}개: {', '.join(self.failures)}")
+        self.stdout.write(self.style.SUCCESS("✅ 모든 쿼리가 인덱스를 사용합니다."))
+
+    def _check(self, name, statements, allow, seek=None):
+        results = [explain(sql, params, allow) for sql, params in statements]
+        missing_seek = seek and not any(seeks_on(plan, seek) for plan, _ in results)
+        if missing_seek or any(problems for _, problems in results):
+            self.failures.append(name)
+            self.stdout.write(self.style.ERROR(f"❌ {name}"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"✅ {name}"))
+        for (sql, _), (plan, problems) in zip(statements, results):
+            if problems or missing_seek or self.show_plans:
+                if len(statements) > 1:
+                    self.stdout.write(f"   {sql[:100]}")
+                for line in plan + [problem for problem in problems if problem not in plan]:
+                    self.stdout.write(f"     {line}")
+        if missing_seek:
+            self.stdout.write(self.style.ERROR(f"     {seek} 범위로 인덱스를 검색하는 쿼리가 없습니다."))
+
+    def _check_views(self):
+        user = User.objects.create(username=CHECK_USERNAME)
+        Movie.objects.bulk_create([
+            Movie(tmdb_id=SYNTHETIC_ID_BASE + i, title=f'실행 계획 검사 {i}', popularity=float(i)) for i in range(3)
+        ])
+        movie_ids = list(Movie.objects.filter(tmdb_id__gte=SYNTHETIC_ID_BASE).values_list('id', flat=True))
+        UserMoviePreference.objects.bulk_create([
+            UserMoviePreference(user=user, movie_id=movie_id, rating=3) for movie_id in movie_ids
+        ])
+
+        factory = APIRequestFactory()
+        next_cursor = None
+        for name, view, path, params, kwargs, allow, seek in view_calls(movie_ids[0]):
+            if 'cursor' in params:
+                params = {**params, 'cursor': next_cursor}
+            request = factory.get(path, params)
+            force_authenticate(request, user=user)
+            statements = []
+            with connection.execute_wrapper(_recorder(statements)):
+                response = view(request, **kwargs)
+            if response.status_code != 200:
+                raise CommandError(f'{name} 응답 오류 {response.status_code}: {response.data}')
+            next_cursor = response.data.get('next_cursor')
+            self._check(name, statements, allow, seek)
@@ -0,0 +1,126 @@
+# movies/management/commands/check_tmdb_async.py
+"""비동기 TMDB 경로 검사 (로컬 스텁 서버 사용, 실제 TMDB 호출 없음)
+
+    python manage.py check_tmdb_async
+
+tmdb_stub.TMDBStubServer를 띄우고 async_tmdb_service / tmdb_service를 잠시 그쪽으로 돌린 뒤
+1. async/search/ 뷰가 스텁 검색 결과를 돌려주는지
+2. 429 응답 뒤 재시도, 5xx 응답은 None으로 처리되는지
+3. async/save-tmdb/ 뷰가 잘못된 tmdb_id(정수가 아니거나 0 이하)는 400으로 거절하고, 임시 영화 + 평점을 저장하되
+   임시 영화는 목록에 나오지 않으며, run_movie_backfill 한 묶음이 스텁 상세 정보로
+   제목/장르를 채운 뒤에는 목록에 나오는지
+확인한다. 하나라도 다르면 실패(종료 코드 1)하고, 모든 쓰기는 롤백된다.
+"""
+import json
+from contextlib import contextmanager
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import RequestFactory
+
+from movies import async_views
+from movies.models import Movie, UserMoviePreference
+from movies.movie_backfill import process_batch
+from movies.tmdb_async import async_tmdb_service
+from movies.tmdb_service import tmdb_service
+from movies.tmdb_stub import STUB_MOVIES, TMDBStubServer
+
+CHECK_USERNAME = '__tmdb_async_check__'
+
+
+class _Rollback(Exception):
+    pass
+
+
+@contextmanager
+def pointed_at(stub, *services):
+    """서비스들의 base_url/api_key를 스텁으로 바꿨다가 되돌린다"""
+    saved = [(service, service.base_url, service.api_key) for service in services]
+    for service in services:
+        service.base_url, service.api_key = stub.base_url, 'stub'
+    try:
+        yield
+    finally:
+        for service, base_url, api_key in saved:
+            service.base_url, service.api_key = base_url, api_key
+
+
+class Command(BaseCommand):
+    help = '로컬 TMDB 스텁 서버로 비동기 검색/저장 경로를 검사합니다 (변경 사항은 롤백).'
+
+    def handle(self, *args, **options):
+        self.failures = []
+        # 이전 실행의 응답 캐시가 스텁 호출을 가리지 않도록
+        caches['default'].clear()
+        with TMDBStubServer() as stub, pointed_at(stub, async_tmdb_service, tmdb_service):
+            try:
+                with transaction.atomic():
+                    user = User.objects.create_user(CHECK_USERNAME)
+                    async_to_sync(self._check_async)(stub, user)
+                    self._check_backfill(user)
+                    raise _Rollback
+            except _Rollback:
+                pass
+
+        if self.failures:
+            raise CommandError(f"비동기 TMDB 검사 실패: {', '.join(self.failures)}")
+        self.stdout.write(self.style.SUCCESS('✅ 비동기 검색/저장 경로가 스텁 서버와 기대대로 동작합니다.'))
+
+    def _expect(self, name, ok, detail=''):
+        line = f"{'✅' if ok else '❌'} {name}{f' ({detail})' if detail else ''}"
+        self.stdout.write(line if ok else self.style.ERROR(line))
+        if not ok:
+            self.failures.append(name)
+
+    async def _check_async(self, stub, user):
+        factory = RequestFactory()
+        target = STUB_MOVIES[0]
+        try:
+            response = await async_views.search_movies_tmdb_async(
+                factory.get('/movies/async/search/', {'search': target['title']}))
+            body = json.loads(response.content)
+            tmdb_ids = [movie['tmdb_id'] for movie in body.get('results', []) if movie['source'] == 'tmdb']
+            self._expect('async 검색', response.status_code == 200 and target['id'] in tmdb_ids,
+                         f"{response.status_code}, tmdb 결과 {tmdb_ids}")
+
+            stub.fail_next(429)
+            results = await async_tmdb_service.search_movies(STUB_MOVIES[1]['original_title'])
+            self._expect('429 뒤 재시도', [movie['id'] for movie in results] == [STUB_MOVIES[1]['id']])
+
+            stub.fail_next(500)
+            details = await async_tmdb_service.get_movie_details(STUB_MOVIES[2]['id'])
+            self._expect('5xx는 None', details is None)
+
+            for bad_id in ('abc', 0, -1):
+                request = factory.post('/movies/async/save-tmdb/', json.dumps({'tmdb_id': bad_id, 'rating': 5}),
+                                       content_type='application/json')
+                request.user = user
+                response = await async_views.save_tmdb_movie_async(request)
+                self._expect(f'잘못된 tmdb_id({bad_id!r})는 400', response.status_code == 400, str(response.status_code))
+
+            request = factory.post('/movies/async/save-tmdb/', json.dumps({'tmdb_id': target['id'], 'rating': 5}),
+                                   content_type='application/json')
+            request.user = user
+            response = await async_views.save_tmdb_movie_async(request)
+            body = json.loads(response.content)
+            self._expect('async 저장 (임시 영화)',
+                         response.status_code == 200 and body.get('movie', {}).get('details_pending') is True,
+                         f"{response.status_code}, {body.get('error', '')}")
+            self._expect('임시 영화는 목록에서 제외',
+                         not await Movie.objects.listed().filter(tmdb_id=target['id']).aexists())
+        finally:
+            await async_tmdb_service.aclose()
+
+    def _check_backfill(self, user):
+        target = STUB_MOVIES[0]
+        filled, failed = process_batch(batch_size=10, workers=2)
+        movie = Movie.objects.filter(tmdb_id=target['id']).first()
+        genres = sorted(movie.genres.values_list('name', flat=True)) if movie else []
+        self._expect('백필이 스텁 상세 정보로 장르 채움', filled == 1 and failed == 0 and len(genres) == 3,
+                     f"채움 {filled}, 실패 {failed}, 장르 {genres}")
+        self._expect('평점 유지', UserMoviePreference.objects.filter(user=user, movie=movie, rating=5).exists())
+        self._expect('백필 후 목록에 표시',
+                     Movie.objects.listed().filter(tmdb_id=target['id'], title=target['title']).exists())
@@ -0,0 +1,182 @@
+# movies/management/commands/ingest_tmdb_catalog.py
+"""TMDB 카탈로그 일괄 적재
+
+    python manage.py ingest_tmdb_catalog --pages 50
+    python manage.py ingest_tmdb_catalog --ids-file movie_ids_10_16_2026.json.gz --min-popularity 5
+
+인기 영화 목록(movie/popular) 또는 TMDB 일일 ID 내보내기 파일(로컬 디스크)에서
+영화 ID를 모으고, 상세 정보는 제한된 스레드 풀로 받아 배치 단위로 저장한다.
+배치가 커밋될 때마다 체크포인트 파일에 진행 위치를 기록하므로 중단 후
+같은 명령을 다시 실행하면 이어서 진행한다.
+"""
+import gzip
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, islice
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from movies.catalog import upsert_tmdb_movies
+from movies.tmdb_service import tmdb_service
+
+
+class Command(BaseCommand):
+    help = 'TMDB 인기 영화 / ID 내보내기 파일로 Movie·Genre 테이블을 일괄 적재합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', type=int, default=20,
+                            help='가져올 movie/popular 페이지 수 (TMDB 최대 500)')
+        parser.add_argument('--ids-file',
+                            help='TMDB 일일 ID 내보내기 파일 경로 (.json 또는 .json.gz, 한 줄에 JSON 하나)')
+        parser.add_argument('--min-popularity', type=float, default=0.0,
+                            help='ID 파일에서 이 인기도 미만인 영화는 건너뜀')
+        parser.add_argument('--include-adult', action='store_true',
+                            help='ID 파일의 성인 영화도 적재')
+        parser.add_argument('--workers', type=int,
+                            default=getattr(settings, 'TMDB_INGEST_WORKERS', 8),
+                            help='상세 정보 동시 요청 수')
+        parser.add_argument('--batch-size', type=int, default=100,
+                            help='한 트랜잭션에 저장할 영화 수')
+        parser.add_argument('--checkpoint',
+                            help='체크포인트 파일 경로 (기본: BASE_DIR/.tmdb_ingest_<모드>.json)')
+        parser.add_argument('--restart', action='store_true',
+                            help='체크포인트를 무시하고 처음부터 다시 적재')
+        parser.add_argument('--max-attempts', type=int,
+                            default=getattr(settings, 'TMDB_INGEST_MAX_ATTEMPTS', 3),
+                            help='상세 조회에 이 횟수만큼 실패한 ID는 더 이상 다시 시도하지 않음')
+
+    def handle(self, *args, **options):
+        if not tmdb_service.api_key:
+            raise CommandError('TMDB_API_KEY가 설정되지 않았습니다.')
+        if options['workers'] < 1 or options['batch_size'] < 1:
+            raise CommandError('--workers, --batch-size는 1 이상이어야 합니다.')
+
+        ids_file = options['ids_file']
+        if ids_file and not os.path.exists(ids_file):
+            raise CommandError(f'ID 파일을 찾을 수 없습니다: {ids_file}')
+
+        source = 'ids' if ids_file else 'popular'
+        checkpoint_path = options['checkpoint'] or os.path.join(
+            settings.BASE_DIR, f'.tmdb_ingest_{source}.json')
+        checkpoint = {} if options['restart'] else self._load_checkpoint(checkpoint_path)
+
+        # 다른 파일/모드의 체크포인트는 이어받지 않는다
+        if checkpoint.get('source') != source or checkpoint.get('ids_file') != ids_file:
+            checkpoint = {'source': source, 'ids_file': ids_file, 'cursor': 0, 'failed': {}}
+        elif checkpoint['cursor']:
+            self.stdout.write(f"↩️  체크포인트에서 이어서 진행: {checkpoint['cursor']}")
+        if isinstance(checkpoint['failed'], list):
+            # 이전 형식(ID 목록)은 한 번 실패한 것으로 본다
+            checkpoint['failed'] = {str(tmdb_id): 1 for tmdb_id in checkpoint['failed']}
+
+        if source == 'ids':
+            batches = self._batches_from_ids_file(ids_file, checkpoint['cursor'], options)
+        else:
+            batches = self._batches_from_popular(checkpoint['cursor'], options['pages'], options['batch_size'])
+
+        # 실패 횟수는 체크포인트에 {ID: 실패 횟수}로 남기고, --max-attempts 미만인 ID만 맨 앞 배치로 다시 시도
+        # (목록/파일을 이미 끝까지 읽은 뒤에도 재시도되도록 별도 배치로 둔다)
+        failed = checkpoint['failed']
+        retry_ids = [int(tmdb_id) for tmdb_id, attempts in failed.items() if attempts < options['max_attempts']]
+        if retry_ids:
+            batches = chain([(checkpoint['cursor'], retry_ids)], batches)
+        created = updated = 0
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=options['workers'], thread_name_prefix='tmdb-ingest') as executor:
+            for cursor, tmdb_ids in batches:
+                details = list(executor.map(self._fetch_details, tmdb_ids))
+                payloads = [data for data in details if data]
+                fetched_ids = {data['id'] for data in payloads}
+                batch_failed = [tmdb_id for tmdb_id in tmdb_ids if tmdb_id not in fetched_ids]
+                for tmdb_id in batch_failed:
+                    failed[str(tmdb_id)] = failed.get(str(tmdb_id), 0) + 1
+                for tmdb_id in fetched_ids:
+                    failed.pop(str(tmdb_id), None)
+
+                batch_created, batch_updated = upsert_tmdb_movies(payloads, batch_size=options['batch_size'])
+                created += batch_created
+                updated += batch_updated
+
+                checkpoint.update(cursor=cursor, failed=failed)
+                self._save_checkpoint(checkpoint_path, checkpoint)
+
+                elapsed = time.monotonic() - started
+                self.stdout.write(
+                    f"📦 {cursor}: 생성 {batch_created} / 수정 {batch_updated} / 실패 {len(batch_failed)} "
+                    f"(누적 {created + updated}편, {(created + updated) / max(elapsed, 1e-6):.1f}편/초)"
+                )
+
+        pending = sum(1 for attempts in failed.values() if attempts < options['max_attempts'])
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ 적재 완료: 생성 {created}, 수정 {updated}, "
+            f"재시도 대기 {pending}, 포기 {len(failed) - pending}"
+        ))
+
+    @staticmethod
+    def _fetch_details(tmdb_id):
+        # 수천 건을 한 번씩만 읽으므로 응답 캐시를 거치지 않는다 (사용자 검색용 항목이 밀려나지 않도록)
+        return tmdb_service.get_movie_details(tmdb_id, cached=False)
+
+    def _batches_from_popular(self, done_pages, pages, batch_size):
+        """(완료한 페이지 수, [tmdb_id...]) - movie/popular는 페이지 단위로 체크포인트"""
+        pages = min(pages, 500)  # TMDB는 500페이지까지만 제공
+        ids, page = [], done_pages
+        while page < pages:
+            page += 1
+            data = tmdb_service.get_popular_movies(page, cached=False)
+            if data is None:
+                # 목록 자체를 못 받으면 여기서 멈추고 다음 실행에서 이 페이지부터 재시도
+                self.stderr.write(f"⚠️ {page}페이지 목록 조회 실패, 중단합니다.")
+                break
+            ids.extend(movie['id'] for movie in data.get('results', []))
+            pages = min(pages, data.get('total_pages') or pages)
+            if len(ids) >= batch_size or page >= pages:
+                yield page, ids
+                ids = []
+        if ids:
+            # 목록 조회 실패로 중단된 경우: 이미 받은 페이지까지만 완료로 기록
+            yield page - 1, ids
+
+    @staticmethod
+    def _batches_from_ids_file(path, done_lines, options):
+        """(처리한 줄 수, [tmdb_id...]) - ID 파일은 줄 번호 단위로 체크포인트"""
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rt', encoding='utf-8') as f:
+            line_no = done_lines
+            lines = islice(f, done_lines, None)
+            while True:
+                chunk = list(islice(lines, options['batch_size']))
+                if not chunk:
+                    return
+                line_no += len(chunk)
+                ids = []
+                for line in chunk:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    entry = json.loads(line)
+                    if entry.get('adult') and not options['include_adult']:
+                        continue
+                    if (entry.get('popularity') or 0.0) < options['min_popularity']:
+                        continue
+                    ids.append(entry['id'])
+                yield line_no, ids
+
+    @staticmethod
+    def _load_checkpoint(path):
+        try:
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _save_checkpoint(path, checkpoint):
+        # 임시 파일에 쓰고 교체해 중간에 죽어도 체크포인트가 깨지지 않게 한다
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_path, path)
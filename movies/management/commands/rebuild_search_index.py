@@ -0,0 +1,29 @@
+# movies/management/commands/rebuild_search_index.py
+"""로컬 영화 검색 색인 전체 재구축
+
+    python manage.py rebuild_search_index
+
+SQLite에서는 FTS5 색인 테이블을 (없으면 만들고) 모든 영화로 다시 채우고, PostgreSQL에서는
+pg_trgm 확장과 GIN 인덱스를 만든다. 배포 후 migrate 다음에 한 번 실행해야 하며, 그 전까지
+검색은 icontains로 동작하고 영화 저장 시 색인 갱신은 건너뛴다. 이후에는 영화 저장 시
+자동으로 갱신되므로 bulk 쿼리로 영화를 직접 고친 뒤에만 다시 실행하면 된다.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from movies.search_index import rebuild_search_index, search_backend
+
+
+class Command(BaseCommand):
+    help = '로컬 영화 검색 색인을 다시 만듭니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        backend = search_backend()
+        started = time.perf_counter()
+        total = rebuild_search_index(options['batch_size'])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"✅ 검색 색인 재구축 완료 ({backend}): 영화 {total}편, {elapsed:.1f}초"))
@@ -0,0 +1,41 @@
+# movies/management/commands/run_email_worker.py
+"""분석 이메일 발송 워커
+
+    python manage.py run_email_worker              # 계속 실행 (대기열을 주기적으로 확인)
+    python manage.py run_email_worker --once       # 대기열을 비우고 종료 (cron용)
+
+AnalysisEmailJob 대기열에서 작업을 묶음으로 가져와 SMTP 연결 하나로 발송하고,
+실패한 작업은 지수 백오프로 재시도한다. 여러 개를 동시에 띄워도 된다.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from movies.email_queue import process_batch
+
+
+class Command(BaseCommand):
+    help = '예약된 성격 분석 이메일을 발송합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50, help='SMTP 연결 하나로 보낼 최대 이메일 수')
+        parser.add_argument('--poll-interval', type=float, default=5.0, help='대기열이 비었을 때 확인 간격(초)')
+        parser.add_argument('--once', action='store_true', help='대기열을 한 번 비우고 종료')
+
+    def handle(self, *args, **options):
+        total_sent = total_failed = 0
+        try:
+            while True:
+                sent, failed = process_batch(options['batch_size'])
+                total_sent += sent
+                total_failed += failed
+                if sent or failed:
+                    self.stdout.write(f"📧 발송 {sent}건, 실패 {failed}건")
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS(f"✅ 이메일 워커 종료: 발송 {total_sent}건, 실패 {total_failed}건"))
@@ -0,0 +1,46 @@
+# movies/management/commands/run_movie_backfill.py
+"""임시 영화 TMDB 상세 정보 채우기 워커
+
+    python manage.py run_movie_backfill              # 계속 실행 (예약을 주기적으로 확인)
+    python manage.py run_movie_backfill --once       # 예약을 비우고 종료 (cron용)
+
+평점 저장 시 만들어진 임시 영화(tmdb_id, 제목만)의 상세 조회 예약을 묶음으로 가져와
+동시에 조회하고, 장르/카테고리 점수를 채운 뒤 평가한 사용자의 프로필을 다시 계산한다.
+실패한 예약은 지수 백오프로 재시도한다. 여러 개를 동시에 띄워도 된다.
+"""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from movies.movie_backfill import process_batch
+
+
+class Command(BaseCommand):
+    help = '임시로 저장된 영화의 TMDB 상세 정보를 채웁니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100, help='한 번에 조회할 최대 영화 수')
+        parser.add_argument('--workers', type=int, default=getattr(settings, 'TMDB_INGEST_WORKERS', 8),
+                            help='상세 정보 동시 요청 수')
+        parser.add_argument('--poll-interval', type=float, default=5.0, help='예약이 없을 때 확인 간격(초)')
+        parser.add_argument('--once', action='store_true', help='예약을 한 번 비우고 종료')
+
+    def handle(self, *args, **options):
+        total_filled = total_failed = 0
+        try:
+            while True:
+                filled, failed = process_batch(options['batch_size'], options['workers'])
+                total_filled += filled
+                total_failed += failed
+                if filled or failed:
+                    self.stdout.write(f"🎬 상세 정보 채움 {filled}편, 실패 {failed}편")
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ 영화 상세 워커 종료: 채움 {total_filled}편, 실패 {total_failed}편"))
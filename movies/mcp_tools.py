@@ -2,10 +2,15 @@
 
 # 검색 결과 [5] 패턴: omarbenhamid 정확한 import
 from mcp_server import ModelQueryToolset, MCPToolset
-from .models import Movie, UserMoviePreference, Genre
+from .models import Movie, UserMoviePreference, UserPersonalityProfile, Genre
 from django.contrib.auth.models import User
-from django.db.models import Avg
-import json
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.functional import cached_property
+import numpy as np
+
+from .personality_engine import MIN_RATINGS_FOR_ANALYSIS, RatingMatrix
+from .personality_profile import create_profile
 
 
 # 검색 결과 [5] 패턴: ModelQueryToolset으로 Django 모델 노출
@@ -37,147 +42,138 @@ class GenreQueryTool(ModelQueryToolset):
     model = Genre
 
 
-# 검색 결과 [5] 패턴: MCPToolset으로 커스텀 도구 생성
-class MoviePersonalityTools(MCPToolset):
-    """영화 성격 분석 전용 도구"""
+class AnalysisContext:
+    """한 사용자의 분석 데이터 - 분석/점수/보고서가 공유하고 캐시에 저장
 
-    def get_user_movie_analysis(self, username: str) -> dict:
-        """특정 사용자의 영화 평가 분석 데이터"""
-        try:
-            user = User.objects.get(username=username)
-            preferences = UserMoviePreference.objects.filter(user=user).select_related('movie').prefetch_related(
-                'movie__genres')
-
-            if preferences.count() < 5:
-                return {
-                    'error': f'분석을 위해 최소 5편의 영화 평가가 필요합니다. 현재: {preferences.count()}편',
-                    'current_count': preferences.count(),
-                    'required_count': 5
-                }
+    캐시 키에 프로필의 캐시 토큰(UserPersonalityProfile.cache_token)을 넣으므로
+    평점이 저장/삭제되거나 평가한 영화의 장르가 바뀌면 이전 결과는 다시 쓰이지 않는다.
+    use_cache=False면 캐시를 읽지도 쓰지도 않는다 (벤치마크용).
+    """
+
+    KEY_PREFIX = 'personality:v2'
 
-            # 장르별 선호도 계산
-            genre_stats = {}
-            for pref in preferences:
-                for genre in pref.movie.genres.all():
-                    if genre.name not in genre_stats:
-                        genre_stats[genre.name] = {
-                            'ratings': [],
-                            'count': 0,
-                            'movies': []
-                        }
-                    genre_stats[genre.name]['ratings'].append(pref.rating)
-                    genre_stats[genre.name]['count'] += 1
-                    genre_stats[genre.name]['movies'].append(pref.movie.title)
-
-            # 평균 계산
-            for genre in genre_stats:
-                ratings = genre_stats[genre]['ratings']
-                genre_stats[genre]['average_rating'] = round(sum(ratings) / len(ratings), 1)
+    def __init__(self, user, profile, use_cache=True):
+        self.user = user
+        self.profile = profile
+        self.key = (user.id, profile.cache_token)
+        self._cache = caches[getattr(settings, 'PERSONALITY_CACHE_ALIAS', 'default')] if use_cache else None
+        self._ttl = getattr(settings, 'PERSONALITY_CACHE_TTL', 60 * 60 * 24)
 
+    @classmethod
+    def load(cls, username, use_cache=True):
+        """사용자 + 프로필 조회 1회 (프로필이 없으면 최초 1회 생성 - 평점 행렬 2회 + 생성 2회 추가)"""
+        user = User.objects.select_related('personality_profile').get(username=username)
+        try:
+            return cls(user, user.personality_profile, use_cache=use_cache)
+        except UserPersonalityProfile.DoesNotExist:
+            pass
+        matrix = RatingMatrix.for_user(user)
+        profile, created = create_profile(user, matrix)
+        context = cls(user, profile, use_cache=use_cache)
+        if created:
+            context.matrix = matrix  # 프로필을 만든 행렬을 분석에도 그대로 쓴다 (다시 읽지 않음)
+        return context
+
+    @property
+    def username(self):
+        return self.user.username
+
+    def _cached(self, kind, compute):
+        if self._cache is None:
+            return compute()
+        cache_key = f"{self.KEY_PREFIX}:{kind}:{self.user.id}:{self.profile.cache_token}"
+        value = self._cache.get(cache_key)
+        if value is None:
+            value = compute()
+            self._cache.set(cache_key, value, self._ttl)
+        return value
+
+    @cached_property
+    def matrix(self):
+        return RatingMatrix.for_user(self.user)
+
+    @property
+    def rating_count(self):
+        """평가한 영화 수 - 분석 가능 여부와 보고서의 편수가 모두 이 값을 쓴다
+
+        평점 저장/삭제와 같은 트랜잭션에서 갱신되는 프로필 값이라 행렬을 읽지 않고도 알 수 있다.
+        """
+        return self.profile.movies_analyzed
+
+    @cached_property
+    def error(self):
+        """평점이 부족하면 오류 dict, 분석 가능하면 None"""
+        count = self.rating_count
+        if count < MIN_RATINGS_FOR_ANALYSIS:
             return {
-                'username': username,
-                'total_movies_rated': preferences.count(),
-                'overall_average': round(preferences.aggregate(Avg('rating'))['rating__avg'] or 0, 1),
-                'genre_preferences': genre_stats,
-                'recent_movies': [
-                    {
-                        'title': pref.movie.title,
-                        'rating': pref.rating,
-                        'genres': [g.name for g in pref.movie.genres.all()],
-                        'release_year': pref.movie.release_date.year if pref.movie.release_date else None
-                    }
-                    for pref in preferences.order_by('-created_at')[:10]
-                ],
-                'analysis_ready': True
+                'error': f'분석을 위해 최소 {MIN_RATINGS_FOR_ANALYSIS}편의 영화 평가가 필요합니다. 현재: {count}편',
+                'current_count': count,
+                'required_count': MIN_RATINGS_FOR_ANALYSIS
+            }
+        return None
+
+    @cached_property
+    def analysis(self):
+        if self.error:
+            return self.error
+        return self._cached('analysis', self._build_analysis)
+
+    def _build_analysis(self):
+        matrix = self.matrix
+
+        # 장르별 선호도 계산 (합계/개수는 행렬 연산 한 번)
+        sums, counts = matrix.genre_totals()
+        genre_stats = {}
+        for g in matrix.genre_order():
+            repeat = matrix.incidence[:, g]
+            rows = np.flatnonzero(repeat)
+            genre_stats[matrix.genre_names[g]] = {
+                'ratings': np.repeat(matrix.ratings[rows], repeat[rows]).astype(int).tolist(),
+                'count': int(counts[g]),
+                'movies': np.repeat(matrix.titles[rows], repeat[rows]).tolist(),
+                'average_rating': round(float(sums[g]) / int(counts[g]), 1),
             }
 
-        except User.DoesNotExist:
-            return {'error': f'사용자 {username}을 찾을 수 없습니다.'}
-
-    def calculate_personality_scores(self, username: str) -> dict:
-        """Big Five 성격 점수 계산"""
-        analysis_data = self.get_user_movie_analysis(username)
-
-        if 'error' in analysis_data:
-            return analysis_data
-
-        genre_prefs = analysis_data['genre_preferences']
-
-        # Big Five 성격 점수 계산
-        personality_scores = {
-            'openness': 50.0,
-            'extraversion': 50.0,
-            'agreeableness': 50.0,
-            'conscientiousness': 50.0,
-            'neuroticism': 50.0
+        return {
+            'username': self.username,
+            'total_movies_rated': self.rating_count,
+            'overall_average': matrix.overall_average(),
+            'genre_preferences': genre_stats,
+            'recent_movies': [
+                {
+                    'title': matrix.titles[i],
+                    'rating': int(matrix.ratings[i]),
+                    'genres': matrix.movie_genres[i],
+                    'release_year': matrix.release_years[i]
+                }
+                for i in range(min(len(matrix), 10))
+            ],
+            'analysis_ready': True
         }
 
-        # 개방성 계산 (SF, 판타지, 다큐멘터리 선호)
-        if 'SF' in genre_prefs:
-            sf_score = genre_prefs['SF']['average_rating']
-            personality_scores['openness'] += (sf_score - 3) * 8
-
-        if '판타지' in genre_prefs:
-            fantasy_score = genre_prefs['판타지']['average_rating']
-            personality_scores['openness'] += (fantasy_score - 3) * 6
-
-        # 외향성 계산 (액션, 코미디 선호)
-        if '액션' in genre_prefs:
-            action_score = genre_prefs['액션']['average_rating']
-            personality_scores['extraversion'] += (action_score - 3) * 7
-
-        if '코미디' in genre_prefs:
-            comedy_score = genre_prefs['코미디']['average_rating']
-            personality_scores['extraversion'] += (comedy_score - 3) * 8
-
-        # 친화성 계산 (로맨스, 드라마, 가족 선호)
-        if '로맨스' in genre_prefs:
-            romance_score = genre_prefs['로맨스']['average_rating']
-            personality_scores['agreeableness'] += (romance_score - 3) * 8
-
-        if '드라마' in genre_prefs:
-            drama_score = genre_prefs['드라마']['average_rating']
-            personality_scores['agreeableness'] += (drama_score - 3) * 5
-
-        # 성실성 계산 (역사, 다큐멘터리 선호)
-        if '역사' in genre_prefs:
-            history_score = genre_prefs['역사']['average_rating']
-            personality_scores['conscientiousness'] += (history_score - 3) * 7
-
-        if '다큐멘터리' in genre_prefs:
-            doc_score = genre_prefs['다큐멘터리']['average_rating']
-            personality_scores['conscientiousness'] += (doc_score - 3) * 6
-
-        # 신경성 계산 (공포, 스릴러 선호)
-        if '공포' in genre_prefs:
-            horror_score = genre_prefs['공포']['average_rating']
-            personality_scores['neuroticism'] += (horror_score - 3) * 6
-
-        if '스릴러' in genre_prefs:
-            thriller_score = genre_prefs['스릴러']['average_rating']
-            personality_scores['neuroticism'] += (thriller_score - 3) * 4
-
-        # 점수 정규화 (0-100 범위)
-        for trait in personality_scores:
-            personality_scores[trait] = max(0, min(100, round(personality_scores[trait], 1)))
-
+    @cached_property
+    def scores(self):
+        """증분 갱신된 프로필에서 바로 읽으므로 평점 행렬이 필요 없다"""
+        if self.error:
+            return self.error
         return {
-            'username': username,
-            'personality_scores': personality_scores,
-            'confidence': min(analysis_data['total_movies_rated'] / 15, 1.0),
-            'movies_analyzed': analysis_data['total_movies_rated']
+            'username': self.username,
+            'personality_scores': self.profile.personality_scores,
+            'confidence': self.profile.confidence,
+            'movies_analyzed': self.rating_count
         }
 
-    def generate_personality_report(self, username: str) -> str:
-        """Claude가 읽기 쉬운 성격 분석 보고서 생성"""
-        analysis = self.get_user_movie_analysis(username)
-        scores = self.calculate_personality_scores(username)
+    @cached_property
+    def report(self):
+        if self.error:
+            return f"분석 오류: {self.error['error']}"
+        return self._cached('report', self._build_report)
 
-        if 'error' in analysis or 'error' in scores:
-            return f"분석 오류: {analysis.get('error', scores.get('error'))}"
+    def _build_report(self):
+        analysis, scores = self.analysis, self.scores
 
         report = f"""
-🎬 {username} 사용자 영화 성격 분석 보고서
+🎬 {self.username} 사용자 영화 성격 분석 보고서
 
 📊 기본 정보:
 - 총 평가 영화: {analysis['total_movies_rated']}편
@@ -208,21 +204,89 @@ class MoviePersonalityTools(MCPToolset):
 
         return report
 
+
+# 검색 결과 [5] 패턴: MCPToolset으로 커스텀 도구 생성
+class MoviePersonalityTools(MCPToolset):
+    """영화 성격 분석 전용 도구"""
+
+    def _analysis_context(self, username):
+        """사용자별 AnalysisContext - 캐시 토큰이 그대로면 이 도구 인스턴스 안에서 재사용"""
+        context = AnalysisContext.load(username)
+        contexts = self.__dict__.setdefault('_analysis_contexts', {})
+        cached = contexts.get(context.user.id)
+        if cached is not None and cached.key == context.key:
+            return cached
+        contexts[context.user.id] = context
+        return context
+
+    def get_user_movie_analysis(self, username: str) -> dict:
+        """특정 사용자의 영화 평가 분석 데이터"""
+        try:
+            return self._analysis_context(username).analysis
+        except User.DoesNotExist:
+            return {'error': f'사용자 {username}을 찾을 수 없습니다.'}
+
+    def calculate_personality_scores(self, username: str) -> dict:
+        """Big Five 성격 점수 계산
+
+        평점이 저장될 때마다 증분 갱신되는 UserPersonalityProfile을 읽으므로
+        평가한 영화 수와 무관하게 일정한 시간(쿼리 1회)이 걸린다. 점수 규칙은
+        personality_engine.TRAIT_GENRE_WEIGHTS 참고 (개방성: SF·판타지, 외향성: 액션·코미디,
+        친화성: 로맨스·드라마, 성실성: 역사·다큐멘터리, 신경성: 공포·스릴러).
+        """
+        try:
+            return self._analysis_context(username).scores
+        except User.DoesNotExist:
+            return {'error': f'사용자 {username}을 찾을 수 없습니다.'}
+
+    def generate_personality_report(self, username: str) -> str:
+        """Claude가 읽기 쉬운 성격 분석 보고서 생성
+
+        분석 데이터와 점수는 같은 AnalysisContext에서 한 번만 계산하고, 보고서와
+        분석 데이터는 캐시 토큰별로 캐시된다. 쿼리: 캐시 적중 시 1회 (사용자 + 프로필),
+        캐시가 없으면 평점 행렬 2회 추가, 프로필을 처음 만들면 2회 더 (check_query_counts가 확인).
+        """
+        try:
+            return self._analysis_context(username).report
+        except User.DoesNotExist:
+            return f"분석 오류: 사용자 {username}을 찾을 수 없습니다."
+
+    def find_similar_users(self, username: str, limit: int = 10, radius: float = 0.0) -> dict:
+        """Big Five 점수가 비슷한 사용자 찾기
+
+        다섯 점수(0~100)를 5차원 벡터로 보고 유클리드 거리가 가까운 순으로 최대 limit명을 돌려준다.
+        radius를 주면(0보다 크면) 그 거리 이내의 사용자만. 분석 가능한 사용자 전체를 담은
+        메모리 KD-트리에서 찾으므로 사용자 수가 늘어도 조회 시간이 거의 일정하다.
+        """
+        from .user_similarity import NotEnoughRatings, similar_users_index
+
+        try:
+            context = self._analysis_context(username)
+            results = similar_users_index.similar_to(context.profile, limit=limit, radius=radius or None)
+        except User.DoesNotExist:
+            return {'error': f'사용자 {username}을 찾을 수 없습니다.'}
+        except NotEnoughRatings as e:
+            return {'error': str(e), 'current_count': e.count, 'required_count': MIN_RATINGS_FOR_ANALYSIS}
+        return {
+            'username': username,
+            'personality_scores': context.profile.personality_scores,
+            'similar_users': results,
+        }
+
     # 검색 결과 [5] 패턴: 이메일 도구 예시
     def send_analysis_email(self, to_email: str, username: str):
-        """성격 분석 결과를 이메일로 전송"""
-        from django.core.mail import send_mail
+        """성격 분석 결과 이메일 발송 예약
 
-        report = self.generate_personality_report(username)
+        보고서 생성과 SMTP 발송은 run_email_worker 프로세스가 처리하므로 바로 반환한다.
+        """
+        from .email_queue import enqueue_analysis_email
 
         try:
-            send_mail(
-                subject=f'{username}님의 영화 성격 분석 결과',
-                message=report,
-                from_email='noreply@movie-personality.com',
-                recipient_list=[to_email],
-                fail_silently=False,
-            )
-            return {'success': True, 'message': f'{to_email}로 분석 결과를 전송했습니다.'}
+            job = enqueue_analysis_email(to_email, username)
+            return {
+                'success': True,
+                'job_id': job.id,
+                'message': f'{to_email}로 분석 결과 발송을 예약했습니다.'
+            }
         except Exception as e:
             return {'success': False, 'error': str(e)}
@@ -1,6 +1,59 @@
-from django.db import models
+import uuid
+
+from django.db import models, transaction
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.contrib.auth.models import User
+from django.utils import timezone
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+
+PERSONALITY_TRAITS = ('openness', 'conscientiousness', 'extraversion', 'agreeableness', 'neuroticism')
+PERSONALITY_SCORE_FIELDS = [f'{trait}_score' for trait in PERSONALITY_TRAITS]
+
+# 장르별 성격 특성 매핑
+GENRE_PERSONALITY_MAP = {
+    '액션': {'extraversion': 0.8, 'conscientiousness': 0.7, 'neuroticism': 0.4},
+    '모험': {'openness': 0.8, 'extraversion': 0.7, 'neuroticism': 0.3},
+    '애니메이션': {'openness': 0.9, 'agreeableness': 0.8, 'conscientiousness': 0.6},
+    '코미디': {'extraversion': 0.9, 'agreeableness': 0.8, 'neuroticism': 0.2},
+    '범죄': {'conscientiousness': 0.8, 'openness': 0.6, 'agreeableness': 0.4},
+    '다큐멘터리': {'openness': 0.9, 'conscientiousness': 0.8, 'agreeableness': 0.7},
+    '드라마': {'agreeableness': 0.8, 'openness': 0.7, 'extraversion': 0.4},
+    '가족': {'agreeableness': 0.9, 'conscientiousness': 0.7, 'neuroticism': 0.2},
+    '판타지': {'openness': 0.9, 'agreeableness': 0.6, 'conscientiousness': 0.5},
+    '역사': {'openness': 0.8, 'conscientiousness': 0.8, 'agreeableness': 0.6},
+    '공포': {'openness': 0.8, 'neuroticism': 0.7, 'agreeableness': 0.3},
+    '음악': {'openness': 0.9, 'extraversion': 0.7, 'agreeableness': 0.8},
+    '미스터리': {'openness': 0.8, 'conscientiousness': 0.7, 'neuroticism': 0.5},
+    '로맨스': {'agreeableness': 0.9, 'extraversion': 0.6, 'neuroticism': 0.5},
+    'SF': {'openness': 0.9, 'conscientiousness': 0.6, 'agreeableness': 0.5},
+    '스릴러': {'openness': 0.7, 'conscientiousness': 0.6, 'neuroticism': 0.6},
+    '전쟁': {'conscientiousness': 0.8, 'agreeableness': 0.4, 'neuroticism': 0.6},
+    '서부': {'extraversion': 0.7, 'conscientiousness': 0.8, 'agreeableness': 0.5}
+}
+
+
+def personality_scores_for_genres(genre_names):
+    """장르 이름 목록으로 영화의 성격 특성 점수 계산"""
+    personality_scores = {trait: 0.5 for trait in PERSONALITY_TRAITS}
+
+    # 영화의 모든 장르에 대해 점수 계산 (Genre 기본 정렬인 이름순으로 합산)
+    genre_count = 0
+    for name in sorted(genre_names):
+        if name in GENRE_PERSONALITY_MAP:
+            for trait, score in GENRE_PERSONALITY_MAP[name].items():
+                personality_scores[trait] += score
+            genre_count += 1
+
+    # 평균 계산
+    if genre_count > 0:
+        for trait in personality_scores:
+            personality_scores[trait] = personality_scores[trait] / (genre_count + 1)
+            # 0.1 ~ 0.9 범위로 정규화
+            personality_scores[trait] = max(0.1, min(0.9, personality_scores[trait]))
+
+    return personality_scores
 
 
 class Genre(models.Model):
@@ -18,6 +71,59 @@ class Genre(models.Model):
         return self.name
 
 
+# Django Admin 설정을 위한 추가 메서드들
+class MovieQuerySet(models.QuerySet):
+    def with_high_rating(self, min_rating=7.0):
+        return self.filter(vote_average__gte=min_rating)
+
+    def by_genre(self, genre_name):
+        return self.filter(genres__name__icontains=genre_name)
+
+    def popular(self):
+        return self.filter(popularity__gte=10.0)
+
+    def listed(self):
+        """목록/검색/자동완성에 보여 줄 영화 - TMDB 상세 조회 예약이 남은 임시 영화(조회 실패 포함)는 제외
+
+        상세 정보가 채워지면 예약 행이 지워지므로(catalog.upsert_tmdb_movies) 그때부터 보인다.
+        """
+        return self.exclude(tmdb_id__in=MovieDetailRequest.objects.order_by().values('tmdb_id'))
+
+    def refresh_personality_scores(self, batch_size=1000):
+        """선택된 영화들의 성격 특성 점수를 장르로 다시 계산 (쿼리 2~3회)"""
+        movies = list(self.only('id', *PERSONALITY_SCORE_FIELDS))
+        if not movies:
+            return 0
+
+        genre_names = {movie.id: [] for movie in movies}
+        links = self.model.genres.through.objects.filter(movie_id__in=genre_names).values_list('movie_id', 'genre__name')
+        for movie_id, name in links:
+            genre_names[movie_id].append(name)
+
+        for movie in movies:
+            for trait, score in personality_scores_for_genres(genre_names[movie.id]).items():
+                setattr(movie, f'{trait}_score', score)
+        self.model.objects.bulk_update(movies, PERSONALITY_SCORE_FIELDS, batch_size=batch_size)
+        return len(movies)
+
+
+class MovieManager(models.Manager):
+    def get_queryset(self):
+        return MovieQuerySet(self.model, using=self._db)
+
+    def listed(self):
+        return self.get_queryset().listed()
+
+    # def with_high_rating(self, min_rating=7.0):
+    #     return self.get_queryset().with_high_rating(min_rating)
+    #
+    # def by_genre(self, genre_name):
+    #     return self.get_queryset().by_genre(genre_name)
+    #
+    # def popular(self):
+    #     return self.get_queryset().popular()
+
+
 class Movie(models.Model):
     """영화 정보를 저장하는 모델 - TMDB API 완전 호환"""
 
@@ -38,6 +144,13 @@ class Movie(models.Model):
     imaginative_score = models.FloatField(default=0.0, verbose_name="상상력 점수")
     exciting_score = models.FloatField(default=0.0, verbose_name="스릴러 점수")
 
+    # Big Five 성격 특성 점수 (장르에서 계산, 장르 변경 시 자동 갱신)
+    openness_score = models.FloatField(default=0.5, verbose_name="개방성 점수")
+    conscientiousness_score = models.FloatField(default=0.5, verbose_name="성실성 점수")
+    extraversion_score = models.FloatField(default=0.5, verbose_name="외향성 점수")
+    agreeableness_score = models.FloatField(default=0.5, verbose_name="친화성 점수")
+    neuroticism_score = models.FloatField(default=0.5, verbose_name="신경성 점수")
+
     # TMDB 이미지 정보
     poster_path = models.CharField(max_length=255, blank=True, verbose_name="포스터 경로")
     backdrop_path = models.CharField(max_length=255, blank=True, verbose_name="배경 이미지 경로")
@@ -56,10 +169,18 @@ class Movie(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="생성일")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="수정일")
 
+    objects = MovieManager()
+
     class Meta:
         verbose_name = "영화"
         verbose_name_plural = "영화들"
         ordering = ['-popularity', '-vote_average']
+        indexes = [
+            # 기본 정렬을 정렬 단계 없이 인덱스 순서대로 읽기 위한 복합 인덱스
+            models.Index(fields=['-popularity', '-vote_average'], name='movie_popularity_vote_idx'),
+            # movie_list 키셋 페이지네이션 (인기도, id)
+            models.Index(fields=['-popularity', '-id'], name='movie_popularity_id_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.release_date.year if self.release_date else 'Unknown'})"
@@ -94,51 +215,17 @@ class Movie(models.Model):
         return first_genre.name if first_genre else "기타"
 
     def calculate_personality_scores(self):
-        """장르 기반 성격 특성 점수 계산"""
-        # 장르별 성격 특성 매핑
-        genre_personality_map = {
-            '액션': {'extraversion': 0.8, 'conscientiousness': 0.7, 'neuroticism': 0.4},
-            '모험': {'openness': 0.8, 'extraversion': 0.7, 'neuroticism': 0.3},
-            '애니메이션': {'openness': 0.9, 'agreeableness': 0.8, 'conscientiousness': 0.6},
-            '코미디': {'extraversion': 0.9, 'agreeableness': 0.8, 'neuroticism': 0.2},
-            '범죄': {'conscientiousness': 0.8, 'openness': 0.6, 'agreeableness': 0.4},
-            '다큐멘터리': {'openness': 0.9, 'conscientiousness': 0.8, 'agreeableness': 0.7},
-            '드라마': {'agreeableness': 0.8, 'openness': 0.7, 'extraversion': 0.4},
-            '가족': {'agreeableness': 0.9, 'conscientiousness': 0.7, 'neuroticism': 0.2},
-            '판타지': {'openness': 0.9, 'agreeableness': 0.6, 'conscientiousness': 0.5},
-            '역사': {'openness': 0.8, 'conscientiousness': 0.8, 'agreeableness': 0.6},
-            '공포': {'openness': 0.8, 'neuroticism': 0.7, 'agreeableness': 0.3},
-            '음악': {'openness': 0.9, 'extraversion': 0.7, 'agreeableness': 0.8},
-            '미스터리': {'openness': 0.8, 'conscientiousness': 0.7, 'neuroticism': 0.5},
-            '로맨스': {'agreeableness': 0.9, 'extraversion': 0.6, 'neuroticism': 0.5},
-            'SF': {'openness': 0.9, 'conscientiousness': 0.6, 'agreeableness': 0.5},
-            '스릴러': {'openness': 0.7, 'conscientiousness': 0.6, 'neuroticism': 0.6},
-            '전쟁': {'conscientiousness': 0.8, 'agreeableness': 0.4, 'neuroticism': 0.6},
-            '서부': {'extraversion': 0.7, 'conscientiousness': 0.8, 'agreeableness': 0.5}
-        }
-
-        personality_scores = {
-            'openness': 0.5, 'conscientiousness': 0.5, 'extraversion': 0.5,
-            'agreeableness': 0.5, 'neuroticism': 0.5
-        }
-
-        # 영화의 모든 장르에 대해 점수 계산
-        genre_count = 0
-        for genre in self.genres.all():
-            if genre.name in genre_personality_map:
-                genre_scores = genre_personality_map[genre.name]
-                for trait, score in genre_scores.items():
-                    personality_scores[trait] += score
-                genre_count += 1
-
-        # 평균 계산
-        if genre_count > 0:
-            for trait in personality_scores:
-                personality_scores[trait] = personality_scores[trait] / (genre_count + 1)
-                # 0.1 ~ 0.9 범위로 정규화
-                personality_scores[trait] = max(0.1, min(0.9, personality_scores[trait]))
-
-        return personality_scores
+        """장르 기반 성격 특성 점수 (장르 변경 시 갱신되어 저장된 값)"""
+        return {trait: getattr(self, f'{trait}_score') for trait in PERSONALITY_TRAITS}
+
+    def refresh_personality_scores(self, save=True):
+        """현재 장르로 성격 특성 점수를 다시 계산해 저장"""
+        scores = personality_scores_for_genres(self.genres.values_list('name', flat=True))
+        for trait, score in scores.items():
+            setattr(self, f'{trait}_score', score)
+        if save:
+            self.save(update_fields=PERSONALITY_SCORE_FIELDS)
+        return scores
 
 
 class UserMoviePreference(models.Model):
@@ -165,6 +252,10 @@ class UserMoviePreference(models.Model):
         verbose_name = "사용자 영화 선호도"
         verbose_name_plural = "사용자 영화 선호도들"
         ordering = ['-created_at']
+        indexes = [
+            # 사용자별 최근 평점 목록 (preferences GET 키셋 페이지네이션) - user로 거르고 (created_at, id) 역순으로 읽는다
+            models.Index(fields=['user', '-created_at', '-id'], name='preference_user_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.movie.title}: {self.rating}점"
@@ -189,31 +280,255 @@ class UserMoviePreference(models.Model):
         return weighted_personality
 
 
-# Django Admin 설정을 위한 추가 메서드들
-class MovieQuerySet(models.QuerySet):
-    def with_high_rating(self, min_rating=7.0):
-        return self.filter(vote_average__gte=min_rating)
+class UserPersonalityProfile(models.Model):
+    """사용자별 Big Five 성격 점수와 그 계산에 필요한 평점 집계
 
-    def by_genre(self, genre_name):
-        return self.filter(genres__name__icontains=genre_name)
+    평점이 바뀔 때마다 movies.personality_profile에서 증분 갱신된다.
+    """
 
-    def popular(self):
-        return self.filter(popularity__gte=10.0)
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='personality_profile',
+                                verbose_name="사용자")
 
+    # Big Five 점수 (0~100)
+    openness_score = models.FloatField(default=50.0, verbose_name="개방성")
+    extraversion_score = models.FloatField(default=50.0, verbose_name="외향성")
+    agreeableness_score = models.FloatField(default=50.0, verbose_name="친화성")
+    conscientiousness_score = models.FloatField(default=50.0, verbose_name="성실성")
+    neuroticism_score = models.FloatField(default=50.0, verbose_name="신경성")
 
-class MovieManager(models.Manager):
-    def get_queryset(self):
-        return MovieQuerySet(self.model, using=self._db)
+    confidence = models.FloatField(default=0.0, verbose_name="분석 신뢰도")
+    movies_analyzed = models.IntegerField(default=0, verbose_name="분석한 영화 수")
 
-    # def with_high_rating(self, min_rating=7.0):
-    #     return self.get_queryset().with_high_rating(min_rating)
-    #
-    # def by_genre(self, genre_name):
-    #     return self.get_queryset().by_genre(genre_name)
-    #
-    # def popular(self):
-    #     return self.get_queryset().popular()
+    # 평점 저장/삭제 시 증분 갱신되는 집계값 (점수는 여기서 장르 수에 비례하는 시간에 재계산)
+    genre_rating_sums = models.JSONField(default=dict, verbose_name="장르별 평점 합계")
+    genre_rating_counts = models.JSONField(default=dict, verbose_name="장르별 평가 수")
+    rating_sum = models.IntegerField(default=0, verbose_name="평점 합계")
+
+    # 평점 저장/삭제, 평가한 영화의 장르 변경 시 증가하는 버전
+    ratings_version = models.PositiveIntegerField(default=0, verbose_name="평점 버전")
+    # 분석 결과 캐시 키 - 버전을 올릴 때마다 새로 만든다. 버전 숫자는 프로필을 다시 만들거나
+    # 버전을 올린 트랜잭션이 롤백되면 반복되지만, 이 값은 이전에 쓰인 값으로 돌아가지 않는다
+    cache_token = models.UUIDField(default=uuid.uuid4, editable=False, verbose_name="캐시 토큰")
+    computed_at = models.DateTimeField(auto_now=True, verbose_name="계산일")
+
+    class Meta:
+        verbose_name = "사용자 성격 프로필"
+        verbose_name_plural = "사용자 성격 프로필들"
+
+    def __str__(self):
+        return f"{self.user.username} 성격 프로필 ({self.movies_analyzed}편)"
+
+    @property
+    def personality_scores(self):
+        return {trait: getattr(self, f'{trait}_score') for trait in
+                ('openness', 'extraversion', 'agreeableness', 'conscientiousness', 'neuroticism')}
+
+    @property
+    def overall_average(self):
+        return round(self.rating_sum / self.movies_analyzed, 1) if self.movies_analyzed else 0
+
+    @classmethod
+    def bump_ratings_version(cls, user_ids=None, movie_ids=None):
+        """user_ids 사용자 또는 movie_ids 영화를 평가한 사용자의 평점 버전 증가 + 캐시 토큰 교체 (쿼리 1회)"""
+        profiles = cls.objects.all()
+        if user_ids is not None:
+            profiles = profiles.filter(user_id__in=user_ids)
+        if movie_ids is not None:
+            profiles = profiles.filter(
+                user_id__in=UserMoviePreference.objects.filter(movie_id__in=movie_ids).order_by().values('user_id'))
+        return profiles.update(ratings_version=models.F('ratings_version') + 1, cache_token=uuid.uuid4())
+
+
+class AnalysisEmailJob(models.Model):
+    """성격 분석 결과 이메일 발송 작업 (DB 기반 큐, run_email_worker가 처리)"""
+
+    STATUS_PENDING = 'pending'
+    STATUS_SENDING = 'sending'
+    STATUS_SENT = 'sent'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, '대기'),
+        (STATUS_SENDING, '발송 중'),
+        (STATUS_SENT, '발송 완료'),
+        (STATUS_FAILED, '발송 실패'),
+    ]
+
+    to_email = models.EmailField(verbose_name="받는 사람")
+    username = models.CharField(max_length=150, verbose_name="분석 대상 사용자")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING,
+                              db_index=True, verbose_name="상태")
+    attempts = models.IntegerField(default=0, verbose_name="시도 횟수")
+    last_error = models.TextField(blank=True, verbose_name="마지막 오류")
+
+    available_at = models.DateTimeField(default=timezone.now, verbose_name="발송 가능 시각")  # 재시도 대기
+    claimed_at = models.DateTimeField(null=True, blank=True, verbose_name="워커 할당 시각")
+    sent_at = models.DateTimeField(null=True, blank=True, verbose_name="발송 시각")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="생성일")
+
+    class Meta:
+        verbose_name = "분석 이메일 작업"
+        verbose_name_plural = "분석 이메일 작업들"
+        ordering = ['available_at', 'id']
+        indexes = [
+            # 워커의 대기열 조회 (status + available_at/claimed_at 조건)
+            models.Index(fields=['status', 'available_at'], name='email_job_status_available_idx'),
+            models.Index(fields=['status', 'claimed_at'], name='email_job_status_claimed_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.username} -> {self.to_email} ({self.get_status_display()})"
+
+
+class MovieDetailRequest(models.Model):
+    """임시 영화(tmdb_id, 제목만)의 TMDB 상세 조회 예약 (run_movie_backfill이 묶음으로 처리)
+
+    tmdb_id가 유일하므로 같은 영화를 여러 번 평가해도 조회는 한 번만 예약된다.
+    상세 정보가 저장되면 행을 지운다. 행이 남아 있는 동안(조회 실패로 포기한 경우 포함)
+    그 영화는 목록/검색/자동완성에 나오지 않는다 (MovieQuerySet.listed).
+    """
 
+    STATUS_PENDING = 'pending'
+    STATUS_FETCHING = 'fetching'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, '대기'),
+        (STATUS_FETCHING, '조회 중'),
+        (STATUS_FAILED, '조회 실패'),
+    ]
 
-# Movie 모델에 Manager 추가
-Movie.add_to_class('objects', MovieManager())
+    tmdb_id = models.IntegerField(unique=True, verbose_name="TMDB ID")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING, verbose_name="상태")
+    attempts = models.IntegerField(default=0, verbose_name="시도 횟수")
+    last_error = models.TextField(blank=True, verbose_name="마지막 오류")
+
+    available_at = models.DateTimeField(default=timezone.now, verbose_name="조회 가능 시각")  # 재시도 대기
+    claimed_at = models.DateTimeField(null=True, blank=True, verbose_name="워커 할당 시각")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="생성일")
+
+    class Meta:
+        verbose_name = "영화 상세 조회 예약"
+        verbose_name_plural = "영화 상세 조회 예약들"
+        ordering = ['available_at', 'id']
+        indexes = [
+            models.Index(fields=['status', 'available_at'], name='detail_req_status_avail_idx'),
+            models.Index(fields=['status', 'claimed_at'], name='detail_req_status_claimed_idx'),
+        ]
+
+    def __str__(self):
+        return f"TMDB {self.tmdb_id} ({self.get_status_display()})"
+
+
+class RatingNeighborRefresh(models.Model):
+    """평점이 삭제돼 평점 기반 이웃을 다시 계산해야 하는 영화 (refresh_rating_neighbors가 읽고 지운다)
+
+    저장된 평점은 updated_at으로 찾지만 삭제된 평점은 흔적이 없어서 post_delete 수신기가 여기 남긴다.
+    영화 삭제에 따른 연쇄 삭제 중에도 기록되므로 외래 키 대신 id만 둔다.
+    """
+
+    movie_id = models.BigIntegerField(verbose_name="영화 ID")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="생성일")
+
+    class Meta:
+        verbose_name = "평점 이웃 재계산 예약"
+        verbose_name_plural = "평점 이웃 재계산 예약들"
+
+    def __str__(self):
+        return f"{self.movie_id} ({self.created_at:%Y-%m-%d %H:%M})"
+
+
+class MovieNeighbor(models.Model):
+    """영화별 유사 영화 상위 k개 (미리 계산해 두고 추천 시 조회만 한다)"""
+
+    KIND_RATINGS = 'ratings'
+    KIND_CONTENT = 'content'
+    KIND_CHOICES = [
+        (KIND_RATINGS, '평점 기반 (item-item 협업 필터링)'),
+        (KIND_CONTENT, '콘텐츠 기반 (장르/카테고리 코사인)'),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES, verbose_name="유사도 종류")
+    movie = models.ForeignKey(Movie, on_delete=models.CASCADE, related_name='neighbor_rows', verbose_name="영화")
+    neighbor = models.ForeignKey(Movie, on_delete=models.CASCADE, related_name='+', verbose_name="유사 영화")
+    rank = models.PositiveSmallIntegerField(verbose_name="순위")  # 0부터, 유사도 내림차순
+    score = models.FloatField(verbose_name="유사도")
+    computed_at = models.DateTimeField(default=timezone.now, verbose_name="계산일")
+
+    class Meta:
+        # (kind, movie) 조회가 이 유일 인덱스를 그대로 쓴다
+        unique_together = ['kind', 'movie', 'rank']
+        ordering = ['kind', 'movie', 'rank']
+        verbose_name = "유사 영화"
+        verbose_name_plural = "유사 영화들"
+
+    def __str__(self):
+        return f"{self.movie_id} -> {self.neighbor_id} ({self.kind} {self.score:.3f})"
+
+
+# 장르가 바뀌면 저장된 성격 특성 점수와 그 영화를 평가한 사용자 프로필의 장르 집계 갱신
+# (bulk 경로는 catalog.upsert_tmdb_movies에서 직접 갱신)
+@receiver(m2m_changed, sender=Movie.genres.through)
+def refresh_movie_personality_on_genre_change(sender, instance, action, reverse, pk_set, **kwargs):
+    from .personality_profile import apply_genre_links
+
+    if not reverse:
+        if action == 'pre_clear':
+            instance._cleared_genre_names = list(instance.genres.values_list('name', flat=True))
+            return
+        if action == 'post_clear':
+            links = [(instance.pk, name) for name in getattr(instance, '_cleared_genre_names', [])]
+        elif action in ('post_add', 'post_remove'):
+            links = [(instance.pk, name) for name in Genre.objects.filter(pk__in=pk_set).values_list('name', flat=True)]
+        else:
+            return
+        instance.refresh_personality_scores()
+        apply_genre_links(links, +1 if action == 'post_add' else -1)
+        UserPersonalityProfile.bump_ratings_version(movie_ids=[instance.pk])
+        # 콘텐츠 기반 유사 영화 변경분 갱신(updated_at 기준)에 잡히도록
+        Movie.objects.filter(pk=instance.pk).update(updated_at=timezone.now())
+        return
+
+    # genre.movie_set 쪽에서 바뀐 경우: 영향받은 영화들만 갱신
+    if action == 'pre_clear':
+        instance._cleared_movie_ids = list(instance.movie_set.values_list('id', flat=True))
+    elif action == 'post_clear':
+        pk_set = getattr(instance, '_cleared_movie_ids', [])
+    if action in ('post_add', 'post_remove', 'post_clear') and pk_set:
+        Movie.objects.filter(pk__in=pk_set).refresh_personality_scores()
+        apply_genre_links([(movie_id, instance.name) for movie_id in pk_set], +1 if action == 'post_add' else -1)
+        UserPersonalityProfile.bump_ratings_version(movie_ids=pk_set)
+        Movie.objects.filter(pk__in=pk_set).update(updated_at=timezone.now())
+
+
+# 평점 삭제(직접 삭제, 영화 삭제에 따른 연쇄 삭제 포함) 시 사용자 성격 프로필 집계에서 제외
+@receiver(post_delete, sender=UserMoviePreference)
+def remove_rating_from_personality_profile(sender, instance, **kwargs):
+    from .personality_profile import remove_rating
+    remove_rating(instance)
+    UserPersonalityProfile.bump_ratings_version(user_ids=[instance.user_id])
+    # 평점 기반 이웃 변경분 갱신(refresh_rating_neighbors)에 잡히도록 - 삭제된 평점은 updated_at이 남지 않는다
+    RatingNeighborRefresh.objects.create(movie_id=instance.movie_id)
+
+
+# 평점 저장(생성/수정) 시 캐시된 분석 결과 무효화
+@receiver(post_save, sender=UserMoviePreference)
+def bump_ratings_version_on_save(sender, instance, **kwargs):
+    UserPersonalityProfile.bump_ratings_version(user_ids=[instance.user_id])
+
+
+# 영화 저장/삭제 시 로컬 검색 색인과 자동완성 색인 동기화 (bulk 경로는 catalog에서 직접 갱신)
+# 자동완성 색인은 DB 밖(프로세스 메모리)에 있으므로 롤백된 변경이 남지 않도록 커밋 후에 반영
+@receiver(post_save, sender=Movie)
+def index_movie_for_search(sender, instance, **kwargs):
+    from .autocomplete import title_index
+    from .search_index import index_movies
+    index_movies([instance.pk])
+    transaction.on_commit(lambda movie_ids=[instance.pk]: title_index.update_movies(movie_ids))
+
+
+@receiver(post_delete, sender=Movie)
+def unindex_movie_for_search(sender, instance, **kwargs):
+    from .autocomplete import title_index
+    from .search_index import unindex_movies
+    unindex_movies([instance.pk])
+    # 삭제가 끝나면 instance.pk가 None이 되므로 id를 미리 묶어 둔다
+    transaction.on_commit(lambda movie_ids=[instance.pk]: title_index.remove_movies(movie_ids))
@@ -0,0 +1,115 @@
+# movies/movie_backfill.py - DB에 없는 영화를 임시로 만들고 TMDB 상세 정보는 나중에 채우기
+"""평점 저장이 TMDB 응답을 기다리지 않도록, 모르는 tmdb_id는
+
+1. tmdb_id만 있는 임시 Movie를 바로 만들어 평점을 저장하고
+2. MovieDetailRequest로 상세 조회를 예약한 뒤
+3. run_movie_backfill 워커가 묶음으로 조회해 제목/장르/카테고리 점수를 채운다
+   (catalog.upsert_tmdb_movies 경로 - 예약 삭제, 검색 색인, 캐시 무효화 포함).
+
+임시 영화는 예약이 남아 있는 동안(조회 실패로 포기한 경우 포함) 목록/검색/자동완성에
+나오지 않는다 (Movie.objects.listed). 클라이언트가 보낸 제목은 검증할 수 없으므로 저장하지 않는다.
+
+임시 영화에 남긴 평점은 장르 없이 프로필에 집계되고, 상세 정보를 채우면서 생긴 장르 연결은
+upsert_tmdb_movies가 같은 트랜잭션에서 평가한 사용자 프로필에 더한다.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .catalog import upsert_tmdb_movies
+from .models import Movie, MovieDetailRequest
+from .tmdb_service import tmdb_service
+
+logger = logging.getLogger(__name__)
+
+
+def resolve_tmdb_ids(tmdb_ids):
+    """tmdb_id -> Movie id. 없는 영화는 임시 영화로 만들고 상세 조회를 예약 (쿼리 수는 개수와 무관)"""
+    tmdb_ids = set(tmdb_ids)
+    movie_ids = dict(Movie.objects.filter(tmdb_id__in=tmdb_ids).order_by().values_list('tmdb_id', 'id'))
+    missing = tmdb_ids - movie_ids.keys()
+    if not missing:
+        return movie_ids
+
+    # 동시에 같은 영화를 만드는 요청이 있어도 ignore_conflicts로 한쪽만 생성된다
+    Movie.objects.bulk_create([Movie(tmdb_id=tmdb_id) for tmdb_id in missing], ignore_conflicts=True)
+    MovieDetailRequest.objects.bulk_create(
+        [MovieDetailRequest(tmdb_id=tmdb_id) for tmdb_id in missing], ignore_conflicts=True)
+    movie_ids.update(Movie.objects.filter(tmdb_id__in=missing).order_by().values_list('tmdb_id', 'id'))
+    # 임시 영화는 목록에 나오지 않으므로 검색/자동완성 색인은 상세 정보를 채울 때 갱신된다
+    return movie_ids
+
+
+def get_or_create_placeholder(tmdb_id):
+    """단건 버전 - 반환값: (movie, details_pending)
+
+    tmdb_id가 정수가 아니면 ValueError/TypeError, 0 이하면 ValueError
+    (TMDB에 없는 id라 상세 조회 예약이 끝나지 않는다).
+    """
+    tmdb_id = int(tmdb_id)
+    if tmdb_id <= 0:
+        raise ValueError(f'tmdb_id는 양의 정수여야 합니다: {tmdb_id}')
+    movie_id = resolve_tmdb_ids([tmdb_id])[tmdb_id]
+    pending = MovieDetailRequest.objects.filter(tmdb_id=tmdb_id).exclude(
+        status=MovieDetailRequest.STATUS_FAILED).exists()
+    return Movie.objects.get(id=movie_id), pending
+
+
+def claim_requests(batch_size):
+    """조회할 예약을 batch_size개까지 이 워커에 할당 (email_queue.claim_jobs와 같은 방식)"""
+    now = timezone.now()
+    claim_timeout = getattr(settings, 'MOVIE_BACKFILL_CLAIM_TIMEOUT', 60 * 10)
+    claimable = (
+        Q(status=MovieDetailRequest.STATUS_PENDING, available_at__lte=now)
+        | Q(status=MovieDetailRequest.STATUS_FETCHING, claimed_at__lt=now - timedelta(seconds=claim_timeout))
+    )
+    with transaction.atomic():
+        candidates = list(MovieDetailRequest.objects.filter(claimable).values_list('id', flat=True)[:batch_size])
+        claimed = MovieDetailRequest.objects.filter(claimable, id__in=candidates).update(
+            status=MovieDetailRequest.STATUS_FETCHING, claimed_at=now)
+    if not claimed:
+        return []
+    return list(MovieDetailRequest.objects.filter(id__in=candidates, claimed_at=now,
+                                                  status=MovieDetailRequest.STATUS_FETCHING))
+
+
+def process_batch(batch_size=100, workers=None):
+    """예약 한 묶음 처리. 반환값: (채운 영화 수, 실패 수)"""
+    batch = claim_requests(batch_size)
+    if not batch:
+        return 0, 0
+
+    workers = workers or getattr(settings, 'TMDB_INGEST_WORKERS', 8)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='tmdb-backfill') as executor:
+        details = list(executor.map(tmdb_service.get_movie_details, [request.tmdb_id for request in batch]))
+    payloads = {request.tmdb_id: data for request, data in zip(batch, details) if data}
+
+    if payloads:
+        upsert_tmdb_movies(list(payloads.values()))  # 채운 영화의 예약 행도 여기서 지운다
+
+    failed = [request for request in batch if request.tmdb_id not in payloads]
+    for request in failed:
+        _mark_failed(request, 'TMDB 상세 정보를 가져오지 못했습니다.')
+    return len(payloads), len(failed)
+
+
+def _mark_failed(request, error):
+    """최대 시도 횟수 전까지는 지수 백오프로 다시 대기열에 넣는다"""
+    max_attempts = getattr(settings, 'MOVIE_BACKFILL_MAX_ATTEMPTS', 5)
+    backoff = getattr(settings, 'MOVIE_BACKFILL_RETRY_BACKOFF', 60)
+
+    request.attempts += 1
+    request.last_error = str(error)
+    if request.attempts >= max_attempts:
+        request.status = MovieDetailRequest.STATUS_FAILED
+        logger.error(f"영화 상세 조회 포기 (TMDB {request.tmdb_id}, {request.attempts}회): {error}")
+    else:
+        request.status = MovieDetailRequest.STATUS_PENDING
+        request.available_at = timezone.now() + timedelta(seconds=backoff * 2 ** (request.attempts - 1))
+        logger.warning(f"영화 상세 조회 실패, 재시도 예약 (TMDB {request.tmdb_id}, {request.attempts}회): {error}")
+    request.save(update_fields=['status', 'attempts', 'last_error', 'available_at'])
@@ -0,0 +1,74 @@
+# movies/pagination.py - 키셋(커서) 페이지네이션
+"""OFFSET 대신 '마지막으로 본 행의 정렬 키보다 뒤' 조건으로 다음 페이지를 읽는다.
+
+정렬 키 + id 복합 인덱스가 있으면 몇 번째 페이지든 첫 페이지와 같은 비용이고,
+페이지 사이에 행이 추가/삭제되어도 중복이나 누락이 생기지 않는다.
+커서는 마지막 행의 (정렬 값, id)를 서명한 문자열이라 클라이언트가 조작할 수 없다.
+"""
+from django.conf import settings
+from django.core import signing
+from django.db.models import Q
+
+CURSOR_SALT = 'movies.pagination'
+
+
+class InvalidCursor(ValueError):
+    """서명이 맞지 않거나 다른 정렬용으로 발급된 커서"""
+
+
+def page_size_from(request, default=None):
+    """요청의 page_size를 1 ~ MAX_PAGE_SIZE 범위로"""
+    default = default or getattr(settings, 'DEFAULT_PAGE_SIZE', 20)
+    max_size = getattr(settings, 'MAX_PAGE_SIZE', 100)
+    try:
+        size = int(request.GET.get('page_size', default))
+    except (TypeError, ValueError):
+        size = default
+    return max(1, min(size, max_size))
+
+
+def keyset_page(queryset, order_field, cursor=None, page_size=20):
+    """order_field 내림차순, 같으면 id 내림차순으로 한 페이지
+
+    반환값: (행 목록, 다음 페이지 커서 또는 None)
+    queryset은 모델 인스턴스나 values() dict 어느 쪽이어도 된다 (order_field와 id는 포함해야 함).
+    """
+    field = queryset.model._meta.get_field(order_field)
+    queryset = queryset.order_by(f'-{order_field}', '-id')
+
+    if cursor:
+        value, last_id = _decode(cursor, order_field)
+        value = field.to_python(value)
+        # 앞의 __lte는 OR 조건과 중복이지만, 이게 있어야 DB가 인덱스를 처음부터 훑지 않고 범위로 찾는다
+        queryset = queryset.filter(
+            Q(**{f'{order_field}__lte': value}),
+            Q(**{f'{order_field}__lt': value}) | Q(**{order_field: value, 'id__lt': last_id}),
+        )
+
+    # 한 행 더 읽어서 다음 페이지가 있는지 확인 (COUNT 쿼리 없이)
+    rows = list(queryset[:page_size + 1])
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    last = rows[-1]
+    if isinstance(last, dict):
+        value, last_id = last[order_field], last['id']
+    else:
+        value, last_id = getattr(last, order_field), last.id
+    # datetime은 문자열로 넣고, 읽을 때 field.to_python으로 되돌린다
+    value = value.isoformat() if hasattr(value, 'isoformat') else value
+    return rows, _encode(order_field, value, last_id)
+
+
+def _encode(order_field, value, last_id):
+    return signing.dumps([order_field, value, last_id], salt=CURSOR_SALT, compress=True)
+
+
+def _decode(cursor, order_field):
+    try:
+        field, value, last_id = signing.loads(cursor, salt=CURSOR_SALT)
+    except (signing.BadSignature, TypeError, ValueError):
+        raise InvalidCursor('잘못된 커서입니다.')
+    if field != order_field or not isinstance(last_id, int):
+        raise InvalidCursor('이 목록에서 발급된 커서가 아닙니다.')
+    return value, last_id
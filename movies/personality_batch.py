@@ -0,0 +1,121 @@
+# movies/personality_batch.py - 전체 사용자 성격 점수 일괄 계산 (프로세스 풀 작업 단위)
+from itertools import groupby
+
+from django.db import close_old_connections, connections, transaction
+
+from .models import UserMoviePreference, UserPersonalityProfile
+from .personality_engine import MIN_RATINGS_FOR_ANALYSIS, RatingMatrix, genre_names_by_movie, profile_fields
+
+PROFILE_UPDATE_FIELDS = [
+    'openness_score', 'extraversion_score', 'agreeableness_score', 'conscientiousness_score',
+    'neuroticism_score', 'confidence', 'movies_analyzed', 'genre_rating_sums', 'genre_rating_counts',
+    'rating_sum', 'computed_at',
+]
+
+
+def init_worker():
+    """프로세스 풀 초기화: 부모에게서 물려받은 DB 연결을 버리고 새로 연결"""
+    import django
+    django.setup()  # spawn 방식(macOS/Windows)에서는 설정 로드가 필요
+    for connection in connections.all():
+        connection.close()
+
+
+def analyze_user_shard(first_user_id, last_user_id, chunk_size=2000):
+    """user_id가 [first_user_id, last_user_id]인 사용자들의 프로필 계산 후 저장
+
+    평점은 user_id 순으로 iterator()로 흘려 읽으므로 메모리에는 한 사용자 분량과
+    이 구간 영화들의 장르 이름만 올라간다.
+    반환값: (분석 가능한 사용자 수, 평점이 부족한 사용자 수, 계산 중 평점이 바뀌어 건너뛴 사용자 수)
+    - 앞의 둘은 저장된다
+    """
+    close_old_connections()
+    versions = profile_versions(first_user_id, last_user_id)  # 평점을 읽기 전에
+    profiles = [
+        UserPersonalityProfile(user_id=user_id, **fields)
+        for user_id, fields in iter_rebuilt_profiles(first_user_id, last_user_id, chunk_size)
+    ]
+
+    saved = save_profiles(profiles, versions)
+    # 평점이 부족한 사용자도 증분 갱신의 출발점이 되도록 집계는 저장
+    insufficient = sum(1 for profile in saved if profile.movies_analyzed < MIN_RATINGS_FOR_ANALYSIS)
+    return len(saved) - insufficient, insufficient, len(profiles) - len(saved)
+
+
+def iter_rebuilt_profiles(first_user_id, last_user_id, chunk_size=2000):
+    """구간 내 사용자별로 평점 전체에서 다시 계산한 (user_id, 프로필 필드)
+
+    평점이 모두 지워졌는데 프로필이 남은 사용자는 빈 집계(평점 0편)로 돌려준다.
+    """
+    preferences = UserMoviePreference.objects.filter(user_id__gte=first_user_id, user_id__lte=last_user_id)
+    names_by_movie = genre_names_by_movie(preferences)
+
+    rows = (
+        preferences.order_by('user_id', '-created_at')
+        .values_list('user_id', 'rating', 'movie_id')
+        .iterator(chunk_size=chunk_size)
+    )
+    rated = set()
+    for user_id, user_rows in groupby(rows, key=lambda row: row[0]):
+        rated.add(user_id)
+        matrix = RatingMatrix.from_rows(
+            [(rating, movie_id, None, None) for _, rating, movie_id in user_rows], names_by_movie)
+        yield user_id, profile_fields(matrix)
+
+    profile_user_ids = (
+        UserPersonalityProfile.objects.filter(user_id__gte=first_user_id, user_id__lte=last_user_id)
+        .order_by('user_id').values_list('user_id', flat=True)
+    )
+    empty_fields = None
+    for user_id in profile_user_ids:
+        if user_id not in rated:
+            empty_fields = empty_fields or profile_fields(RatingMatrix.from_rows([], {}))
+            yield user_id, dict(empty_fields)
+
+
+def profile_versions(first_user_id, last_user_id):
+    """구간 내 사용자의 {user_id: ratings_version} - 평점을 읽기 전에 받아 save_profiles에 넘긴다"""
+    return dict(
+        UserPersonalityProfile.objects.filter(user_id__gte=first_user_id, user_id__lte=last_user_id)
+        .values_list('user_id', 'ratings_version')
+    )
+
+
+def save_profiles(profiles, versions):
+    """프로필 upsert 후 평점 버전을 올려 캐시된 분석 결과를 무효화
+
+    versions: 평점을 읽기 전의 {user_id: ratings_version} (프로필이 없던 사용자는 없음).
+    그 뒤에 평점 저장/삭제로 버전이 바뀐 사용자는 증분 갱신된 프로필이 더 최신이므로 덮어쓰지 않는다.
+    반환값: 저장한 프로필 목록
+    """
+    with transaction.atomic():
+        current = dict(
+            UserPersonalityProfile.objects.select_for_update()
+            .filter(user_id__in=[profile.user_id for profile in profiles])
+            .order_by('user_id').values_list('user_id', 'ratings_version')
+        )
+        unchanged = [profile for profile in profiles if current.get(profile.user_id) == versions.get(profile.user_id)]
+        UserPersonalityProfile.objects.bulk_create(
+            unchanged,
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=['user'],
+            update_fields=PROFILE_UPDATE_FIELDS,
+        )
+        UserPersonalityProfile.bump_ratings_version(user_ids=[profile.user_id for profile in unchanged])
+    return unchanged
+
+
+def user_id_shards(shard_size):
+    """평점 또는 프로필이 있는 사용자 id를 shard_size명씩 (첫 id, 마지막 id) 구간으로 묶음
+
+    평점을 모두 지운 사용자의 프로필도 어느 구간에 들어가야 빈 집계로 초기화된다.
+    """
+    user_ids = sorted(
+        set(UserMoviePreference.objects.order_by().values_list('user_id', flat=True).distinct())
+        | set(UserPersonalityProfile.objects.values_list('user_id', flat=True))
+    )
+    return [
+        (user_ids[i], user_ids[min(i + shard_size, len(user_ids)) - 1])
+        for i in range(0, len(user_ids), shard_size)
+    ]
@@ -0,0 +1,168 @@
+# movies/personality_engine.py - 평점 행렬 기반 Big Five 성격 점수 계산
+import numpy as np
+
+from .models import Movie, UserMoviePreference
+
+PERSONALITY_BASE_SCORE = 50.0
+
+# 성격 특성별 (장르, 가중치) - 해당 장르 평균 평점이 3점보다 높을수록 점수 증가
+TRAIT_GENRE_WEIGHTS = {
+    'openness': [('SF', 8), ('판타지', 6)],
+    'extraversion': [('액션', 7), ('코미디', 8)],
+    'agreeableness': [('로맨스', 8), ('드라마', 5)],
+    'conscientiousness': [('역사', 7), ('다큐멘터리', 6)],
+    'neuroticism': [('공포', 6), ('스릴러', 4)],
+}
+TRAITS = list(TRAIT_GENRE_WEIGHTS)
+MIN_RATINGS_FOR_ANALYSIS = 5
+CONFIDENCE_FULL_AT = 15  # 이만큼 평가하면 신뢰도 100%
+
+
+def genre_names_by_movie(preferences):
+    """preferences(UserMoviePreference 쿼리셋)가 가리키는 영화들의 {movie_id: [장르 이름(이름순)]}"""
+    links = (
+        Movie.genres.through.objects
+        .filter(movie_id__in=preferences.values('movie_id'))
+        .values_list('movie_id', 'genre__name')
+        .iterator(chunk_size=5000)
+    )
+    names_by_movie = {}
+    for movie_id, name in links:
+        names_by_movie.setdefault(movie_id, []).append(name)
+    for names in names_by_movie.values():
+        names.sort()
+    return names_by_movie
+
+
+class RatingMatrix:
+    """한 사용자의 평점을 (평점 수 × 장르 수) 행렬로 적재
+
+    행 순서는 최근 평가 순(-created_at), 열은 장르 이름순이다. 같은 이름의 장르가
+    한 영화에 두 번 붙어 있으면 해당 칸은 2가 된다 (기존 규칙과 동일하게 두 번 집계).
+    """
+
+    def __init__(self, ratings, titles, release_years, movie_genres, genre_names, incidence):
+        self.ratings = ratings  # (n,) float64
+        self.titles = titles  # (n,) object
+        self.release_years = release_years  # (n,) object (연도 또는 None)
+        self.movie_genres = movie_genres  # 행별 장르 이름 목록 (이름순)
+        self.genre_names = genre_names  # 열 이름
+        self.incidence = incidence  # (n, g) int32
+
+    @classmethod
+    def for_user(cls, user):
+        """쿼리 2회: 평점+영화 정보, 평가한 영화들의 장르 연결"""
+        rows = list(
+            UserMoviePreference.objects.filter(user=user).order_by('-created_at')
+            .values_list('rating', 'movie_id', 'movie__title', 'movie__release_date')
+        )
+        return cls.from_rows(rows, genre_names_by_movie(UserMoviePreference.objects.filter(user=user)))
+
+    @classmethod
+    def from_rows(cls, rows, names_by_movie):
+        """(rating, movie_id, title, release_date) 행과 {movie_id: [장르 이름]}으로 생성"""
+        genre_names = sorted({name for movie_id in {row[1] for row in rows}
+                              for name in names_by_movie.get(movie_id, [])})
+        column = {name: i for i, name in enumerate(genre_names)}
+
+        n = len(rows)
+        incidence = np.zeros((n, len(genre_names)), dtype=np.int32)
+        movie_genres = []
+        row_idx, col_idx = [], []
+        for i, (_, movie_id, _, _) in enumerate(rows):
+            names = names_by_movie.get(movie_id, [])
+            movie_genres.append(names)
+            row_idx.extend([i] * len(names))
+            col_idx.extend(column[name] for name in names)
+        np.add.at(incidence, (np.array(row_idx, dtype=np.intp), np.array(col_idx, dtype=np.intp)), 1)
+
+        return cls(
+            ratings=np.array([row[0] for row in rows], dtype=np.float64),
+            titles=np.array([row[2] for row in rows], dtype=object),
+            release_years=np.array([row[3].year if row[3] else None for row in rows], dtype=object),
+            movie_genres=movie_genres,
+            genre_names=genre_names,
+            incidence=incidence,
+        )
+
+    def __len__(self):
+        return len(self.ratings)
+
+    def genre_totals(self):
+        """장르별 (평점 합계, 평가 수) - 행렬-벡터 곱 한 번"""
+        return self.ratings @ self.incidence, self.incidence.sum(axis=0)
+
+    def genre_averages(self):
+        """{장르: 평균 평점(소수 첫째 자리)} - 평가가 있는 장르만, 첫 등장 순"""
+        sums, counts = self.genre_totals()
+        return {
+            self.genre_names[g]: round(float(sums[g]) / int(counts[g]), 1)
+            for g in self.genre_order()
+        }
+
+    def genre_order(self):
+        """장르 열을 처음 등장한 행 순서로 정렬 (같은 행이면 이름순)
+
+        기존 구현이 평점을 순회하며 dict에 장르를 추가하던 순서와 같다.
+        """
+        present = np.flatnonzero(self.incidence.any(axis=0))
+        if not present.size:
+            return []
+        first_row = self.incidence[:, present].astype(bool).argmax(axis=0)
+        return present[np.lexsort((present, first_row))].tolist()
+
+    def overall_average(self):
+        return round(float(self.ratings.sum()) / len(self), 1) if len(self) else 0
+
+
+def trait_weight_matrix(genre_names):
+    """(장르 수 × 특성 수) 가중치 행렬"""
+    column = {name: i for i, name in enumerate(genre_names)}
+    weights = np.zeros((len(genre_names), len(TRAITS)))
+    for t, trait in enumerate(TRAITS):
+        for genre, weight in TRAIT_GENRE_WEIGHTS[trait]:
+            if genre in column:
+                weights[column[genre], t] = weight
+    return weights
+
+
+def personality_scores(genre_averages):
+    """{장르: 평균 평점} -> Big Five 점수 (0~100, 소수 첫째 자리)
+
+    평점 기준선(3점) 대비 편차 벡터와 장르→특성 가중치 행렬의 곱.
+    각 항은 0.1의 배수라 합산 순서가 달라도 반올림 결과는 기존 규칙과 같다.
+    """
+    genre_names = list(genre_averages)
+    deviations = np.array([genre_averages[name] for name in genre_names], dtype=np.float64) - 3
+    raw = PERSONALITY_BASE_SCORE + deviations @ trait_weight_matrix(genre_names)
+    return {
+        trait: max(0, min(100, round(float(raw[t]), 1)))
+        for t, trait in enumerate(TRAITS)
+    }
+
+
+def profile_fields(matrix):
+    """RatingMatrix -> UserPersonalityProfile 필드 dict (집계값 + 점수)"""
+    sums, counts = matrix.genre_totals()
+    genre_sums = {matrix.genre_names[g]: int(sums[g]) for g in matrix.genre_order()}
+    genre_counts = {matrix.genre_names[g]: int(counts[g]) for g in matrix.genre_order()}
+    return {
+        'genre_rating_sums': genre_sums,
+        'genre_rating_counts': genre_counts,
+        'rating_sum': int(matrix.ratings.sum()),
+        'movies_analyzed': len(matrix),
+        **scored_fields(genre_sums, genre_counts, len(matrix)),
+    }
+
+
+def scored_fields(genre_sums, genre_counts, rating_count):
+    """장르별 평점 합계/개수로 점수 필드 계산 - 장르 수에만 비례"""
+    averages = {
+        name: round(genre_sums[name] / count, 1)
+        for name, count in genre_counts.items() if count > 0
+    }
+    scores = personality_scores(averages)
+    return {
+        **{f'{trait}_score': score for trait, score in scores.items()},
+        'confidence': min(rating_count / CONFIDENCE_FULL_AT, 1.0),
+    }
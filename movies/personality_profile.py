@@ -0,0 +1,158 @@
+# movies/personality_profile.py - 평점 저장/삭제 시 사용자 성격 프로필 증분 갱신
+from collections import defaultdict
+
+from django.db import transaction
+
+from .models import Movie, UserMoviePreference, UserPersonalityProfile
+from .personality_engine import RatingMatrix, profile_fields, scored_fields
+
+
+def save_rating(user, movie, rating):
+    """평점 저장(생성/수정)과 성격 프로필 갱신을 한 트랜잭션으로 처리
+
+    프로필 갱신은 이 영화의 장르 수에만 비례한다 (사용자가 평가한 영화 수와 무관).
+    반환값: (preference, created) - update_or_create와 같다
+    rating이 1-5 사이의 정수가 아니면 ValueError (장르별 성격 기여도 표에 1-5점만 있다)
+    """
+    rating = int(rating)
+    if rating not in [1, 2, 3, 4, 5]:
+        raise ValueError('rating은 1-5 사이의 정수여야 합니다.')
+    with transaction.atomic():
+        profile = lock_profile(user)
+        genre_names = list(movie.genres.values_list('name', flat=True))
+
+        preference = UserMoviePreference.objects.select_for_update().filter(user=user, movie=movie).first()
+        created = preference is None
+        if created:
+            preference = UserMoviePreference.objects.create(user=user, movie=movie, rating=rating)
+        else:
+            _apply(profile, genre_names, preference.rating, -1)
+            preference.rating = rating
+            preference.save(update_fields=['rating', 'updated_at'])
+
+        _apply(profile, genre_names, rating, +1)
+        _save_scores(profile)
+    return preference, created
+
+
+def remove_rating(preference):
+    """삭제된 평점을 프로필 집계에서 제외 (UserMoviePreference post_delete에서 호출)"""
+    with transaction.atomic():
+        profile = (
+            UserPersonalityProfile.objects.select_for_update()
+            .filter(user_id=preference.user_id).first()
+        )
+        if profile is None:
+            return  # 아직 프로필이 없으면 다음 조회 때 새로 만든다
+        # 영화가 삭제되는 중일 수 있으므로 Movie 행 대신 장르 연결에서 바로 조회
+        genre_names = list(
+            Movie.genres.through.objects.filter(movie_id=preference.movie_id).values_list('genre__name', flat=True)
+        )
+        _apply(profile, genre_names, preference.rating, -1)
+        _save_scores(profile)
+
+
+def get_profile(user):
+    """저장된 프로필 조회 - 없으면(최초 1회) 전체 평점으로 만든다"""
+    profile = UserPersonalityProfile.objects.filter(user=user).first()
+    if profile is None:
+        profile, _ = create_profile(user)
+    return profile
+
+
+def create_profile(user, matrix=None):
+    """평점 전체(matrix를 주면 그 행렬)로 프로필을 만든다 - 쿼리 2회 (INSERT + 조회)
+
+    다른 요청이 먼저 만들었으면 그 프로필을 돌려준다. 반환값: (profile, created)
+    충돌은 INSERT ... ON CONFLICT DO NOTHING으로 넘기므로 바깥 트랜잭션 안에서도 savepoint가 필요 없다.
+    """
+    matrix = matrix if matrix is not None else RatingMatrix.for_user(user)
+    created = UserPersonalityProfile.objects.bulk_create(
+        [UserPersonalityProfile(user=user, **profile_fields(matrix))], ignore_conflicts=True)
+    profile = UserPersonalityProfile.objects.get(user=user)
+    return profile, profile.cache_token == created[0].cache_token
+
+
+def rebuilt_profile_fields(user):
+    """평점 전체로 다시 계산한 프로필 필드 (정합성 검사/복구용)"""
+    return profile_fields(RatingMatrix.for_user(user))
+
+
+def rebuild_profile(user):
+    """평점 전체로 프로필을 다시 계산해 저장 (일괄 가져오기처럼 시그널 없이 평점을 바꾼 뒤 호출)"""
+    with transaction.atomic():
+        profile = lock_profile(user)
+        fields = rebuilt_profile_fields(user)
+        for field, value in fields.items():
+            setattr(profile, field, value)
+        profile.save(update_fields=[*fields, 'computed_at'])
+        UserPersonalityProfile.bump_ratings_version(user_ids=[user.id])
+    return profile
+
+
+def lock_profile(user):
+    """행 잠금을 건 프로필 - 없으면 현재 평점 전체로 만든다 (트랜잭션 안에서 호출)"""
+    profile = UserPersonalityProfile.objects.select_for_update().filter(user=user).first()
+    if profile is None:
+        UserPersonalityProfile.objects.get_or_create(user=user, defaults=rebuilt_profile_fields(user))
+        profile = UserPersonalityProfile.objects.select_for_update().get(user=user)
+    return profile
+
+
+def apply_genre_links(links, sign):
+    """영화-장르 연결이 생기거나(sign=+1) 없어질 때(sign=-1) 그 영화를 평가한 사용자 프로필 갱신
+
+    links: [(movie_id, 장르 이름)]. 평가 편수/평점 합계는 그대로이고 장르별 합계/개수와 점수만 바뀐다.
+    장르를 바꾸는 쪽 트랜잭션 안에서 호출한다. 아직 프로필이 없는 사용자는 처음 만들 때 현재 장르로 계산된다.
+    반환값: 갱신한 프로필 수
+    """
+    names_by_movie = defaultdict(list)
+    for movie_id, name in links:
+        names_by_movie[movie_id].append(name)
+    if not names_by_movie:
+        return 0
+
+    with transaction.atomic():
+        preferences = UserMoviePreference.objects.filter(movie_id__in=list(names_by_movie)).order_by()
+        # save_rating과 같은 순서(프로필 잠금 먼저)로 잠근 뒤 평점을 읽는다
+        profiles = list(
+            UserPersonalityProfile.objects.select_for_update()
+            .filter(user_id__in=preferences.values('user_id')).order_by('user_id')
+        )
+        ratings = defaultdict(list)
+        rows = preferences.filter(user_id__in=[profile.user_id for profile in profiles])
+        for user_id, movie_id, rating in rows.values_list('user_id', 'movie_id', 'rating'):
+            ratings[user_id].append((movie_id, rating))
+
+        for profile in profiles:
+            for movie_id, rating in ratings[profile.user_id]:
+                _apply_genres(profile, names_by_movie[movie_id], rating, sign)
+            _save_scores(profile)
+    return len(profiles)
+
+
+def _apply(profile, genre_names, rating, sign):
+    """평점 하나를 집계에 더하거나(sign=+1) 뺀다(sign=-1)"""
+    _apply_genres(profile, genre_names, rating, sign)
+    profile.rating_sum += sign * rating
+    profile.movies_analyzed = max(profile.movies_analyzed + sign, 0)
+
+
+def _apply_genres(profile, genre_names, rating, sign):
+    sums, counts = profile.genre_rating_sums, profile.genre_rating_counts
+    for name in genre_names:
+        counts[name] = counts.get(name, 0) + sign
+        sums[name] = sums.get(name, 0) + sign * rating
+        if counts[name] <= 0:
+            del counts[name]
+            sums.pop(name, None)
+
+
+def _save_scores(profile):
+    fields = scored_fields(profile.genre_rating_sums, profile.genre_rating_counts, profile.movies_analyzed)
+    for field, value in fields.items():
+        setattr(profile, field, value)
+    # ratings_version은 시그널에서 F()로 올리므로 덮어쓰지 않는다
+    profile.save(update_fields=[
+        *fields, 'genre_rating_sums', 'genre_rating_counts', 'rating_sum', 'movies_analyzed', 'computed_at',
+    ])
@@ -0,0 +1,257 @@
+# movies/rating_io.py - 평점 일괄 가져오기/내보내기 (JSONL, CSV 스트리밍)
+"""다른 서비스(Letterboxd, 왓챠 등)에서 옮겨 오는 평점 수백~수천 개를 한 요청으로 처리한다.
+
+가져오기: 요청 본문을 한 줄씩 읽어 chunk_size개씩 묶고, 묶음마다
+    영화 id/tmdb_id 조회 2쿼리 + 기존 평점 확인 1쿼리 + 평점 upsert 1쿼리로 저장한다.
+    DB에 없는 tmdb_id는 임시 영화를 만들어 바로 저장하고 TMDB 상세 조회는 예약만 한다.
+    묶음마다 따로 커밋하므로(프로필 잠금을 업로드 내내 잡지 않는다) 중간에 실패해도 앞 묶음은 남고,
+    성격 프로필은 끝에(실패했어도 저장된 묶음이 있으면) 한 번만 다시 계산한다.
+    입력 줄마다 created/updated/skipped 중 하나로 집계된다.
+내보내기: iterator()로 나눠 읽으며 한 줄씩 내보내므로 평점 수와 무관하게 메모리 사용이 일정하다.
+"""
+import codecs
+import csv
+import io
+import json
+from datetime import datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import Movie, UserMoviePreference
+from .movie_backfill import resolve_tmdb_ids
+from .personality_profile import rebuild_profile
+
+FORMATS = ('jsonl', 'csv')
+CSV_COLUMNS = ['movie_id', 'tmdb_id', 'title', 'rating', 'watch_date', 'review', 'is_favorite', 'created_at']
+MAX_REPORTED_ERRORS = 50
+
+
+class RatingImportError(ValueError):
+    """가져오기 줄 하나의 형식 오류 (해당 줄만 건너뛴다)"""
+
+
+def request_format(request, default='jsonl'):
+    """?file_format= 또는 Content-Type으로 'jsonl'/'csv' 결정
+
+    DRF가 ?format=을 응답 렌더러 선택에 쓰므로 다른 이름을 쓴다.
+    """
+    fmt = request.GET.get('file_format')
+    if not fmt:
+        content_type = request.content_type or ''
+        fmt = 'csv' if 'csv' in content_type else default
+    return fmt if fmt in FORMATS else None
+
+
+# ---- 가져오기 --------------------------------------------------------------
+
+def parse_lines(stream, fmt):
+    """바이트 줄 스트림 -> (줄 번호, dict 또는 RatingImportError)"""
+    lines = codecs.iterdecode(stream, 'utf-8-sig')
+    if fmt == 'csv':
+        reader = csv.DictReader(lines)
+        for row in reader:
+            yield reader.line_num, {key.strip().lower(): value for key, value in row.items() if key}
+        return
+    for line_number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_number, RatingImportError(f'JSON 형식 오류: {e}')
+            continue
+        if not isinstance(record, dict):
+            yield line_number, RatingImportError('각 줄은 JSON 객체여야 합니다.')
+            continue
+        yield line_number, record
+
+
+def clean_record(record):
+    """입력 dict -> 정리된 평점 필드 (movie_id 또는 tmdb_id 중 하나는 필수)"""
+    movie_id = _optional_int(record.get('movie_id'), 'movie_id')
+    tmdb_id = _optional_int(record.get('tmdb_id'), 'tmdb_id')
+    if movie_id is None and tmdb_id is None:
+        raise RatingImportError('movie_id 또는 tmdb_id가 필요합니다.')
+    if tmdb_id is not None and tmdb_id <= 0:
+        # 임시 영화를 만들면 상세 조회 예약이 끝나지 않는다
+        raise RatingImportError('tmdb_id는 양의 정수여야 합니다.')
+
+    # 0.5 단위 별점(Letterboxd 등)은 반올림해서 1-5 정수로
+    try:
+        value = float(record.get('rating'))
+    except (TypeError, ValueError):
+        raise RatingImportError('rating이 숫자가 아닙니다.')
+    if not 0.5 <= value <= 5:
+        raise RatingImportError('rating은 0.5-5 사이여야 합니다.')
+
+    return {
+        'movie_id': movie_id,
+        'tmdb_id': tmdb_id,
+        'rating': max(1, int(value + 0.5)),
+        'watch_date': _parse_watch_date(record.get('watch_date')),
+        'review': str(record.get('review') or ''),
+        'is_favorite': str(record.get('is_favorite', '')).lower() in ('1', 'true', 'yes', 'y'),
+    }
+
+
+def import_ratings(user, lines, chunk_size=None):
+    """(줄 번호, dict) 스트림을 chunk_size개씩 저장. 반환값: 결과 요약 dict (줄 수 한도를 넘으면 truncated)"""
+    chunk_size = chunk_size or getattr(settings, 'RATING_IMPORT_CHUNK_SIZE', 500)
+    max_rows = getattr(settings, 'RATING_IMPORT_MAX_ROWS', 50_000)
+    summary = {'created': 0, 'updated': 0, 'skipped': 0, 'errors': []}
+
+    def skip(line_number, message):
+        summary['skipped'] += 1
+        if len(summary['errors']) < MAX_REPORTED_ERRORS:
+            summary['errors'].append({'line': line_number, 'error': message})
+
+    try:
+        chunk, rows = [], 0
+        for line_number, record in lines:
+            rows += 1
+            if rows > max_rows:
+                # 앞 묶음은 이미 커밋됐으므로 실패 대신 여기까지의 결과를 돌려준다
+                skip(line_number, f'한 번에 최대 {max_rows}개까지 가져올 수 있어 이 줄부터는 읽지 않았습니다.')
+                summary['truncated'] = True
+                break
+            if isinstance(record, RatingImportError):
+                skip(line_number, str(record))
+                continue
+            try:
+                chunk.append((line_number, clean_record(record)))
+            except RatingImportError as e:
+                skip(line_number, str(e))
+                continue
+            if len(chunk) >= chunk_size:
+                _save_chunk(user, chunk, summary, skip)
+                chunk = []
+        if chunk:
+            _save_chunk(user, chunk, summary, skip)
+    finally:
+        # 일괄 upsert는 시그널이 없으므로 프로필은 평점 전체로 다시 계산
+        if summary['created'] or summary['updated']:
+            rebuild_profile(user)
+
+    summary['imported'] = summary['created'] + summary['updated']
+    return summary
+
+
+@transaction.atomic
+def _save_chunk(user, chunk, summary, skip):
+    """묶음 하나 (한 트랜잭션): 영화 조회 -> 기존 평점 확인 -> upsert"""
+    ids = {fields['movie_id'] for _, fields in chunk if fields['movie_id'] is not None}
+    tmdb_ids = {fields['tmdb_id'] for _, fields in chunk if fields['movie_id'] is None}
+    known_ids = set(Movie.objects.filter(id__in=ids).values_list('id', flat=True)) if ids else set()
+    # DB에 없는 tmdb_id는 임시 영화로 만들고 상세 정보(제목 포함)는 워커가 나중에 채운다
+    by_tmdb_id = resolve_tmdb_ids(tmdb_ids) if tmdb_ids else {}
+
+    # 같은 영화가 여러 줄에 있으면 마지막 줄 기준 (한 upsert 문에서 같은 키를 두 번 쓸 수 없다)
+    # 앞 줄은 건너뜀으로 집계해 created + updated + skipped가 입력 줄 수와 맞게 한다
+    preferences, lines_by_movie = {}, {}
+    for line_number, fields in chunk:
+        if fields['movie_id'] is not None:
+            movie_id = fields['movie_id'] if fields['movie_id'] in known_ids else None
+            reference = f"movie_id={fields['movie_id']}"
+        else:
+            movie_id = by_tmdb_id.get(fields['tmdb_id'])
+            reference = f"tmdb_id={fields['tmdb_id']}"
+        if movie_id is None:
+            skip(line_number, f'존재하지 않는 영화입니다 ({reference}).')
+            continue
+        if movie_id in lines_by_movie:
+            skip(lines_by_movie[movie_id], f'같은 영화가 {line_number}번째 줄에 다시 있어 건너뛰었습니다 ({reference}).')
+        lines_by_movie[movie_id] = line_number
+        preferences[movie_id] = UserMoviePreference(
+            user=user, movie_id=movie_id, rating=fields['rating'], watch_date=fields['watch_date'],
+            review=fields['review'], is_favorite=fields['is_favorite'],
+        )
+    if not preferences:
+        return
+
+    existing = UserMoviePreference.objects.filter(user=user, movie_id__in=preferences).count()
+    UserMoviePreference.objects.bulk_create(
+        list(preferences.values()),
+        update_conflicts=True,
+        unique_fields=['user', 'movie'],
+        update_fields=['rating', 'watch_date', 'review', 'is_favorite', 'updated_at'],
+    )
+    summary['updated'] += existing
+    summary['created'] += len(preferences) - existing
+
+
+def _optional_int(value, name):
+    if value in (None, ''):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise RatingImportError(f'{name}이(가) 정수가 아닙니다.')
+
+
+def _parse_watch_date(value):
+    if not value:
+        return None
+    value = str(value)
+    try:
+        parsed = parse_datetime(value)
+        if parsed is None:
+            day = parse_date(value)
+            parsed = datetime.combine(day, datetime.min.time()) if day else None
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise RatingImportError(f'watch_date 형식 오류: {value}')
+    if settings.USE_TZ and timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+# ---- 내보내기 --------------------------------------------------------------
+
+def export_lines(user, fmt):
+    """사용자 평점을 한 줄씩 (str) - StreamingHttpResponse에 그대로 넘긴다"""
+    rows = (
+        UserMoviePreference.objects.filter(user=user)
+        .order_by('created_at', 'id')
+        .values('movie_id', 'movie__tmdb_id', 'movie__title', 'rating', 'watch_date', 'review', 'is_favorite',
+                'created_at')
+        .iterator(chunk_size=getattr(settings, 'RATING_EXPORT_CHUNK_SIZE', 2000))
+    )
+    if fmt == 'csv':
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        yield _csv_line(writer, buffer, CSV_COLUMNS)
+        for row in rows:
+            yield _csv_line(writer, buffer, [_export_value(value) for value in _export_record(row).values()])
+        return
+    for row in rows:
+        yield json.dumps(_export_record(row), ensure_ascii=False) + '\n'
+
+
+def _export_record(row):
+    # 가져오기와 같은 열 이름 - 내보낸 파일을 그대로 다시 가져올 수 있다
+    return {
+        'movie_id': row['movie_id'],
+        'tmdb_id': row['movie__tmdb_id'],
+        'title': row['movie__title'],
+        'rating': row['rating'],
+        'watch_date': row['watch_date'].isoformat() if row['watch_date'] else None,
+        'review': row['review'],
+        'is_favorite': row['is_favorite'],
+        'created_at': row['created_at'].isoformat(),
+    }
+
+
+def _export_value(value):
+    return '' if value is None else value
+
+
+def _csv_line(writer, buffer, values):
+    buffer.seek(0)
+    buffer.truncate()
+    writer.writerow(values)
+    return buffer.getvalue()
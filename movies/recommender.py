@@ -0,0 +1,253 @@
+# movies/recommender.py - 평점 기반 item-item 협업 필터링 추천
+"""사용자×영화 평점 희소 행렬에서 영화 간 유사도를 미리 계산해 MovieNeighbor에 저장하고,
+추천 요청 때는 사용자가 평가한 영화의 이웃만 읽어 점수를 합산한다.
+
+- 유사도: 사용자 평균을 뺀 평점의 코사인 (adjusted cosine), 공동 평가자가 적으면 축소
+- 계산: 영화 묶음 × 전체 영화 곱을 사용자별 평점 쌍으로 펼쳐 bincount로 누적
+  (묶음 크기는 펼친 쌍 수와 누적 행렬 크기로 제한 - 메모리 사용량 일정)
+- 저장: 영화마다 상위 k개만 (영화 수 × k 행)
+- 추천: 쿼리 3회 (사용자 평점, 이웃, 영화 정보) + 이웃 수에 비례하는 numpy 합산
+- 갱신: 마지막 계산 이후 평점이 바뀌거나 삭제된 영화의 이웃만 다시 계산 (refresh_rating_neighbors)
+"""
+import logging
+import time
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import Movie, MovieNeighbor, RatingNeighborRefresh, UserMoviePreference
+from .serialization import movie_list_queryset
+
+logger = logging.getLogger(__name__)
+
+MIN_CO_RATERS = 3  # 공동 평가자가 이보다 적은 영화 쌍은 유사도 0
+SHRINKAGE = 10  # 유사도 × n / (n + SHRINKAGE) - 공동 평가자가 적을수록 작게
+PAIR_BUDGET = 4_000_000  # 묶음 하나에서 펼치는 (영화, 영화) 평점 쌍 최대 수
+BLOCK_CELLS = 2_000_000  # 묶음 누적 행렬(묶음 영화 수 × 전체 영화 수) 최대 칸 수
+
+
+class RatingData:
+    """평점을 연속 인덱스의 희소 행렬(CSR: 사용자 기준, 사용자 평균을 뺀 값)로 보관"""
+
+    def __init__(self, user_idx, item_idx, values, movie_ids, n_users):
+        self.movie_ids = movie_ids  # 열 인덱스 -> Movie id
+        self.n_users = n_users
+        self.n_items = len(movie_ids)
+
+        order = np.argsort(user_idx, kind='stable')
+        self.user_idx = user_idx[order]
+        self.item_idx = item_idx[order]
+        self.values = values[order]
+        self.indptr = np.zeros(n_users + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.user_idx, minlength=n_users), out=self.indptr[1:])
+
+        self.user_degree = np.diff(self.indptr)
+        self.item_norms = np.sqrt(np.bincount(self.item_idx, weights=self.values ** 2, minlength=self.n_items))
+
+    @classmethod
+    def from_arrays(cls, user_ids, movie_ids, ratings):
+        """(user_id, movie_id, rating) 배열 -> 사용자 평균을 뺀 희소 행렬"""
+        users, user_idx = np.unique(user_ids, return_inverse=True)
+        items, item_idx = np.unique(movie_ids, return_inverse=True)
+        ratings = np.asarray(ratings, dtype=np.float32)
+        sums = np.bincount(user_idx, weights=ratings, minlength=len(users))
+        means = sums / np.bincount(user_idx, minlength=len(users))
+        values = (ratings - means[user_idx]).astype(np.float32)
+        return cls(user_idx.astype(np.int64), item_idx.astype(np.int64), values, items, len(users))
+
+    @classmethod
+    def from_db(cls, chunk_size=50_000):
+        """UserMoviePreference 전체를 튜플 목록 없이 바로 배열로 적재 (한 번 읽기 - 읽는 중 삭제돼도 안전)"""
+        rows = UserMoviePreference.objects.order_by().values_list('user_id', 'movie_id', 'rating').iterator(
+            chunk_size=chunk_size)
+        table = np.fromiter(rows, dtype=[('user', np.int64), ('movie', np.int64), ('rating', np.float32)])
+        return cls.from_arrays(table['user'], table['movie'], table['rating'])
+
+
+def item_blocks(data, rows):
+    """펼친 쌍 수와 누적 행렬 크기 제한에 맞춰 영화 인덱스를 묶음으로 나눈다"""
+    pairs_per_item = np.bincount(data.item_idx, weights=data.user_degree[data.user_idx], minlength=data.n_items)
+    max_items = max(1, BLOCK_CELLS // max(data.n_items, 1))
+    block, pairs = [], 0
+    for item in rows:
+        cost = pairs_per_item[item]
+        if block and (pairs + cost > PAIR_BUDGET or len(block) >= max_items):
+            yield np.array(block, dtype=np.int64)
+            block, pairs = [], 0
+        block.append(item)
+        pairs += cost
+    if block:
+        yield np.array(block, dtype=np.int64)
+
+
+def item_neighbors(data, rows=None, k=50, min_co_raters=MIN_CO_RATERS, shrinkage=SHRINKAGE):
+    """영화 인덱스 rows(기본: 전체)의 상위 k개 이웃 - (영화 인덱스, 이웃 인덱스 배열, 유사도 배열)을 차례로"""
+    rows = np.arange(data.n_items) if rows is None else np.asarray(rows, dtype=np.int64)
+    # 영화 기준으로 정렬한 평점 (묶음 영화의 평가자를 빠르게 찾기 위해)
+    by_item = np.argsort(data.item_idx, kind='stable')
+    item_ptr = np.zeros(data.n_items + 1, dtype=np.int64)
+    np.cumsum(np.bincount(data.item_idx, minlength=data.n_items), out=item_ptr[1:])
+
+    for block in item_blocks(data, rows):
+        local = np.full(data.n_items, -1, dtype=np.int64)
+        local[block] = np.arange(len(block))
+
+        # 묶음 영화의 평점 (사용자 u, 묶음 영화 i, 값 a)
+        entries = np.concatenate([by_item[item_ptr[i]:item_ptr[i + 1]] for i in block])
+        users = data.user_idx[entries]
+        left_item = local[data.item_idx[entries]]
+        left_value = data.values[entries]
+
+        # 각 평점을 같은 사용자의 모든 평점 (j, b)와 짝지음 -> a*b를 (i, j) 칸에 누적
+        degree = data.user_degree[users]
+        repeat_left = np.repeat(np.arange(len(entries)), degree)
+        offsets = np.arange(len(repeat_left)) - np.repeat(np.cumsum(degree) - degree, degree)
+        right = data.indptr[users][repeat_left] + offsets
+        cell = left_item[repeat_left] * data.n_items + data.item_idx[right]
+        size = len(block) * data.n_items
+        dots = np.bincount(cell, weights=left_value[repeat_left] * data.values[right], minlength=size)
+        co_raters = np.bincount(cell, minlength=size)
+
+        dots = dots.reshape(len(block), data.n_items)
+        co_raters = co_raters.reshape(len(block), data.n_items)
+        norms = np.outer(data.item_norms[block], data.item_norms)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            similarity = np.where(norms > 0, dots / norms, 0.0)
+        similarity *= co_raters / (co_raters + shrinkage)
+        similarity[co_raters < min_co_raters] = 0.0
+        similarity[np.arange(len(block)), block] = 0.0  # 자기 자신 제외
+
+        top = min(k, data.n_items - 1)
+        if top <= 0:
+            continue
+        candidates = np.argpartition(-similarity, top - 1, axis=1)[:, :top]
+        for row, item in enumerate(block):
+            neighbor = candidates[row]
+            score = similarity[row, neighbor]
+            keep = score > 0
+            neighbor, score = neighbor[keep], score[keep]
+            order = np.argsort(-score, kind='stable')
+            yield item, neighbor[order], score[order]
+
+
+def score_candidates(seed_deviations, neighbor_rows):
+    """평가한 영화의 (평균 대비 편차)와 이웃 (영화, 이웃, 유사도) -> {이웃: 추천 점수}
+
+    점수 = Σ 유사도 × 편차 / (Σ |유사도| + 1) - 근거(이웃 수)가 적은 후보는 작게
+    """
+    if not neighbor_rows:
+        return {}
+    movies, neighbors, scores = (np.array(column) for column in zip(*neighbor_rows))
+    deviations = np.array([seed_deviations[movie] for movie in movies.tolist()], dtype=np.float64)
+    candidates, index = np.unique(neighbors, return_inverse=True)
+    weighted = np.bincount(index, weights=scores * deviations, minlength=len(candidates))
+    support = np.bincount(index, weights=np.abs(scores), minlength=len(candidates))
+    return dict(zip(candidates.tolist(), (weighted / (support + 1)).tolist()))
+
+
+# ---- DB 저장/조회 ----------------------------------------------------------
+
+def save_neighbors(data, neighbor_iter, kind=MovieNeighbor.KIND_RATINGS, computed_at=None, batch_size=500):
+    """item_neighbors 결과를 영화 묶음 단위로 교체 저장. 반환값: 저장한 영화 수
+
+    computed_at은 평점을 읽기 전 시각이어야 한다 (읽는 도중 바뀐 평점을 다음 갱신에서 놓치지 않도록).
+    """
+    computed_at = computed_at or timezone.now()
+    saved, pending = 0, {}
+
+    def flush():
+        with transaction.atomic():
+            MovieNeighbor.objects.filter(kind=kind, movie_id__in=list(pending)).delete()
+            MovieNeighbor.objects.bulk_create([
+                MovieNeighbor(kind=kind, movie_id=movie_id, neighbor_id=neighbor_id, rank=rank,
+                              score=score, computed_at=computed_at)
+                for movie_id, neighbors in pending.items()
+                for rank, (neighbor_id, score) in enumerate(neighbors)
+            ], batch_size=2000)
+
+    for item, neighbor_idx, scores in neighbor_iter:
+        pending[int(data.movie_ids[item])] = list(zip(data.movie_ids[neighbor_idx].tolist(), scores.tolist()))
+        if len(pending) >= batch_size:
+            flush()
+            saved += len(pending)
+            pending = {}
+    if pending:
+        flush()
+        saved += len(pending)
+    return saved
+
+
+def refresh_rating_neighbors(full=False, k=None):
+    """평점 기반 이웃 재계산 - 기본은 마지막 계산 이후 평점이 바뀌거나 삭제된 영화만
+
+    반환값: (다시 계산한 영화 수, 소요 초)
+    """
+    started = time.perf_counter()
+    k = k or getattr(settings, 'RECOMMENDER_NEIGHBORS', 50)
+    last_computed = None if full else MovieNeighbor.objects.filter(
+        kind=MovieNeighbor.KIND_RATINGS).aggregate(last=Max('computed_at'))['last']
+
+    # 평점이 삭제된 영화 - 여기서 읽은 예약만 마지막에 지운다 (계산 중 새로 생긴 예약은 다음 갱신 때)
+    refresh_ids, deleted_movie_ids = [], []
+    for refresh_id, movie_id in RatingNeighborRefresh.objects.values_list('id', 'movie_id'):
+        refresh_ids.append(refresh_id)
+        deleted_movie_ids.append(movie_id)
+
+    computed_at = timezone.now()
+    data = RatingData.from_db()
+    if last_computed is None or data.n_items == 0:
+        rows = None
+        # 평점이 모두 지워진 영화의 이웃 행은 전체 재계산 때 정리
+        MovieNeighbor.objects.filter(kind=MovieNeighbor.KIND_RATINGS).exclude(
+            movie_id__in=data.movie_ids.tolist()).delete()
+    else:
+        changed = set(UserMoviePreference.objects.filter(updated_at__gt=last_computed).order_by().values_list(
+            'movie_id', flat=True).distinct())
+        changed = np.fromiter(changed.union(deleted_movie_ids), dtype=np.int64)
+        dropped = np.setdiff1d(changed, data.movie_ids)
+        if dropped.size:
+            MovieNeighbor.objects.filter(kind=MovieNeighbor.KIND_RATINGS, movie_id__in=dropped.tolist()).delete()
+        rows = np.flatnonzero(np.isin(data.movie_ids, changed))
+
+    saved = 0
+    if data.n_items and (rows is None or rows.size):
+        saved = save_neighbors(data, item_neighbors(data, rows, k=k), computed_at=computed_at)
+    RatingNeighborRefresh.objects.filter(id__in=refresh_ids).delete()
+    elapsed = time.perf_counter() - started
+    logger.info(f"평점 기반 이웃 계산: 영화 {saved}편 ({'전체' if rows is None else '변경분'}), {elapsed:.1f}초")
+    return saved, elapsed
+
+
+def recommend_for_user(user, limit=20):
+    """평가한 영화의 이웃으로 아직 보지 않은 영화 추천 - [(movie, 점수)]
+
+    이웃이 없으면(평점이 없거나 이웃 계산 전) 보지 않은 인기 영화로 채운다.
+    """
+    max_seeds = getattr(settings, 'RECOMMENDER_MAX_SEED_RATINGS', 200)
+    ratings = list(
+        UserMoviePreference.objects.filter(user=user).order_by('-created_at').values_list('movie_id', 'rating'))
+    rated = {movie_id for movie_id, _ in ratings}
+    scores = {}
+    if ratings:
+        mean = sum(rating for _, rating in ratings) / len(ratings)
+        # 최근 평가 max_seeds개만 근거로 사용 (평점이 많은 사용자도 조회량 일정)
+        seeds = {movie_id: rating - mean for movie_id, rating in ratings[:max_seeds]}
+        neighbor_rows = list(
+            MovieNeighbor.objects.filter(kind=MovieNeighbor.KIND_RATINGS, movie_id__in=list(seeds))
+            .values_list('movie_id', 'neighbor_id', 'score'))
+        scores = {movie_id: score for movie_id, score in score_candidates(seeds, neighbor_rows).items()
+                  if movie_id not in rated and score > 0}
+
+    ranked = sorted(scores, key=scores.get, reverse=True)[:limit]
+    if len(ranked) < limit:
+        popular = (
+            Movie.objects.listed().exclude(id__in=rated | set(ranked)).order_by('-popularity', '-id')
+            .values_list('id', flat=True)[:limit - len(ranked)]
+        )
+        ranked.extend(popular)
+
+    movies = movie_list_queryset().in_bulk(ranked)
+    return [(movies[movie_id], scores.get(movie_id, 0.0)) for movie_id in ranked if movie_id in movies]
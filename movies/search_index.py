@@ -0,0 +1,234 @@
+# movies/search_index.py - 로컬 영화 카탈로그 전문 검색 (SQLite FTS5 / PostgreSQL 트라이그램)
+import logging
+import re
+
+from django.conf import settings
+from django.db import OperationalError, connection, transaction
+from django.db.models import Q
+
+from .models import Movie
+
+logger = logging.getLogger(__name__)
+
+SEARCH_TABLE = f'{Movie._meta.db_table}_search'
+SEARCH_COLUMNS = ('title', 'original_title', 'overview')
+COLUMN_WEIGHTS = (10.0, 5.0, 1.0)  # bm25 가중치: 제목 > 원제 > 줄거리
+# 이보다 짧은 검색어는 2-gram/트라이그램 색인으로 찾을 수 없어 icontains로 ('충' -> '기생충')
+MIN_INDEXED_QUERY_LENGTH = 2
+
+_WORD_RE = re.compile(r'\w+')
+# 한글(음절/자모), 한자, 가나 - 띄어쓰기만으로는 단어 경계가 안 잡히므로 2-gram으로 색인
+_CJK_RE = re.compile(r'[\u1100-\u11ff\u3040-\u30ff\u3130-\u318f\u4e00-\u9fff\uac00-\ud7a3]+')
+
+
+def ngram_tokens(text):
+    """색인/검색용 토큰: 한글·CJK 구간은 2-gram, 그 외 단어는 그대로(소문자)
+
+    '기생충 Parasite' -> ['기생', '생충', 'parasite']
+    """
+    tokens = []
+    for word in _WORD_RE.findall((text or '').lower()):
+        position = 0
+        for match in _CJK_RE.finditer(word):
+            if match.start() > position:
+                tokens.append(word[position:match.start()])
+            run = match.group()
+            if len(run) == 1:
+                tokens.append(run)
+            else:
+                tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+            position = match.end()
+        if position < len(word):
+            tokens.append(word[position:])
+    return tokens
+
+
+def search_backend():
+    """MOVIE_SEARCH_BACKEND: 'auto'(DB 종류로 선택) | 'fts5' | 'postgres' | 'icontains'"""
+    backend = getattr(settings, 'MOVIE_SEARCH_BACKEND', 'auto')
+    if backend != 'auto':
+        return backend
+    return {'sqlite': 'fts5', 'postgresql': 'postgres'}.get(connection.vendor, 'icontains')
+
+
+def search_local_movies(query, limit=20, queryset=None):
+    """제목/원제/줄거리에서 관련도 순으로 영화 검색
+
+    한 글자 검색어, 또는 색인 테이블이 아직 없을 때(rebuild_search_index 실행 전)는 제목/원제 icontains.
+    """
+    query = (query or '').strip()
+    queryset = queryset if queryset is not None else Movie.objects.listed()
+    if not query:
+        return list(queryset[:limit])
+
+    backend = search_backend()
+    if len(query) >= MIN_INDEXED_QUERY_LENGTH and backend in ('fts5', 'postgres'):
+        try:
+            if backend == 'fts5':
+                if fts5_index_ready():
+                    return _fts5_search(query, limit, queryset)
+                _log_fallback(backend, f"{SEARCH_TABLE} 테이블 없음 - rebuild_search_index 실행 필요")
+            else:
+                # PostgreSQL은 실패한 쿼리가 트랜잭션을 막으므로 대체 검색이 가능하도록 savepoint 안에서
+                with transaction.atomic():
+                    return _postgres_search(query, limit, queryset)
+        except OperationalError as e:
+            _log_fallback(backend, e)
+    return list(queryset.filter(Q(title__icontains=query) | Q(original_title__icontains=query))[:limit])
+
+
+_fallback_logged = set()
+
+
+def _log_fallback(backend, reason):
+    """icontains 대체 경고는 프로세스당 백엔드별 한 번만 (색인이 없으면 모든 검색 요청이 여기로 온다)"""
+    if backend in _fallback_logged:
+        logger.debug(f"검색 색인 사용 실패 ({backend}), icontains로 대체: {reason}")
+        return
+    _fallback_logged.add(backend)
+    logger.warning(f"검색 색인 사용 실패 ({backend}), icontains로 대체 (이 프로세스에서는 다시 경고하지 않음): {reason}")
+
+
+def create_search_index():
+    """검색 색인용 테이블/확장/인덱스 생성 (DDL - rebuild_search_index 명령에서만 호출)"""
+    backend = search_backend()
+    if backend == 'postgres':
+        _ensure_postgres_indexes()
+    elif backend == 'fts5':
+        with connection.cursor() as cursor:
+            # 토큰은 ngram_tokens로 미리 만들어 넣으므로 공백 기준 unicode61이면 충분
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+                f"{', '.join(SEARCH_COLUMNS)}, tokenize = 'unicode61 remove_diacritics 2')"
+            )
+
+
+def rebuild_search_index(batch_size=2000):
+    """색인 테이블/인덱스를 만들고 전체 영화 다시 색인. 반환값: 색인한 영화 수"""
+    create_search_index()
+    if search_backend() == 'postgres':
+        return Movie.objects.count()
+    if search_backend() != 'fts5':
+        return 0
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+    total, last_id = 0, 0
+    while True:
+        ids = list(Movie.objects.listed().filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:batch_size])
+        if not ids:
+            return total
+        index_movies(ids)
+        total += len(ids)
+        last_id = ids[-1]
+
+
+# ---- SQLite FTS5 -----------------------------------------------------------
+
+_fts5_ready = False
+
+
+def fts5_index_ready():
+    """FTS5 색인 테이블이 있는지 (있다고 확인되면 프로세스가 끝날 때까지 다시 묻지 않는다)
+
+    없는 동안은 검색마다 sqlite_master를 한 번 조회한다 - 실패할 MATCH 쿼리를 보내고 예외를 받는 것보다 싸고,
+    다른 프로세스에서 rebuild_search_index를 실행하면 재시작 없이 색인을 쓰기 시작한다.
+    """
+    global _fts5_ready
+    if not _fts5_ready:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [SEARCH_TABLE])
+            _fts5_ready = cursor.fetchone() is not None
+    return _fts5_ready
+
+
+def index_movies(movie_ids):
+    """영화들의 색인 행을 현재 값으로 교체 (저장 시그널 / 일괄 저장 경로에서 호출)
+
+    색인 테이블이 아직 없으면 건너뛴다 - rebuild_search_index가 만들면서 전체를 색인한다.
+    목록에 나오지 않는 임시 영화(Movie.objects.listed() 밖)는 색인 행을 지우기만 한다.
+    """
+    if search_backend() != 'fts5' or not movie_ids or not fts5_index_ready():
+        return
+    rows = Movie.objects.listed().filter(id__in=movie_ids).values_list('id', *SEARCH_COLUMNS)
+    with connection.cursor() as cursor:
+        cursor.executemany(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s", [(movie_id,) for movie_id in movie_ids])
+        cursor.executemany(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, {', '.join(SEARCH_COLUMNS)}) VALUES (%s, %s, %s, %s)",
+            [(row[0], *(' '.join(ngram_tokens(value)) for value in row[1:])) for row in rows],
+        )
+
+
+def unindex_movies(movie_ids):
+    if search_backend() != 'fts5' or not movie_ids or not fts5_index_ready():
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s", [(movie_id,) for movie_id in movie_ids])
+
+
+def _fts5_match_expression(query):
+    """검색어 -> FTS5 MATCH 식 (모든 토큰 AND, 마지막 토큰은 입력 중일 수 있어 접두어 검색)"""
+    tokens = ngram_tokens(query)
+    if not tokens:
+        return None
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def _fts5_search(query, limit, queryset):
+    expression = _fts5_match_expression(query)
+    if expression is None:
+        return []
+
+    weights = ', '.join(str(weight) for weight in COLUMN_WEIGHTS)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT s.rowid FROM {SEARCH_TABLE} s JOIN {Movie._meta.db_table} m ON m.id = s.rowid "
+            f"WHERE {SEARCH_TABLE} MATCH %s "
+            f"ORDER BY bm25({SEARCH_TABLE}, {weights}), m.popularity DESC LIMIT %s",
+            [expression, limit],
+        )
+        ranked_ids = [row[0] for row in cursor.fetchall()]
+
+    movies = queryset.filter(id__in=ranked_ids).in_bulk()
+    return [movies[movie_id] for movie_id in ranked_ids if movie_id in movies]
+
+
+# ---- PostgreSQL (pg_trgm + tsvector) ---------------------------------------
+
+def _postgres_search(query, limit, queryset):
+    """제목/원제는 트라이그램 유사도(% 연산자), 줄거리는 tsvector로 검색 - 모두 GIN 인덱스 사용"""
+    # trigram_similar lookup은 django.contrib.postgres가 INSTALLED_APPS에 있어야 등록된다 (settings 참고)
+    from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramSimilarity
+    from django.db.models.functions import Greatest
+
+    search_query = SearchQuery(query, config='simple')
+    return list(
+        queryset.annotate(
+            overview_vector=SearchVector('overview', config='simple'),
+            similarity=Greatest(TrigramSimilarity('title', query), TrigramSimilarity('original_title', query)),
+        )
+        .filter(
+            Q(title__trigram_similar=query)
+            | Q(original_title__trigram_similar=query)
+            | Q(overview_vector=search_query)
+        )
+        .annotate(rank=SearchRank('overview_vector', search_query))
+        .order_by('-similarity', '-rank', '-popularity')[:limit]
+    )
+
+
+def _ensure_postgres_indexes():
+    """pg_trgm 확장과 GIN 인덱스 생성 (SQLite에서는 만들 수 없어 모델 Meta 대신 여기서 관리)"""
+    table = Movie._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for column in ('title', 'original_title'):
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {table}_{column}_trgm ON {table} USING gin ({column} gin_trgm_ops)")
+        # SearchVector('overview', config='simple')가 만드는 식과 같아야 인덱스가 쓰인다
+        cursor.execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_overview_tsv ON {table} USING gin ("
+            f"to_tsvector('simple'::regconfig, COALESCE((overview)::text, ''::text)))"
+        )
@@ -0,0 +1,112 @@
+# movies/serialization.py - 목록/검색 응답 직렬화 (views, async_views 공용)
+"""응답에 필요한 컬럼만 읽고, 관계는 쿼리 수가 결과 수와 무관하도록 가져온다.
+
+- 목록(movie_list, preferences GET): values()로 dict만 읽는다 (모델 인스턴스 생성 없음, 1쿼리)
+- 검색 결과(장르 포함): only() + prefetch_related('genres') (영화 1쿼리 + 장르 1쿼리)
+- 모두 Movie.objects.listed() 기준 - 상세 정보를 기다리는 임시 영화는 나오지 않는다
+"""
+from django.db.models import Prefetch
+
+from .models import Genre, Movie, UserMoviePreference
+
+POSTER_BASE_URL = 'https://image.tmdb.org/t/p/w500'
+BACKDROP_BASE_URL = 'https://image.tmdb.org/t/p/w1280'
+
+MOVIE_LIST_FIELDS = ('id', 'tmdb_id', 'title', 'overview', 'release_date', 'vote_average', 'poster_path', 'popularity')
+MOVIE_DETAIL_FIELDS = MOVIE_LIST_FIELDS + ('backdrop_path',)
+PREFERENCE_LIST_FIELDS = (
+    'id', 'rating', 'created_at',
+    'movie_id', 'movie__title', 'movie__poster_path', 'movie__vote_average', 'movie__release_date',
+)
+
+
+def image_url(base_url, path):
+    return f"{base_url}{path}" if path else ''
+
+
+def movie_list_rows():
+    """movie_list용 values() 쿼리셋 (keyset_page에 그대로 넘긴다)"""
+    return Movie.objects.listed().values(*MOVIE_LIST_FIELDS)
+
+
+def movie_list_queryset():
+    """movie_list 검색 결과용 - search_local_movies가 모델 인스턴스를 돌려주므로 컬럼만 제한"""
+    return Movie.objects.listed().only(*MOVIE_LIST_FIELDS)
+
+
+def movie_detail_queryset():
+    """장르까지 응답하는 검색 결과용 쿼리셋 - 영화/장르 각각 필요한 컬럼만"""
+    return Movie.objects.listed().only(*MOVIE_DETAIL_FIELDS).prefetch_related(
+        Prefetch('genres', queryset=Genre.objects.only('id', 'name')))
+
+
+def preference_list_rows(user):
+    """preferences GET용 values() 쿼리셋 (영화 컬럼은 JOIN 한 번으로)"""
+    return UserMoviePreference.objects.filter(user=user).values(*PREFERENCE_LIST_FIELDS)
+
+
+def serialize_movie_row(row):
+    """movie_list_rows()의 dict 한 줄"""
+    return {
+        'id': row['id'],
+        'title': row['title'],
+        'overview': row['overview'],
+        # 기존 movie_list 응답 형식 유지 - 개봉일이 없으면 'None' (검색 응답 serialize_db_movie는 '')
+        'release_date': str(row['release_date']),
+        'vote_average': row['vote_average'],
+        'poster_url': image_url(POSTER_BASE_URL, row['poster_path']),
+        'tmdb_id': row['tmdb_id'],
+    }
+
+
+def serialize_movie(movie):
+    """movie_list_queryset()의 영화 - serialize_movie_row와 같은 형식"""
+    return serialize_movie_row({field: getattr(movie, field) for field in MOVIE_LIST_FIELDS})
+
+
+def serialize_db_movie(movie):
+    """movie_detail_queryset()의 영화 (genres는 prefetch된 것을 사용)"""
+    return {
+        'id': movie.id,
+        'tmdb_id': movie.tmdb_id,
+        'title': movie.title,
+        'overview': movie.overview,
+        'release_date': str(movie.release_date) if movie.release_date else '',
+        'vote_average': movie.vote_average,
+        'poster_url': image_url(POSTER_BASE_URL, movie.poster_path),
+        'backdrop_url': image_url(BACKDROP_BASE_URL, movie.backdrop_path),
+        'genres': [genre.name for genre in movie.genres.all()],
+        'source': 'db'
+    }
+
+
+def serialize_tmdb_movie(tmdb_movie):
+    """TMDB 검색 결과 한 건 (아직 DB에 없는 영화)"""
+    return {
+        'id': None,
+        'tmdb_id': tmdb_movie['id'],
+        'title': tmdb_movie.get('title', ''),
+        'overview': tmdb_movie.get('overview', ''),
+        'release_date': tmdb_movie.get('release_date', ''),
+        'vote_average': tmdb_movie.get('vote_average', 0),
+        'poster_url': image_url(POSTER_BASE_URL, tmdb_movie.get('poster_path')),
+        'backdrop_url': image_url(BACKDROP_BASE_URL, tmdb_movie.get('backdrop_path')),
+        'genres': [],  # 일단 비워둠 (genre_ids 변환 필요)
+        'source': 'tmdb'
+    }
+
+
+def serialize_preference_row(row):
+    """preference_list_rows()의 dict 한 줄"""
+    return {
+        'id': row['id'],
+        'movie': {
+            'id': row['movie_id'],
+            'title': row['movie__title'],
+            'poster_url': image_url(POSTER_BASE_URL, row['movie__poster_path']),
+            'vote_average': row['movie__vote_average'],
+            'release_date': row['movie__release_date'],
+        },
+        'rating': row['rating'],
+        'created_at': row['created_at'].isoformat(),
+    }
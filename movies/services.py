@@ -3,6 +3,9 @@ from django.conf import settings
 from typing import Dict, List, Optional
 import logging
 
+from .tmdb_client import tmdb_http
+from .tmdb_cache import tmdb_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -29,10 +32,13 @@ class TMDBService:
 
         url = f"{self.base_url}/{endpoint}"
 
-        try:
-            response = requests.get(url, params=params, timeout=10)
+        def fetch():
+            response = tmdb_http.get(url, params=params)
             response.raise_for_status()  # HTTP 에러 발생 시 예외 발생
             return response.json()
+
+        try:
+            return tmdb_cache.get_or_fetch(endpoint, params, fetch)
         except requests.exceptions.RequestException as e:
             logger.error(f"TMDB API 요청 실패: {e}")
             return None
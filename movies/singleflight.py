@@ -0,0 +1,99 @@
+# movies/singleflight.py
+import asyncio
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    """진행 중인 호출 하나 - 결과가 나오면 event로 대기자들을 깨운다"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """같은 키로 동시에 들어온 호출을 하나의 실제 호출로 합친다 (request coalescing)
+
+    첫 호출자(leader)만 fn()을 실행하고, 그 사이 같은 키로 들어온 호출자들은
+    결과(또는 예외)를 공유받는다. 스레드 간(sync)과 이벤트 루프 내(async) 모두 지원한다.
+    완료된 호출은 바로 지워지므로 결과를 캐시하지는 않는다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._tasks = {}
+        self.executions = 0  # 실제로 실행된 호출 수
+        self.coalesced = 0  # 다른 호출에 합쳐진 호출 수
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self.executions += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+    async def ado(self, key, coro_fn):
+        """do()의 async 버전 - coro_fn은 코루틴 함수
+
+        실제 호출은 별도 태스크로 실행하고 모두 shield로 기다리므로,
+        leader 요청이 취소돼도 나머지 대기자의 호출은 계속 진행된다.
+        """
+        loop = asyncio.get_running_loop()
+        task_key = (loop, key)
+        with self._lock:
+            task = self._tasks.get(task_key)
+            if task is None:
+                task = loop.create_task(coro_fn())
+                self._tasks[task_key] = task
+                self.executions += 1
+                task.add_done_callback(lambda done: self._forget_task(task_key, done))
+            else:
+                self.coalesced += 1
+
+        return await asyncio.shield(task)
+
+    def _forget_task(self, task_key, task):
+        with self._lock:
+            self._tasks.pop(task_key, None)
+        if not task.cancelled():
+            task.exception()  # 대기자가 모두 취소된 경우 'never retrieved' 경고 방지
+
+    def stats(self):
+        with self._lock:
+            total = self.executions + self.coalesced
+            return {
+                'executions': self.executions,
+                'coalesced': self.coalesced,
+                'in_flight': len(self._calls) + len(self._tasks),
+                'coalesce_rate': round(self.coalesced / total, 3) if total else 0.0,
+            }
+
+
+# TMDB 호출용 전역 인스턴스
+tmdb_singleflight = SingleFlight()
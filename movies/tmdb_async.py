@@ -0,0 +1,180 @@
+# movies/tmdb_async.py
+import asyncio
+import logging
+import weakref
+
+import httpx
+from django.conf import settings
+
+from .tmdb_cache import tmdb_cache
+from .tmdb_ratelimit import TMDBRateLimited, tmdb_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncTMDBService:
+    """asyncio 기반 TMDB 클라이언트 - TMDBService와 같은 메서드/반환값
+
+    ASGI 워커 하나가 TMDB 응답을 기다리는 동안 다른 요청을 계속 처리할 수 있다.
+    httpx.AsyncClient는 이벤트 루프에 묶이므로 루프마다 하나씩 만들어 재사용한다.
+    검사에서는 base_url을 tmdb_stub.TMDBStubServer로 돌리거나 (check_tmdb_async)
+    transport에 httpx.MockTransport 등을 넘겨 실제 TMDB 없이 실행할 수 있다.
+    """
+
+    BILINGUAL_MIN_RESULTS = 5
+    BILINGUAL_MAX_RESULTS = 20
+    MAX_RETRIES = 3  # 429 재시도 횟수
+
+    def __init__(self, api_key=None, base_url=None, transport=None, max_connections=None, timeout=None):
+        self.api_key = api_key if api_key is not None else getattr(settings, 'TMDB_API_KEY', '')
+        self.base_url = base_url or 'https://api.themoviedb.org/3'
+        self.image_base_url = 'https://image.tmdb.org/t/p/w500'
+        self.transport = transport
+        self.max_connections = max_connections or getattr(settings, 'TMDB_ASYNC_MAX_CONNECTIONS', 100)
+        connect_timeout, read_timeout = timeout or getattr(settings, 'TMDB_HTTP_TIMEOUT', (3.05, 10))
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self._clients = weakref.WeakKeyDictionary()
+
+    def _client(self):
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                transport=self.transport,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+            self._clients[loop] = client
+        return client
+
+    async def aclose(self):
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    async def _get_json(self, endpoint, params, priority='normal'):
+        """캐시를 거쳐 TMDB JSON 응답 조회 (HTTP 오류는 httpx.HTTPError, 속도 제한은 TMDBRateLimited)"""
+
+        async def fetch():
+            for attempt in range(self.MAX_RETRIES + 1):
+                await tmdb_rate_limiter.aacquire(priority)
+                response = await self._client().get(f"/{endpoint}", params=params)
+                await tmdb_rate_limiter.arecord_response(response.status_code, response.headers)
+                if response.status_code != 429 or attempt == self.MAX_RETRIES:
+                    break
+            response.raise_for_status()
+            return response.json()
+
+        return await tmdb_cache.aget_or_fetch(endpoint, params, fetch)
+
+    async def search_movies(self, query, page=1, language='ko-KR', priority='normal'):
+        """TMDB 영화 검색"""
+        if not self.api_key:
+            print("❌ TMDB API 키가 설정되지 않았습니다!")
+            return []
+
+        params = {
+            'api_key': self.api_key,
+            'language': language,
+            'query': query,
+            'page': page,
+            'include_adult': False
+        }
+
+        try:
+            print(f"🔍 TMDB 비동기 검색 요청: {query} (언어: {language})")
+            data = await self._get_json('search/movie', params, priority)
+
+            results = list(data.get('results', []))
+            print(f"✅ TMDB 검색 결과: {len(results)}개 ({data.get('total_results', 0)}개 전체)")
+            return results
+        except (httpx.HTTPError, TMDBRateLimited) as e:
+            print(f"❌ TMDB 검색 실패: {e}")
+            return []
+
+    async def search_movies_bilingual(self, query, page=1, pages=1):
+        """한국어/영어 동시 검색 - 한국어 결과가 충분하면 영어 검색은 취소"""
+        print(f"🌏 비동기 이중 언어 검색: '{query}' ({pages}페이지)")
+
+        korean_task = asyncio.ensure_future(self._search_pages(query, page, pages, 'ko-KR'))
+        english_task = asyncio.ensure_future(self._search_pages(query, page, pages, 'en-US'))
+
+        try:
+            korean_results = await korean_task
+        except BaseException:
+            english_task.cancel()
+            raise
+
+        if len(korean_results) >= self.BILINGUAL_MIN_RESULTS:
+            english_task.cancel()
+            english_results = []
+        else:
+            print(f"🔄 한국어 결과 부족 ({len(korean_results)}개), 영어 결과 병합")
+            english_results = await english_task
+
+        merged = []
+        seen_ids = set()
+        for movie in korean_results + english_results:
+            if movie['id'] in seen_ids:
+                continue
+            if len(merged) >= self.BILINGUAL_MAX_RESULTS * pages:
+                break
+            seen_ids.add(movie['id'])
+            merged.append(movie)
+
+        print(f"📊 최종 검색 결과: {len(merged)}개")
+        return merged
+
+    async def _search_pages(self, query, page, pages, language):
+        page_results = await asyncio.gather(*[
+            self.search_movies(query, p, language) for p in range(page, page + pages)
+        ])
+        return [movie for results in page_results for movie in results]
+
+    async def get_movie_details(self, tmdb_id):
+        """영화 상세 정보 (장르 포함)"""
+        if not self.api_key:
+            return None
+
+        params = {
+            'api_key': self.api_key,
+            'language': 'ko-KR',
+            'append_to_response': 'credits,videos'
+        }
+
+        try:
+            data = await self._get_json(f"movie/{tmdb_id}", params)
+
+            print(f"🎬 영화 상세: {data.get('title')} - 장르: {len(data.get('genres', []))}개")
+            return data
+        except (httpx.HTTPError, TMDBRateLimited) as e:
+            print(f"❌ 영화 상세 정보 실패: {e}")
+            return None
+
+    async def get_genres(self):
+        """장르 목록"""
+        if not self.api_key:
+            return []
+
+        params = {
+            'api_key': self.api_key,
+            'language': 'ko-KR'
+        }
+
+        try:
+            data = await self._get_json('genre/movie/list', params)
+
+            genres = data.get('genres', [])
+            print(f"📚 TMDB 장르 목록: {len(genres)}개 로드")
+            return genres
+        except (httpx.HTTPError, TMDBRateLimited) as e:
+            print(f"❌ 장르 목록 실패: {e}")
+            return []
+
+
+# 전역 비동기 서비스 인스턴스
+async_tmdb_service = AsyncTMDBService()
@@ -0,0 +1,301 @@
+# movies/tmdb_cache.py
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .singleflight import tmdb_singleflight
+
+logger = logging.getLogger(__name__)
+
+# 엔드포인트 종류별 기본 TTL (초)
+DEFAULT_TTLS = {
+    'genres': 60 * 60 * 24,  # 장르 목록: 하루
+    'details': 60 * 60 * 6,  # 영화 상세: 6시간
+    'lists': 60 * 15,  # 인기 영화 등 목록: 15분
+    'search': 60 * 5,  # 검색: 5분
+}
+
+
+def endpoint_kind(endpoint: str) -> str:
+    """'search/movie', 'movie/123' 같은 엔드포인트를 TTL 종류로 분류"""
+    endpoint = endpoint.strip('/')
+    if endpoint.startswith('genre/'):
+        return 'genres'
+    if endpoint.startswith('search/'):
+        return 'search'
+    parts = endpoint.split('/')
+    if len(parts) == 2 and parts[0] == 'movie' and parts[1].isdigit():
+        return 'details'
+    return 'lists'
+
+
+class CacheStats:
+    """캐시 적중/실패/축출 지표 (스레드 안전)"""
+
+    FIELDS = ('local_hits', 'shared_hits', 'misses', 'stale_served', 'refreshes', 'refresh_errors', 'evictions')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(self.FIELDS, 0)
+
+    def incr(self, field, amount=1):
+        with self._lock:
+            self._counts[field] += amount
+
+    def snapshot(self):
+        with self._lock:
+            counts = dict(self._counts)
+        lookups = counts['local_hits'] + counts['shared_hits'] + counts['misses']
+        hits = counts['local_hits'] + counts['shared_hits']
+        counts['hit_rate'] = round(hits / lookups, 3) if lookups else 0.0
+        return counts
+
+    def reset(self):
+        with self._lock:
+            self._counts = dict.fromkeys(self.FIELDS, 0)
+
+
+class TMDBResponseCache:
+    """TMDB 응답 2단계 캐시
+
+    1단계: 프로세스 내부 LRU (OrderedDict)
+    2단계: Django 캐시 백엔드 (워커 간 공유)
+
+    TTL이 지난 항목도 stale 기간 동안은 즉시 반환하고 백그라운드에서 갱신한다
+    (stale-while-revalidate). 실패 응답(None)은 캐시하지 않는다.
+    """
+
+    KEY_PREFIX = 'tmdb:v1'
+
+    def __init__(self, max_entries=None, ttls=None, stale_ttl=None, cache_alias=None):
+        self.max_entries = max_entries or getattr(settings, 'TMDB_CACHE_MAX_ENTRIES', 1024)
+        self.ttls = {**DEFAULT_TTLS, **(ttls or getattr(settings, 'TMDB_CACHE_TTLS', {}))}
+        self.stale_ttl = stale_ttl if stale_ttl is not None else getattr(settings, 'TMDB_CACHE_STALE_TTL', 60 * 10)
+        self.cache_alias = cache_alias or getattr(settings, 'TMDB_CACHE_ALIAS', 'default')
+        self.stats = CacheStats()
+
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._tasks = set()
+
+    # ---- 키/저장소 -------------------------------------------------------
+
+    def make_key(self, endpoint: str, params: dict = None) -> str:
+        """(엔드포인트, api_key를 뺀 파라미터, 언어)로 캐시 키 생성"""
+        params = {k: v for k, v in (params or {}).items() if k != 'api_key'}
+        language = params.pop('language', '')
+        raw = json.dumps(params, sort_keys=True, default=str, ensure_ascii=False)
+        digest = hashlib.sha1(raw.encode('utf-8')).hexdigest()
+        return f"{self.KEY_PREFIX}:{endpoint.strip('/')}:{language}:{digest}"
+
+    @property
+    def shared(self):
+        return caches[self.cache_alias]
+
+    def _local_get(self, key):
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is not None:
+                self._local.move_to_end(key)
+            return entry
+
+    def _local_set(self, key, entry):
+        with self._lock:
+            self._local[key] = entry
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_entries:
+                self._local.popitem(last=False)
+                self.stats.incr('evictions')
+
+    def _make_entry(self, data, kind):
+        now = time.time()
+        ttl = self.ttls.get(kind, self.ttls['search'])
+        return {'data': data, 'expires_at': now + ttl, 'stale_until': now + ttl + self.stale_ttl}
+
+    def _store(self, key, data, kind):
+        entry = self._make_entry(data, kind)
+        self._local_set(key, entry)
+        try:
+            self.shared.set(key, entry, timeout=entry['stale_until'] - time.time())
+        except Exception as e:
+            logger.warning(f"공유 캐시 저장 실패 ({key}): {e}")
+        return entry
+
+    async def _astore(self, key, data, kind):
+        entry = self._make_entry(data, kind)
+        self._local_set(key, entry)
+        try:
+            await self.shared.aset(key, entry, timeout=entry['stale_until'] - time.time())
+        except Exception as e:
+            logger.warning(f"공유 캐시 저장 실패 ({key}): {e}")
+        return entry
+
+    def _lookup(self, key):
+        """로컬 → 공유 순으로 조회, 완전히 만료된 항목은 버린다"""
+        entry = self._local_get(key)
+        if entry is not None:
+            return self._usable(entry, 'local_hits')
+        try:
+            entry = self.shared.get(key)
+        except Exception as e:
+            logger.warning(f"공유 캐시 조회 실패 ({key}): {e}")
+            entry = None
+        if entry is not None:
+            self._local_set(key, entry)
+        return self._usable(entry, 'shared_hits')
+
+    async def _alookup(self, key):
+        """_lookup의 async 버전 (공유 캐시는 aget 사용)"""
+        entry = self._local_get(key)
+        if entry is not None:
+            return self._usable(entry, 'local_hits')
+        try:
+            entry = await self.shared.aget(key)
+        except Exception as e:
+            logger.warning(f"공유 캐시 조회 실패 ({key}): {e}")
+            entry = None
+        if entry is not None:
+            self._local_set(key, entry)
+        return self._usable(entry, 'shared_hits')
+
+    @staticmethod
+    def _usable(entry, tier):
+        if entry is None or entry['stale_until'] <= time.time():
+            return None, None
+        return entry, tier
+
+    # ---- 조회 -------------------------------------------------------------
+
+    def get_or_fetch(self, endpoint: str, params: dict, fetch, kind: str = None):
+        """캐시에 있으면 반환, 없으면 fetch()를 호출해 저장 후 반환
+
+        캐시 미스가 동시에 여러 번 나도 fetch()는 한 번만 실행된다 (single-flight).
+        fetch에서 발생한 예외는 기다리던 모든 호출자에게 그대로 전달된다.
+        """
+        kind = kind or endpoint_kind(endpoint)
+        key = self.make_key(endpoint, params)
+
+        entry, tier = self._lookup(key)
+        if entry is not None:
+            self.stats.incr(tier)
+            if entry['expires_at'] <= time.time():
+                self.stats.incr('stale_served')
+                self._refresh_in_background(key, fetch, kind)
+            return entry['data']
+
+        self.stats.incr('misses')
+
+        def fetch_and_store():
+            data = fetch()
+            if data is not None:
+                self._store(key, data, kind)
+            return data
+
+        # 같은 키의 동시 요청은 한 번의 TMDB 호출을 공유
+        return tmdb_singleflight.do(key, fetch_and_store)
+
+    async def aget_or_fetch(self, endpoint: str, params: dict, fetch, kind: str = None):
+        """get_or_fetch의 async 버전 - fetch는 코루틴 함수"""
+        kind = kind or endpoint_kind(endpoint)
+        key = self.make_key(endpoint, params)
+
+        entry, tier = await self._alookup(key)
+        if entry is not None:
+            self.stats.incr(tier)
+            if entry['expires_at'] <= time.time():
+                self.stats.incr('stale_served')
+                self._arefresh_in_background(key, fetch, kind)
+            return entry['data']
+
+        self.stats.incr('misses')
+
+        async def fetch_and_store():
+            data = await fetch()
+            if data is not None:
+                await self._astore(key, data, kind)
+            return data
+
+        return await tmdb_singleflight.ado(key, fetch_and_store)
+
+    def _claim_refresh(self, key):
+        """같은 키를 동시에 두 번 갱신하지 않도록 선점"""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def _release_refresh(self, key):
+        with self._lock:
+            self._refreshing.discard(key)
+
+    def _arefresh_in_background(self, key, fetch, kind):
+        if not self._claim_refresh(key):
+            return
+
+        async def refresh():
+            try:
+                data = await fetch()
+                if data is not None:
+                    await self._astore(key, data, kind)
+                    self.stats.incr('refreshes')
+            except Exception as e:
+                self.stats.incr('refresh_errors')
+                logger.warning(f"TMDB 캐시 백그라운드 갱신 실패 ({key}): {e}")
+            finally:
+                self._release_refresh(key)
+
+        task = asyncio.get_running_loop().create_task(refresh())
+        self._tasks.add(task)  # 태스크가 GC되지 않도록 참조 유지
+        task.add_done_callback(self._tasks.discard)
+
+    def _refresh_in_background(self, key, fetch, kind):
+        if not self._claim_refresh(key):
+            return
+
+        def refresh():
+            try:
+                data = fetch()
+                if data is not None:
+                    self._store(key, data, kind)
+                    self.stats.incr('refreshes')
+            except Exception as e:
+                self.stats.incr('refresh_errors')
+                logger.warning(f"TMDB 캐시 백그라운드 갱신 실패 ({key}): {e}")
+            finally:
+                self._release_refresh(key)
+
+        threading.Thread(target=refresh, name='tmdb-cache-refresh', daemon=True).start()
+
+    def invalidate(self, endpoint: str, params: dict = None):
+        key = self.make_key(endpoint, params)
+        with self._lock:
+            self._local.pop(key, None)
+        self.shared.delete(key)
+
+    def clear_local(self):
+        with self._lock:
+            self._local.clear()
+
+    def info(self):
+        with self._lock:
+            size = len(self._local)
+        return {
+            'local_entries': size,
+            'max_entries': self.max_entries,
+            'ttls': self.ttls,
+            'stale_ttl': self.stale_ttl,
+            **self.stats.snapshot(),
+        }
+
+
+# 전역 캐시 인스턴스
+tmdb_cache = TMDBResponseCache()
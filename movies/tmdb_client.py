@@ -0,0 +1,169 @@
+# movies/tmdb_client.py
+import threading
+import logging
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+from django.conf import settings
+
+from .tmdb_ratelimit import tmdb_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+
+class PoolStats:
+    """커넥션 풀 재사용 통계 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0  # 풀에서 커넥션을 꺼낸 횟수
+        self.misses = 0  # 새 TCP/TLS 커넥션을 연 횟수
+
+    def record_checkout(self):
+        with self._lock:
+            self.requests += 1
+
+    def record_new_connection(self):
+        with self._lock:
+            self.misses += 1
+
+    def snapshot(self):
+        with self._lock:
+            hits = max(self.requests - self.misses, 0)
+            return {
+                'requests': self.requests,
+                'hits': hits,
+                'misses': self.misses,
+                'hit_rate': round(hits / self.requests, 3) if self.requests else 0.0,
+            }
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.misses = 0
+
+
+pool_stats = PoolStats()
+
+
+class _CountingPoolMixin:
+    """커넥션을 꺼낼 때/새로 만들 때 통계를 기록하는 urllib3 풀"""
+
+    def _get_conn(self, timeout=None):
+        pool_stats.record_checkout()
+        return super()._get_conn(timeout=timeout)
+
+    def _new_conn(self):
+        pool_stats.record_new_connection()
+        return super()._new_conn()
+
+
+class CountingHTTPConnectionPool(_CountingPoolMixin, HTTPConnectionPool):
+    pass
+
+
+class CountingHTTPSConnectionPool(_CountingPoolMixin, HTTPSConnectionPool):
+    pass
+
+
+class CountingHTTPAdapter(HTTPAdapter):
+    """풀 클래스를 통계 수집용으로 교체한 어댑터"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': CountingHTTPConnectionPool,
+            'https': CountingHTTPSConnectionPool,
+        }
+
+
+class TMDBHttpClient:
+    """모든 TMDB 호출이 공유하는 keep-alive 커넥션 풀 클라이언트
+
+    - requests.Session 하나를 프로세스 전체에서 재사용 (TCP/TLS 핸드셰이크 절약)
+    - 5xx 응답은 지수 백오프로, 429는 속도 제한기가 Retry-After를 반영한 뒤 재시도
+      (재시도도 매번 속도 제한 토큰을 얻는다 - urllib3는 TMDB에 닿지 않은 연결 실패만 재시도)
+    - 호출마다 timeout 지정 가능
+    """
+
+    # get()에서 속도 제한 토큰을 다시 얻고 재시도하는 5xx 상태 코드
+    RETRY_STATUS_CODES = (500, 502, 503, 504)
+
+    def __init__(self, pool_size=None, max_retries=None, backoff_factor=None, timeout=None):
+        self.pool_size = pool_size or getattr(settings, 'TMDB_HTTP_POOL_SIZE', 10)
+        self.max_retries = max_retries if max_retries is not None else getattr(settings, 'TMDB_HTTP_MAX_RETRIES', 3)
+        self.backoff_factor = backoff_factor if backoff_factor is not None else getattr(
+            settings, 'TMDB_HTTP_BACKOFF_FACTOR', 0.5)
+        self.timeout = timeout or getattr(settings, 'TMDB_HTTP_TIMEOUT', (3.05, 10))
+        self._session = None
+        self._lock = threading.Lock()
+
+    def _build_session(self):
+        # 응답을 받은 뒤의 재시도(5xx)는 속도 제한기를 거치도록 get()에서 처리하고,
+        # 어댑터는 요청이 TMDB에 닿지 않은 연결 실패만 재시도한다
+        retry = Retry(
+            total=self.max_retries,
+            connect=self.max_retries,
+            read=0,
+            status=0,
+            backoff_factor=self.backoff_factor,
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            raise_on_status=False,
+        )
+        adapter = CountingHTTPAdapter(
+            pool_connections=self.pool_size,
+            pool_maxsize=self.pool_size,
+            max_retries=retry,
+        )
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    @property
+    def session(self):
+        """최초 사용 시 세션 생성 (double-checked locking)"""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._build_session()
+                    logger.info(f"TMDB HTTP 세션 생성 (pool_size={self.pool_size}, retries={self.max_retries})")
+        return self._session
+
+    def get(self, url, params=None, timeout=None, priority='normal'):
+        """GET 요청 - requests.get과 동일하게 Response 반환, 네트워크 오류는 RequestException
+
+        요청마다 속도 제한 토큰을 먼저 얻는다. 429는 속도 제한기가 Retry-After를
+        반영한 뒤, 5xx는 지수 백오프 뒤 다시 토큰을 얻어 재시도한다
+        (제한에 걸려 포기하면 TMDBRateLimited, 재시도를 다 쓰면 마지막 응답을 그대로 반환).
+        """
+        for attempt in range(self.max_retries + 1):
+            tmdb_rate_limiter.acquire(priority)
+            response = self.session.get(url, params=params, timeout=timeout or self.timeout)
+            tmdb_rate_limiter.record_response(response.status_code, response.headers)
+            retryable = response.status_code == 429 or response.status_code in self.RETRY_STATUS_CODES
+            if not retryable or attempt == self.max_retries:
+                return response
+            response.close()
+            if response.status_code in self.RETRY_STATUS_CODES:
+                time.sleep(self.backoff_factor * 2 ** attempt)
+
+    def stats(self):
+        return {
+            'pool_size': self.pool_size,
+            'max_retries': self.max_retries,
+            **pool_stats.snapshot(),
+        }
+
+    def close(self):
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+# 전역 HTTP 클라이언트 인스턴스
+tmdb_http = TMDBHttpClient()
@@ -0,0 +1,341 @@
+# movies/tmdb_ratelimit.py
+import asyncio
+import logging
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# 우선순위별 최대 대기 시간(초) - 이보다 오래 기다려야 하면 요청을 버린다(shed)
+DEFAULT_MAX_WAITS = {
+    'high': 10.0,
+    'normal': 5.0,
+    'low': 0.0,  # 상태 확인 등: 토큰이 없으면 바로 포기
+}
+
+
+class TMDBRateLimited(requests.RequestException):
+    """클라이언트 측 속도 제한으로 요청을 보내지 않음
+
+    기존 호출부의 `except requests.RequestException` 처리에 그대로 걸리도록
+    RequestException을 상속한다.
+    """
+
+
+def parse_retry_after(value):
+    """Retry-After 헤더(초 또는 HTTP 날짜)를 초 단위로 변환"""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max((retry_at - timezone.now()).total_seconds(), 0.0)
+
+
+class TokenBucket:
+    """토큰 버킷 - 토큰을 미리 예약(음수 허용)해 대기 순서를 보장한다"""
+
+    def __init__(self, rate, capacity):
+        self.base_rate = float(rate)
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def reserve(self, max_wait, headroom=0.0):
+        """토큰 1개 예약 후 기다려야 할 시간 반환, max_wait를 넘으면 None
+
+        headroom: 버킷에 이만큼의 토큰이 남아 있어야만 예약 (낮은 우선순위용)
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            needed = 1.0 + headroom
+            if self.tokens >= needed:
+                self.tokens -= 1.0
+                return 0.0
+            wait = (needed - self.tokens) / self.rate
+            if wait > max_wait:
+                return None
+            self.tokens -= 1.0
+            return wait
+
+    def refund(self):
+        """예약한 토큰 1개 반환 (예약 뒤 다른 이유로 요청을 보내지 않을 때)"""
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + 1.0)
+
+    def slow_down(self, factor=0.5, floor=1.0):
+        with self._lock:
+            self.rate = max(floor, self.rate * factor)
+
+    def recover(self, step=0.05):
+        with self._lock:
+            if self.rate < self.base_rate:
+                self.rate = min(self.base_rate, self.rate + self.base_rate * step)
+
+
+class LimiterStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.acquired = {}
+        self.shed = {}
+        self.throttled = 0  # TMDB에서 받은 429 횟수
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record_acquire(self, priority, waited):
+        with self._lock:
+            self.acquired[priority] = self.acquired.get(priority, 0) + 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+
+    def record_shed(self, priority):
+        with self._lock:
+            self.shed[priority] = self.shed.get(priority, 0) + 1
+
+    def record_throttled(self):
+        with self._lock:
+            self.throttled += 1
+
+    def snapshot(self):
+        with self._lock:
+            total = sum(self.acquired.values())
+            return {
+                'acquired': dict(self.acquired),
+                'shed': dict(self.shed),
+                'throttled': self.throttled,
+                'queue_wait_avg_ms': round(self.total_wait / total * 1000, 2) if total else 0.0,
+                'queue_wait_max_ms': round(self.max_wait * 1000, 2),
+            }
+
+
+class TMDBRateLimiter:
+    """모든 TMDB 호출이 공유하는 클라이언트 측 속도 제한기
+
+    - 프로세스 내부: 토큰 버킷 (rate/burst)
+    - shared=True: Django 캐시에 초 단위 카운터를 두어 워커 전체 요청 수도 제한
+    - 429 응답의 Retry-After 동안 모든 요청을 멈추고(공유 모드면 워커 전체),
+      Retry-After가 없으면 지수 백오프 + 전송 속도를 절반으로 줄였다가 서서히 복구
+    - 기다려야 할 시간이 우선순위별 max_wait를 넘으면 TMDBRateLimited로 포기
+    """
+
+    SHARED_KEY_PREFIX = 'tmdb:ratelimit'
+    MAX_BACKOFF = 60.0
+
+    def __init__(self, rate=None, burst=None, shared=None, max_waits=None, low_priority_headroom=None,
+                 cache_alias=None):
+        config = getattr(settings, 'TMDB_RATE_LIMIT', {})
+        self.rate = rate or config.get('rate', 40)
+        self.burst = burst or config.get('burst', self.rate)
+        self.shared = shared if shared is not None else config.get('shared', False)
+        self.max_waits = {**DEFAULT_MAX_WAITS, **(max_waits or config.get('max_wait', {}))}
+        headroom = low_priority_headroom if low_priority_headroom is not None else config.get(
+            'low_priority_headroom', 0.25)
+        self.low_priority_headroom = self.burst * headroom
+        self.cache_alias = cache_alias or getattr(settings, 'TMDB_CACHE_ALIAS', 'default')
+
+        self.bucket = TokenBucket(self.rate, self.burst)
+        self.stats = LimiterStats()
+        self._lock = threading.Lock()
+        self._blocked_until = 0.0  # time.time() 기준
+        self._consecutive_throttles = 0
+
+    @property
+    def shared_cache(self):
+        return caches[self.cache_alias]
+
+    # ---- 대기 시간 계산 -----------------------------------------------------
+
+    def _blocked_for(self):
+        """Retry-After로 막혀 있는 남은 시간"""
+        blocked_until = self._blocked_until
+        if self.shared:
+            try:
+                blocked_until = max(blocked_until, self.shared_cache.get(self._blocked_key, 0))
+            except Exception as e:
+                logger.warning(f"공유 속도 제한 조회 실패: {e}")
+        return max(blocked_until - time.time(), 0.0)
+
+    async def _ablocked_for(self):
+        """_blocked_for()의 async 버전 - 공유 캐시 조회가 이벤트 루프를 막지 않도록 aget 사용"""
+        blocked_until = self._blocked_until
+        if self.shared:
+            try:
+                blocked_until = max(blocked_until, await self.shared_cache.aget(self._blocked_key, 0))
+            except Exception as e:
+                logger.warning(f"공유 속도 제한 조회 실패: {e}")
+        return max(blocked_until - time.time(), 0.0)
+
+    @property
+    def _blocked_key(self):
+        return f'{self.SHARED_KEY_PREFIX}:blocked'
+
+    def _shared_window_key(self, now):
+        return f'{self.SHARED_KEY_PREFIX}:window:{int(now)}'
+
+    def _shared_take(self):
+        """공유 초 단위 카운터에서 1개 사용, 초과면 다음 초까지 남은 시간 반환"""
+        now = time.time()
+        key = self._shared_window_key(now)
+        try:
+            self.shared_cache.add(key, 0, timeout=5)
+            count = self.shared_cache.incr(key)
+        except Exception as e:
+            logger.warning(f"공유 속도 제한 카운터 실패 (로컬 제한만 적용): {e}")
+            return 0.0
+        if count <= self.rate:
+            return 0.0
+        return int(now) + 1 - now
+
+    async def _ashared_take(self):
+        now = time.time()
+        key = self._shared_window_key(now)
+        try:
+            await self.shared_cache.aadd(key, 0, timeout=5)
+            count = await self.shared_cache.aincr(key)
+        except Exception as e:
+            logger.warning(f"공유 속도 제한 카운터 실패 (로컬 제한만 적용): {e}")
+            return 0.0
+        if count <= self.rate:
+            return 0.0
+        return int(now) + 1 - now
+
+    def _max_wait(self, priority):
+        return self.max_waits.get(priority, self.max_waits['normal'])
+
+    def _shed(self, priority, reason):
+        self.stats.record_shed(priority)
+        raise TMDBRateLimited(f"TMDB 요청 제한 ({priority}): {reason}")
+
+    def _reserve(self, priority, deadline):
+        headroom = self.low_priority_headroom if priority == 'low' else 0.0
+        wait = self.bucket.reserve(max(deadline - time.monotonic(), 0.0), headroom)
+        if wait is None:
+            self._shed(priority, '토큰 부족')
+        return wait
+
+    # ---- 획득 -------------------------------------------------------------
+
+    def acquire(self, priority='normal'):
+        """요청 1회분 토큰 획득 (필요하면 대기), 포기하면 TMDBRateLimited"""
+        started = time.monotonic()
+        deadline = started + self._max_wait(priority)
+
+        blocked = self._blocked_for()
+        if blocked:
+            if started + blocked > deadline:
+                self._shed(priority, f'Retry-After {blocked:.1f}초')
+            time.sleep(blocked)
+
+        wait = self._reserve(priority, deadline)
+        if wait:
+            time.sleep(wait)
+
+        if self.shared:
+            while True:
+                pause = self._shared_take()
+                if not pause:
+                    break
+                if time.monotonic() + pause > deadline:
+                    self.bucket.refund()  # 보내지 않을 요청의 로컬 토큰은 돌려준다
+                    self._shed(priority, '공유 한도 초과')
+                time.sleep(pause)
+
+        self.stats.record_acquire(priority, time.monotonic() - started)
+
+    async def aacquire(self, priority='normal'):
+        """acquire()의 async 버전"""
+        started = time.monotonic()
+        deadline = started + self._max_wait(priority)
+
+        blocked = await self._ablocked_for()
+        if blocked:
+            if started + blocked > deadline:
+                self._shed(priority, f'Retry-After {blocked:.1f}초')
+            await asyncio.sleep(blocked)
+
+        wait = self._reserve(priority, deadline)
+        if wait:
+            await asyncio.sleep(wait)
+
+        if self.shared:
+            while True:
+                pause = await self._ashared_take()
+                if not pause:
+                    break
+                if time.monotonic() + pause > deadline:
+                    self.bucket.refund()
+                    self._shed(priority, '공유 한도 초과')
+                await asyncio.sleep(pause)
+
+        self.stats.record_acquire(priority, time.monotonic() - started)
+
+    # ---- 응답 반영 ----------------------------------------------------------
+
+    def record_response(self, status_code, headers=None):
+        """TMDB 응답 상태를 반영 - 429면 차단/감속, 성공이면 속도 복구"""
+        blocked = self._record(status_code, headers)
+        if blocked and self.shared:
+            try:
+                self.shared_cache.set(self._blocked_key, blocked[0], timeout=blocked[1])
+            except Exception as e:
+                logger.warning(f"공유 속도 제한 저장 실패: {e}")
+
+    async def arecord_response(self, status_code, headers=None):
+        """record_response()의 async 버전 (공유 캐시 저장은 aset)"""
+        blocked = self._record(status_code, headers)
+        if blocked and self.shared:
+            try:
+                await self.shared_cache.aset(self._blocked_key, blocked[0], timeout=blocked[1])
+            except Exception as e:
+                logger.warning(f"공유 속도 제한 저장 실패: {e}")
+
+    def _record(self, status_code, headers):
+        """프로세스 내부 상태 갱신. 429면 공유 캐시에 저장할 (차단 종료 시각, 캐시 timeout)"""
+        if status_code != 429:
+            with self._lock:
+                self._consecutive_throttles = 0
+            self.bucket.recover()
+            return None
+
+        self.stats.record_throttled()
+        retry_after = parse_retry_after((headers or {}).get('Retry-After'))
+        with self._lock:
+            self._consecutive_throttles += 1
+            if retry_after is None:
+                retry_after = min(2 ** (self._consecutive_throttles - 1), self.MAX_BACKOFF)
+            blocked_until = time.time() + retry_after
+            self._blocked_until = max(self._blocked_until, blocked_until)
+        self.bucket.slow_down()
+        logger.warning(f"TMDB 429 응답 - {retry_after:.1f}초 동안 요청 중지")
+        return blocked_until, int(retry_after) + 1
+
+    def info(self):
+        return {
+            'rate': self.rate,
+            'current_rate': round(self.bucket.rate, 2),
+            'burst': self.burst,
+            'shared': self.shared,
+            'blocked_for': round(max(self._blocked_until - time.time(), 0.0), 2),
+            **self.stats.snapshot(),
+        }
+
+
+# 전역 속도 제한기 인스턴스
+tmdb_rate_limiter = TMDBRateLimiter()
@@ -1,24 +1,55 @@
 # movies/tmdb_service.py
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from django.conf import settings
+from django.db import DatabaseError
 import logging
 
+from .catalog import upsert_tmdb_movies
+from .models import Movie
+from .tmdb_client import tmdb_http
+from .tmdb_cache import tmdb_cache
+
 logger = logging.getLogger(__name__)
 
+# 이중 언어/다중 페이지 검색용 스레드 풀 (HTTP 대기 위주라 스레드로 충분)
+_search_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, 'TMDB_SEARCH_WORKERS', 8),
+    thread_name_prefix='tmdb-search',
+)
+
 
 class TMDBService:
+    BILINGUAL_MIN_RESULTS = 5  # 한국어 결과가 이보다 적으면 영어 결과로 보충
+    BILINGUAL_MAX_RESULTS = 20  # 페이지당 최대 결과 수
+
     def __init__(self):
         self.api_key = getattr(settings, 'TMDB_API_KEY', '')
         self.base_url = 'https://api.themoviedb.org/3'
         self.image_base_url = 'https://image.tmdb.org/t/p/w500'
 
-    def search_movies(self, query, page=1, language='ko-KR'):
+    def _get_json(self, endpoint, params, priority='normal', cached=True):
+        """캐시를 거쳐 TMDB JSON 응답 조회 (HTTP 오류/속도 제한은 RequestException)
+
+        cached=False면 캐시를 읽지도 채우지도 않고 바로 요청한다.
+        """
+        url = f"{self.base_url}/{endpoint}"
+
+        def fetch():
+            response = tmdb_http.get(url, params=params, priority=priority)
+            response.raise_for_status()
+            return response.json()
+
+        if not cached:
+            return fetch()
+        return tmdb_cache.get_or_fetch(endpoint, params, fetch)
+
+    def search_movies(self, query, page=1, language='ko-KR', priority='normal', cached=True):
         """검색 결과 [6] 패턴: 실제 TMDB 영화 검색"""
         if not self.api_key:
             print("❌ TMDB API 키가 설정되지 않았습니다!")
             return []
 
-        url = f"{self.base_url}/search/movie"
         params = {
             'api_key': self.api_key,
             'language': language,
@@ -29,11 +60,9 @@ class TMDBService:
 
         try:
             print(f"🔍 TMDB 검색 요청: {query} (언어: {language})")
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_json('search/movie', params, priority, cached)
 
-            results = data.get('results', [])
+            results = list(data.get('results', []))  # 캐시된 원본이 변경되지 않도록 복사
             print(f"✅ TMDB 검색 결과: {len(results)}개 ({data.get('total_results', 0)}개 전체)")
 
             return results
@@ -41,33 +70,91 @@ class TMDBService:
             print(f"❌ TMDB 검색 실패: {e}")
             return []
 
-    def search_movies_bilingual(self, query, page=1):
-        """검색 결과 [7] 패턴: 한국어/영어 이중 검색"""
-        print(f"🌏 이중 언어 검색: '{query}'")
-
-        # 1. 한국어로 검색
-        korean_results = self.search_movies(query, page, 'ko-KR')
-
-        # 2. 한국어 결과가 부족하면 영어로도 검색
-        if len(korean_results) < 5:
-            print(f"🔄 한국어 결과 부족 ({len(korean_results)}개), 영어 검색 추가 실행")
-            english_results = self.search_movies(query, page, 'en-US')
-
-            # 중복 제거하며 결합
-            existing_ids = {movie['id'] for movie in korean_results}
-            for movie in english_results:
-                if movie['id'] not in existing_ids and len(korean_results) < 20:
-                    korean_results.append(movie)
-
-        print(f"📊 최종 검색 결과: {len(korean_results)}개")
-        return korean_results
-
-    def get_movie_details(self, tmdb_id):
-        """검색 결과 [4] 패턴: 영화 상세 정보 (장르 포함)"""
+    def search_movies_bilingual(self, query, page=1, concurrent=None, pages=1):
+        """검색 결과 [7] 패턴: 한국어/영어 이중 검색
+
+        concurrent=True 이면 한국어/영어 검색을 동시에 시작하고, 한국어 결과가
+        충분하면 영어 검색은 취소(이미 시작됐다면 결과 무시)한다.
+        pages > 1 이면 page부터 pages개 페이지를 병렬로 가져와 합친다.
+        """
+        if concurrent is None:
+            concurrent = getattr(settings, 'TMDB_BILINGUAL_CONCURRENT', False)
+        print(f"🌏 이중 언어 검색: '{query}' ({'동시' if concurrent else '순차'}, {pages}페이지)")
+
+        limit = self.BILINGUAL_MAX_RESULTS * pages
+
+        if not concurrent:
+            # 1. 한국어로 검색
+            korean_results = self._search_pages(query, page, pages, 'ko-KR')
+
+            # 2. 한국어 결과가 부족하면 영어로도 검색
+            english_results = []
+            if len(korean_results) < self.BILINGUAL_MIN_RESULTS:
+                print(f"🔄 한국어 결과 부족 ({len(korean_results)}개), 영어 검색 추가 실행")
+                english_results = self._search_pages(query, page, pages, 'en-US')
+        else:
+            korean_futures = self._submit_pages(query, page, pages, 'ko-KR')
+            english_futures = self._submit_pages(query, page, pages, 'en-US')
+
+            korean_results = self._collect_pages(korean_futures)
+            if len(korean_results) >= self.BILINGUAL_MIN_RESULTS:
+                # 아직 실행 전이면 취소, 실행 중이면 결과만 버림
+                for future in english_futures:
+                    future.cancel()
+                english_results = []
+            else:
+                print(f"🔄 한국어 결과 부족 ({len(korean_results)}개), 영어 결과 병합")
+                english_results = self._collect_pages(english_futures)
+
+        merged = self._merge_results(korean_results, english_results, limit)
+        print(f"📊 최종 검색 결과: {len(merged)}개")
+        return merged
+
+    def _search_pages(self, query, page, pages, language):
+        """page부터 pages개 페이지 검색 (2페이지 이상이면 병렬)"""
+        if pages <= 1:
+            return self.search_movies(query, page, language)
+        return self._collect_pages(self._submit_pages(query, page, pages, language))
+
+    def _submit_pages(self, query, page, pages, language):
+        """page부터 pages개 페이지 검색을 스레드 풀에 제출
+
+        호출한 스레드에서만 제출/대기하므로 풀 안에서 중첩 대기(교착)가 생기지 않는다.
+        """
+        return [
+            _search_executor.submit(self.search_movies, query, p, language)
+            for p in range(page, page + pages)
+        ]
+
+    @staticmethod
+    def _collect_pages(futures):
+        results = []
+        for future in futures:  # 페이지 순서 유지
+            results.extend(future.result())
+        return results
+
+    @staticmethod
+    def _merge_results(primary, secondary, limit):
+        """TMDB id 기준 중복 제거 (primary 우선)"""
+        merged = []
+        seen_ids = set()
+        for movie in list(primary) + list(secondary):
+            if movie['id'] in seen_ids:
+                continue
+            if len(merged) >= limit:
+                break
+            seen_ids.add(movie['id'])
+            merged.append(movie)
+        return merged
+
+    def get_movie_details(self, tmdb_id, cached=True):
+        """검색 결과 [4] 패턴: 영화 상세 정보 (장르 포함)
+
+        일괄 적재처럼 한 번만 읽는 대량 조회는 cached=False (사용자 요청용 캐시 항목을 밀어내지 않도록)
+        """
         if not self.api_key:
             return None
 
-        url = f"{self.base_url}/movie/{tmdb_id}"
         params = {
             'api_key': self.api_key,
             'language': 'ko-KR',
@@ -75,9 +162,7 @@ class TMDBService:
         }
 
         try:
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_json(f"movie/{tmdb_id}", params, cached=cached)
 
             print(f"🎬 영화 상세: {data.get('title')} - 장르: {len(data.get('genres', []))}개")
             return data
@@ -85,21 +170,35 @@ class TMDBService:
             print(f"❌ 영화 상세 정보 실패: {e}")
             return None
 
+    def get_popular_movies(self, page=1, language='ko-KR', priority='normal', cached=True):
+        """인기 영화 목록 한 페이지 (results, total_pages 포함 원본 응답)"""
+        if not self.api_key:
+            return None
+
+        params = {
+            'api_key': self.api_key,
+            'language': language,
+            'page': page,
+        }
+
+        try:
+            return self._get_json('movie/popular', params, priority, cached)
+        except requests.RequestException as e:
+            print(f"❌ 인기 영화 목록 실패 (page {page}): {e}")
+            return None
+
     def get_genres(self):
         """검색 결과 [2], [6] 패턴: 장르 목록"""
         if not self.api_key:
             return []
 
-        url = f"{self.base_url}/genre/movie/list"
         params = {
             'api_key': self.api_key,
             'language': 'ko-KR'
         }
 
         try:
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_json('genre/movie/list', params)
 
             genres = data.get('genres', [])
             print(f"📚 TMDB 장르 목록: {len(genres)}개 로드")
@@ -108,6 +207,22 @@ class TMDBService:
             print(f"❌ 장르 목록 실패: {e}")
             return []
 
+    def save_movie_from_tmdb(self, movie_data):
+        """TMDB 상세 정보(get_movie_details 결과)를 Movie/Genre로 저장
+
+        일괄 저장 경로(upsert_tmdb_movies)를 그대로 사용하므로 장르 수와 무관하게
+        쿼리 수가 고정된다.
+        """
+        try:
+            created, _ = upsert_tmdb_movies([movie_data])
+            movie = Movie.objects.get(tmdb_id=movie_data['id'])
+
+            print(f"💾 영화 {'저장' if created else '업데이트'}: {movie.title}")
+            return movie
+        except (KeyError, DatabaseError, Movie.DoesNotExist) as e:
+            print(f"❌ 영화 저장 실패: {e}")
+            return None
+
 
 # 전역 서비스 인스턴스
 tmdb_service = TMDBService()
@@ -121,7 +236,9 @@ def check_tmdb_connection():
         return False
 
     # 간단한 테스트 요청
-    test_results = tmdb_service.search_movies("frozen", language='en-US')
+    # 상태 확인은 낮은 우선순위 - 요청이 몰리면 가장 먼저 포기된다
+    # 캐시된 응답은 TMDB가 내려간 뒤에도 한동안 남으므로 캐시를 거치지 않는다
+    test_results = tmdb_service.search_movies("frozen", language='en-US', priority='low', cached=False)
     if test_results:
         print(f"✅ TMDB API 연결 성공! 테스트 결과: {len(test_results)}개")
         return True
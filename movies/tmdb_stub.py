@@ -0,0 +1,130 @@
+# movies/tmdb_stub.py - 로컬 TMDB 스텁 서버 (검사/벤치마크용)
+"""실제 TMDB 대신 127.0.0.1의 임의 포트에서 고정된 영화 몇 편으로 응답하는 HTTP 서버
+
+    with TMDBStubServer() as stub:
+        service = AsyncTMDBService(api_key='stub', base_url=stub.base_url)
+
+검색(search/movie), 상세(movie/<id>), 장르 목록(genre/movie/list)만 흉내 낸다.
+fail_next(status, count)로 다음 몇 번의 응답을 오류(5xx/429)로 바꿀 수 있고,
+받은 요청 경로는 requests에 쌓인다.
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+STUB_GENRES = [
+    {'id': 18, 'name': '드라마'},
+    {'id': 35, 'name': '코미디'},
+    {'id': 53, 'name': '스릴러'},
+    {'id': 878, 'name': 'SF'},
+]
+
+STUB_MOVIES = [
+    {'id': 496243, 'title': '기생충', 'original_title': '기생충', 'genre_ids': [35, 53, 18],
+     'release_date': '2019-05-30', 'popularity': 80.5, 'vote_average': 8.5, 'vote_count': 17000},
+    {'id': 157336, 'title': '인터스텔라', 'original_title': 'Interstellar', 'genre_ids': [878, 18],
+     'release_date': '2014-11-05', 'popularity': 120.1, 'vote_average': 8.4, 'vote_count': 34000},
+    {'id': 438631, 'title': '듄', 'original_title': 'Dune', 'genre_ids': [878],
+     'release_date': '2021-09-15', 'popularity': 95.0, 'vote_average': 7.8, 'vote_count': 11000},
+]
+
+
+def stub_detail(movie):
+    """검색 결과 한 건 -> 상세 응답 (genre_ids 대신 genres)"""
+    genres = [genre for genre in STUB_GENRES if genre['id'] in movie['genre_ids']]
+    detail = {key: value for key, value in movie.items() if key != 'genre_ids'}
+    return {
+        **detail,
+        'overview': f"{movie['title']} 줄거리",
+        'poster_path': f"/{movie['id']}.jpg",
+        'backdrop_path': '',
+        'genres': genres,
+        'runtime': 120,
+        'adult': False,
+        'video': False,
+    }
+
+
+class TMDBStubServer:
+    """컨텍스트 관리자 - 들어갈 때 백그라운드 스레드에서 서버 시작, 나올 때 종료"""
+
+    def __init__(self, movies=None):
+        self.movies = {movie['id']: movie for movie in (movies or STUB_MOVIES)}
+        self.requests = []
+        self._failures = []  # 앞으로 돌려줄 오류 상태 코드
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/3"
+
+    def fail_next(self, status, count=1):
+        with self._lock:
+            self._failures.extend([status] * count)
+
+    def __enter__(self):
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler_class())
+        self._thread = threading.Thread(target=self._server.serve_forever, name='tmdb-stub', daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def _respond(self, path, params):
+        """(상태 코드, JSON 본문)"""
+        with self._lock:
+            self.requests.append(path)
+            if self._failures:
+                return self._failures.pop(0), {'status_message': 'stub failure'}
+        if not params.get('api_key'):
+            return 401, {'status_message': 'Invalid API key'}
+
+        if path == '/3/search/movie':
+            query = params.get('query', '').lower()
+            results = [
+                movie for movie in self.movies.values()
+                if query in movie['title'].lower() or query in movie['original_title'].lower()
+            ]
+            return 200, {'page': 1, 'results': results, 'total_results': len(results), 'total_pages': 1}
+        if path == '/3/genre/movie/list':
+            return 200, {'genres': STUB_GENRES}
+        if path.startswith('/3/movie/'):
+            try:
+                movie = self.movies.get(int(path.rsplit('/', 1)[1]))
+            except ValueError:
+                movie = None
+            if movie is None:
+                return 404, {'status_message': 'The resource you requested could not be found.'}
+            return 200, stub_detail(movie)
+        return 404, {'status_message': 'unknown endpoint'}
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive (커넥션 풀 재사용 확인용)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                status, body = stub._respond(url.path, params)
+                payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(payload)))
+                if status == 429:
+                    self.send_header('Retry-After', '0')
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass  # 요청마다 stderr에 찍지 않는다
+
+        return Handler
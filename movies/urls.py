@@ -1,11 +1,22 @@
 # movies/urls.py (올바른 설정)
 from django.urls import path
-from . import views
+from . import views, async_views
 
 urlpatterns = [
     path('', views.movie_list, name='movie_list'),
     path('search/', views.search_movies_tmdb, name='search_movies_tmdb'),  # 실제 TMDB 검색
+    path('autocomplete/', views.autocomplete_movies, name='autocomplete_movies'),  # 입력 중 제목 제안 (메모리 색인)
     path('tmdb-status/', views.check_tmdb_status, name='check_tmdb_status'),  # 연결 상태 확인
+    path('tmdb-metrics/', views.tmdb_metrics, name='tmdb_metrics'),  # 풀/캐시 지표
     path('save-tmdb/', views.save_tmdb_movie, name='save_tmdb_movie'),
     path('preferences/', views.preferences_handler, name='preferences_handler'),
+    path('preferences/import/', views.import_preferences, name='import_preferences'),  # JSONL/CSV 일괄 가져오기
+    path('preferences/export/', views.export_preferences, name='export_preferences'),  # 스트리밍 내보내기
+    path('recommendations/', views.recommend_movies, name='recommend_movies'),  # 평점 기반 추천
+    path('<int:movie_id>/similar/', views.similar_movies, name='similar_movies'),  # 장르/카테고리 기반 유사 영화
+    path('similar-users/', views.similar_users, name='similar_users'),  # 성격 점수가 비슷한 사용자
+
+    # ASGI 전용 비동기 버전
+    path('async/search/', async_views.search_movies_tmdb_async, name='search_movies_tmdb_async'),
+    path('async/save-tmdb/', async_views.save_tmdb_movie_async, name='save_tmdb_movie_async'),
 ]
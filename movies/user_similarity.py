@@ -0,0 +1,258 @@
+# movies/user_similarity.py - Big Five 점수가 비슷한 사용자 찾기 (메모리 내 KD-트리)
+"""UserPersonalityProfile의 다섯 점수(0~100)를 5차원 벡터로 보고 유클리드 거리로 가까운 사용자를 찾는다.
+
+- 저장: 점수는 이미 평점이 바뀔 때마다 UserPersonalityProfile에 증분 저장되므로 별도 테이블을 두지 않는다
+- 색인: 분석 가능한(평점 MIN_RATINGS_FOR_ANALYSIS편 이상) 프로필 전체로 KD-트리를 만들어 두고
+  상위 k명 / 반경 r 이내 조회를 전체 사용자 수의 로그에 가까운 시간에 처리한다
+- 갱신: SIMILAR_USERS_REFRESH_SECONDS마다 백그라운드 스레드에서 통째로 다시 만든다.
+  조회 기준점은 항상 DB의 최신 점수이므로, 색인이 오래돼도 틀리는 것은 '다른 사용자' 위치뿐이다
+"""
+import heapq
+import logging
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+from django.db import connection
+
+from .models import PERSONALITY_SCORE_FIELDS, PERSONALITY_TRAITS, UserPersonalityProfile
+from .personality_engine import MIN_RATINGS_FOR_ANALYSIS
+
+logger = logging.getLogger(__name__)
+
+# 잎 안의 거리 계산은 벡터 연산이라 잎이 크면 파이썬 노드 방문 수가 줄어 더 빠르다 (10만 명 기준 128 부근이 적당)
+LEAF_SIZE = 128
+
+
+class TraitKDTree:
+    """NumPy 배열 위의 KD-트리 (노드마다 경계 상자를 저장해 가지치기)
+
+    점은 트리 순서로 다시 배열해 두므로 잎 노드 하나는 연속된 구간이고, 잎 안의 거리 계산은 벡터 연산 한 번이다.
+    query / query_radius는 (원래 점 인덱스 배열, 거리 배열)을 거리 오름차순으로 돌려준다.
+    """
+
+    def __init__(self, points, leaf_size=LEAF_SIZE):
+        points = np.asarray(points, dtype=np.float64)
+        if points.ndim != 2:
+            raise ValueError('points는 (점 수, 차원) 배열이어야 합니다.')
+        self.leaf_size = max(1, leaf_size)
+        order = np.arange(len(points))
+
+        starts, ends, lows, highs, lefts, rights = [], [], [], [], [], []
+        stack = [(0, len(points), None, None)]  # (시작, 끝, 부모 노드, 왼쪽 자식인지)
+        while stack:
+            start, end, parent, is_left = stack.pop()
+            node = len(starts)
+            if parent is not None:
+                (lefts if is_left else rights)[parent] = node
+            block = points[order[start:end]]
+            low = block.min(axis=0) if end > start else np.zeros(points.shape[1])
+            high = block.max(axis=0) if end > start else np.zeros(points.shape[1])
+            starts.append(start)
+            ends.append(end)
+            lows.append(low)
+            highs.append(high)
+            lefts.append(-1)
+            rights.append(-1)
+
+            if end - start <= self.leaf_size:
+                continue
+            # 가장 넓게 퍼진 축의 중앙값으로 나눈다 (정렬 대신 argpartition으로 O(n))
+            axis = int(np.argmax(high - low))
+            mid = (end - start) // 2
+            split = np.argpartition(block[:, axis], mid)
+            order[start:end] = order[start:end][split]
+            stack.append((start + mid, end, node, False))
+            stack.append((start, start + mid, node, True))
+
+        self.order = order
+        self.points = points[order]
+        self._start = np.array(starts)
+        self._end = np.array(ends)
+        self._low = np.array(lows).reshape(len(starts), points.shape[1])
+        self._high = np.array(highs).reshape(len(starts), points.shape[1])
+        self._left = np.array(lefts)
+        self._right = np.array(rights)
+
+    def __len__(self):
+        return len(self.points)
+
+    def _box_distance(self, node, point):
+        """점에서 노드 경계 상자까지의 최소 거리 (상자 안이면 0)"""
+        gap = np.maximum(self._low[node] - point, 0) + np.maximum(point - self._high[node], 0)
+        return float(np.sqrt(gap @ gap))
+
+    def _leaf_distances(self, node, point):
+        start, end = self._start[node], self._end[node]
+        diff = self.points[start:end] - point
+        return np.arange(start, end), np.sqrt(np.einsum('ij,ij->i', diff, diff))
+
+    def query(self, point, k):
+        """가장 가까운 k개 - 상자 거리가 가까운 노드부터 (best-first) 방문"""
+        point = np.asarray(point, dtype=np.float64)
+        k = min(k, len(self))
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        found, distances = np.empty(0, dtype=np.int64), np.empty(0)
+        worst = np.inf
+        heap = [(0.0, 0)]
+        while heap:
+            box_distance, node = heapq.heappop(heap)
+            if box_distance > worst:
+                break  # 남은 노드는 모두 현재 k번째보다 멀다
+            if self._left[node] < 0:
+                positions, leaf = self._leaf_distances(node, point)
+                found = np.concatenate([found, positions])
+                distances = np.concatenate([distances, leaf])
+                if len(found) > k:
+                    keep = np.argpartition(distances, k - 1)[:k]
+                    found, distances = found[keep], distances[keep]
+                if len(found) == k:
+                    worst = float(distances.max())
+                continue
+            for child in (self._left[node], self._right[node]):
+                child_distance = self._box_distance(child, point)
+                if child_distance <= worst:
+                    heapq.heappush(heap, (child_distance, child))
+        ranked = np.argsort(distances, kind='stable')
+        return self.order[found[ranked]], distances[ranked]
+
+    def query_radius(self, point, radius):
+        """거리가 radius 이하인 점 전부"""
+        point = np.asarray(point, dtype=np.float64)
+        if not len(self):
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        found, distances = [], []
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            if self._box_distance(node, point) > radius:
+                continue
+            if self._left[node] < 0:
+                positions, leaf = self._leaf_distances(node, point)
+                inside = leaf <= radius
+                found.append(positions[inside])
+                distances.append(leaf[inside])
+                continue
+            stack.extend((self._left[node], self._right[node]))
+        found = np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+        distances = np.concatenate(distances) if distances else np.empty(0)
+        ranked = np.argsort(distances, kind='stable')
+        return self.order[found[ranked]], distances[ranked]
+
+
+class NotEnoughRatings(ValueError):
+    """기준 사용자의 평점이 분석 최소 편수보다 적음"""
+
+    def __init__(self, count):
+        super().__init__(f'분석을 위해 최소 {MIN_RATINGS_FOR_ANALYSIS}편의 영화 평가가 필요합니다. 현재: {count}편')
+        self.count = count
+
+
+def trait_vector(profile):
+    return np.array([getattr(profile, field) for field in PERSONALITY_SCORE_FIELDS], dtype=np.float64)
+
+
+class UserSimilarityIndex:
+    """분석 가능한 사용자 전체의 성격 점수 KD-트리 (프로세스마다 하나, 주기적으로 통째 재구축)"""
+
+    def __init__(self, refresh_seconds=None, max_results=None):
+        self.refresh_seconds = (
+            refresh_seconds if refresh_seconds is not None
+            else getattr(settings, 'SIMILAR_USERS_REFRESH_SECONDS', 60 * 10)
+        )
+        self.max_results = max_results or getattr(settings, 'SIMILAR_USERS_MAX_RESULTS', 50)
+        self._lock = threading.RLock()
+        self._tree = None
+        self._vectors = None
+        self._user_ids = np.empty(0, dtype=np.int64)
+        self._usernames = []
+        self._built_at = None
+
+    # ---- 구축 ---------------------------------------------------------------
+
+    def rebuild(self):
+        """UserPersonalityProfile 전체로 다시 구축 (쿼리 1회). 반환값: 색인한 사용자 수"""
+        started = time.perf_counter()
+        rows = (
+            UserPersonalityProfile.objects
+            .filter(movies_analyzed__gte=MIN_RATINGS_FOR_ANALYSIS)
+            .order_by()
+            .values_list('user_id', 'user__username', *PERSONALITY_SCORE_FIELDS)
+            .iterator(chunk_size=5000)
+        )
+        user_ids, usernames, vectors = [], [], []
+        for user_id, username, *scores in rows:
+            user_ids.append(user_id)
+            usernames.append(username)
+            vectors.append(scores)
+        vectors = np.array(vectors, dtype=np.float64).reshape(len(vectors), len(PERSONALITY_SCORE_FIELDS))
+        tree = TraitKDTree(vectors)
+        # 새 트리를 다 만든 뒤 한 번에 교체 - 재구축 중에도 이전 트리로 조회된다
+        with self._lock:
+            self._tree, self._vectors = tree, vectors
+            self._user_ids, self._usernames = np.array(user_ids, dtype=np.int64), usernames
+            self._built_at = time.monotonic()
+        logger.info(f"유사 사용자 색인 구축: 사용자 {len(user_ids)}명, {time.perf_counter() - started:.2f}초")
+        return len(user_ids)
+
+    def ensure_built(self):
+        built_at = self._built_at
+        if built_at is None:
+            with self._lock:
+                if self._built_at is None:
+                    self.rebuild()
+        elif self.refresh_seconds and time.monotonic() - built_at > self.refresh_seconds:
+            self._built_at = time.monotonic()  # 다른 요청이 중복으로 재구축하지 않도록 먼저 갱신
+            threading.Thread(target=self._rebuild_in_background, name='similar-users-rebuild', daemon=True).start()
+
+    def _rebuild_in_background(self):
+        try:
+            self.rebuild()
+        except Exception as e:
+            logger.warning(f"유사 사용자 색인 재구축 실패 (기존 색인 유지): {e}")
+        finally:
+            connection.close()  # 스레드 전용 DB 연결 정리
+
+    # ---- 조회 ---------------------------------------------------------------
+
+    def similar_to(self, profile, limit=10, radius=None):
+        """profile과 점수가 가까운 다른 사용자 - radius가 있으면 그 거리 이내만 (최대 limit명)
+
+        반환값: [{'user_id', 'username', 'distance', 'personality_scores'}] 거리 오름차순
+        """
+        if profile.movies_analyzed < MIN_RATINGS_FOR_ANALYSIS:
+            raise NotEnoughRatings(profile.movies_analyzed)
+        limit = max(1, min(limit, self.max_results))
+        self.ensure_built()
+        with self._lock:
+            tree, vectors, user_ids, usernames = self._tree, self._vectors, self._user_ids, self._usernames
+
+        point = trait_vector(profile)
+        # 자기 자신이 색인에 있으면 한 명 더 찾아서 뺀다
+        if radius is None:
+            positions, distances = tree.query(point, limit + 1)
+        else:
+            positions, distances = tree.query_radius(point, radius)
+        results = []
+        for position, distance in zip(positions.tolist(), distances.tolist()):
+            if user_ids[position] == profile.user_id:
+                continue
+            results.append({
+                'user_id': int(user_ids[position]),
+                'username': usernames[position],
+                'distance': round(distance, 2),
+                'personality_scores': dict(zip(PERSONALITY_TRAITS, vectors[position].tolist())),
+            })
+            if len(results) >= limit:
+                break
+        return results
+
+    def info(self):
+        with self._lock:
+            return {'users': len(self._usernames), 'built': self._built_at is not None}
+
+
+# 전역 유사 사용자 색인 인스턴스
+similar_users_index = UserSimilarityIndex()
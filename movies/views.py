@@ -3,9 +3,28 @@ from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 
 from .tmdb_service import tmdb_service, check_tmdb_connection
-from .models import Movie, UserMoviePreference
+from .tmdb_client import tmdb_http
+from .tmdb_cache import tmdb_cache
+from .singleflight import tmdb_singleflight
+from .tmdb_ratelimit import tmdb_rate_limiter
+from .models import Movie
+from .personality_profile import get_profile, save_rating
+from .search_index import search_local_movies
+from .autocomplete import title_index
+from .pagination import InvalidCursor, keyset_page, page_size_from
+from .movie_backfill import get_or_create_placeholder
+from .recommender import recommend_for_user
+from .content_similarity import similar_movies_for
+from .user_similarity import NotEnoughRatings, similar_users_index
+from .rating_io import RatingImportError, export_lines, import_ratings, parse_lines, request_format
+from .serialization import (
+    movie_detail_queryset, movie_list_queryset, movie_list_rows, preference_list_rows,
+    serialize_db_movie, serialize_movie, serialize_movie_row, serialize_preference_row, serialize_tmdb_movie,
+)
+import csv
 import traceback
 from django.conf import settings
+from django.http import StreamingHttpResponse
 import requests
 
 
@@ -20,29 +39,27 @@ def movie_list(request):
         search_query = request.GET.get('search', '')
         print(f"🔍 검색어: '{search_query}'")
 
+        page_size = page_size_from(request)
+        next_cursor = None
         if search_query:
-            movies = Movie.objects.filter(title__icontains=search_query)[:20]
+            # 검색은 제목/원제/줄거리 색인에서 관련도 순 상위 결과만 (커서 없음)
+            movie_data = [serialize_movie(movie) for movie in
+                          search_local_movies(search_query, limit=page_size, queryset=movie_list_queryset())]
         else:
-            movies = Movie.objects.all()[:20]
+            # 전체 목록은 (인기도, id) 키셋 페이지네이션 - 깊은 페이지도 첫 페이지와 같은 비용
+            try:
+                rows, next_cursor = keyset_page(movie_list_rows(), 'popularity', request.GET.get('cursor'), page_size)
+            except InvalidCursor as e:
+                return Response({'success': False, 'error': str(e), 'count': 0, 'results': []}, status=400)
+            movie_data = [serialize_movie_row(row) for row in rows]
 
-        print(f"📊 조회된 영화 수: {movies.count()}")
-
-        movie_data = []
-        for movie in movies:
-            movie_data.append({
-                'id': movie.id,
-                'title': movie.title,
-                'overview': getattr(movie, 'overview', ''),
-                'release_date': str(getattr(movie, 'release_date', '')),
-                'vote_average': getattr(movie, 'vote_average', 0),
-                'poster_url': getattr(movie, 'poster_url', ''),
-                'tmdb_id': getattr(movie, 'tmdb_id', 0),
-            })
+        print(f"📊 조회된 영화 수: {len(movie_data)}")
 
         response_data = {
             'success': True,
             'count': len(movie_data),
             'results': movie_data,
+            'next_cursor': next_cursor,
             'message': f"'{search_query}' 검색 결과" if search_query else "전체 영화 목록"
         }
 
@@ -76,24 +93,9 @@ def search_movies_tmdb(request):
         print(f"🔍 Django 뷰에서 영화 검색: '{query}'")
 
         # 1. 기존 DB에서 검색
-        db_movies = Movie.objects.filter(title__icontains=query)[:5]
-        movie_data = []
-
-        # DB 영화들 추가
-        for movie in db_movies:
-            genres_list = [genre.name for genre in movie.genres.all()]
-            movie_data.append({
-                'id': movie.id,
-                'tmdb_id': movie.tmdb_id,
-                'title': movie.title,
-                'overview': movie.overview,
-                'release_date': str(movie.release_date) if movie.release_date else '',
-                'vote_average': movie.vote_average,
-                'poster_url': movie.poster_url,
-                'backdrop_url': getattr(movie, 'backdrop_url', ''),
-                'genres': genres_list,
-                'source': 'db'
-            })
+        # 장르는 prefetch로 한 번에 (결과 수와 무관하게 영화 1 + 장르 1 쿼리)
+        db_movies = search_local_movies(query, limit=5, queryset=movie_detail_queryset())
+        movie_data = [serialize_db_movie(movie) for movie in db_movies]
 
         # 2. TMDB API 직접 호출 (Django shell에서 성공한 것과 동일한 코드)
         api_key = getattr(settings, 'TMDB_API_KEY', '')
@@ -105,40 +107,29 @@ def search_movies_tmdb(request):
                 'api_key': api_key,
                 'language': 'ko-KR',
                 'query': query,
+                'page': 1,
                 'include_adult': False
             }
 
-            try:
-                response = requests.get(url, params=params, timeout=10)
+            def fetch():
+                response = tmdb_http.get(url, params=params)
                 print(f"📡 TMDB 응답 상태: {response.status_code}")
-
-                if response.status_code == 200:
-                    data = response.json()
-                    tmdb_results = data.get('results', [])
-                    print(f"✅ TMDB 검색 성공: {len(tmdb_results)}개")
-
-                    # TMDB 결과를 movie_data에 추가
-                    existing_tmdb_ids = {movie.tmdb_id for movie in db_movies}
-
-                    for tmdb_movie in tmdb_results[:10]:  # 최대 10개
-                        if tmdb_movie['id'] not in existing_tmdb_ids:
-                            movie_data.append({
-                                'id': None,
-                                'tmdb_id': tmdb_movie['id'],
-                                'title': tmdb_movie.get('title', ''),
-                                'overview': tmdb_movie.get('overview', ''),
-                                'release_date': tmdb_movie.get('release_date', ''),
-                                'vote_average': tmdb_movie.get('vote_average', 0),
-                                'poster_url': f"https://image.tmdb.org/t/p/w500{tmdb_movie.get('poster_path', '')}" if tmdb_movie.get(
-                                    'poster_path') else '',
-                                'backdrop_url': f"https://image.tmdb.org/t/p/w1280{tmdb_movie.get('backdrop_path', '')}" if tmdb_movie.get(
-                                    'backdrop_path') else '',
-                                'genres': [],  # 일단 비워둠 (genre_ids 변환 필요)
-                                'source': 'tmdb'
-                            })
-                else:
+                if response.status_code != 200:
                     print(f"❌ TMDB API 오류: {response.status_code} - {response.text[:100]}")
+                response.raise_for_status()
+                return response.json()
 
+            try:
+                data = tmdb_cache.get_or_fetch('search/movie', params, fetch)
+                tmdb_results = data.get('results', [])
+                print(f"✅ TMDB 검색 성공: {len(tmdb_results)}개")
+
+                # TMDB 결과를 movie_data에 추가
+                existing_tmdb_ids = {movie.tmdb_id for movie in db_movies}
+
+                for tmdb_movie in tmdb_results[:10]:  # 최대 10개
+                    if tmdb_movie['id'] not in existing_tmdb_ids:
+                        movie_data.append(serialize_tmdb_movie(tmdb_movie))
             except requests.RequestException as e:
                 print(f"❌ TMDB 요청 실패: {e}")
         else:
@@ -181,36 +172,40 @@ def save_tmdb_movie(request):
                 'error': 'tmdb_id와 rating이 필요합니다.'
             }, status=400)
 
-        # TMDB에서 영화 상세 정보 가져와서 저장
-        movie_details = tmdb_service.get_movie_details(tmdb_id)
-        if not movie_details:
+        try:
+            rating = int(rating)
+            if rating not in [1, 2, 3, 4, 5]:
+                raise ValueError()
+        except (ValueError, TypeError):
             return Response({
                 'success': False,
-                'error': '영화 정보를 가져올 수 없습니다.'
-            }, status=404)
+                'error': 'rating은 1-5 사이의 정수여야 합니다.'
+            }, status=400)
 
-        # 영화 저장
-        movie = tmdb_service.save_movie_from_tmdb(movie_details)
-        if not movie:
+        try:
+            tmdb_id = int(tmdb_id)
+            if tmdb_id <= 0:
+                raise ValueError()
+        except (ValueError, TypeError):
             return Response({
                 'success': False,
-                'error': '영화 저장에 실패했습니다.'
-            }, status=500)
+                'error': 'tmdb_id는 양의 정수여야 합니다.'
+            }, status=400)
+
+        # DB에 없으면 임시 영화를 만들고 TMDB 상세 조회는 예약만 한다 (요청이 TMDB 응답을 기다리지 않음)
+        movie, details_pending = get_or_create_placeholder(tmdb_id)
 
-        # 평점 저장
-        preference, created = UserMoviePreference.objects.update_or_create(
-            user=request.user,
-            movie=movie,
-            defaults={'rating': rating}
-        )
+        # 평점 저장 + 성격 프로필 증분 갱신
+        preference, created = save_rating(request.user, movie, rating)
 
         return Response({
             'success': True,
-            'message': f'{movie.title} 평점이 저장되었습니다.',
+            'message': f'{movie.title or tmdb_id} 평점이 저장되었습니다.',
             'movie': {
                 'id': movie.id,
                 'title': movie.title,
-                'genres': [genre.name for genre in movie.genres.all()]
+                'genres': [genre.name for genre in movie.genres.all()],
+                'details_pending': details_pending,
             }
         })
 
@@ -222,6 +217,25 @@ def save_tmdb_movie(request):
         }, status=500)
 
 
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def autocomplete_movies(request):
+    """검색창 입력 중 제목 제안 - DB/TMDB 호출 없이 메모리 접두어 색인에서 인기도 순 조회"""
+    query = request.GET.get('q', '').strip()
+    try:
+        limit = int(request.GET.get('limit', 10))
+    except ValueError:
+        limit = 10
+
+    results = title_index.suggest(query, limit=limit) if query else []
+    return Response({
+        'success': True,
+        'query': query,
+        'count': len(results),
+        'results': results,
+    })
+
+
 
 # API 연결 상태 확인 엔드포인트
 @api_view(['GET'])
@@ -236,6 +250,19 @@ def check_tmdb_status(request):
     })
 
 
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def tmdb_metrics(request):
+    """TMDB 호출 계층 지표 (커넥션 풀 재사용률 등)"""
+    return Response({
+        'http_pool': tmdb_http.stats(),
+        'cache': tmdb_cache.info(),
+        'singleflight': tmdb_singleflight.stats(),
+        'rate_limiter': tmdb_rate_limiter.info(),
+        'autocomplete': title_index.info(),
+    })
+
+
 
 
 @api_view(['POST'])
@@ -286,29 +313,21 @@ def preferences_handler(request):
         print(f"📨 preferences_handler 요청: {request.method} - 사용자: {request.user}")
 
         if request.method == 'GET':
-            preferences = UserMoviePreference.objects.filter(
-                user=request.user
-            ).select_related('movie').order_by('-created_at')
-
-            preference_data = []
-            for pref in preferences:
-                preference_data.append({
-                    'id': pref.id,
-                    'movie': {
-                        'id': pref.movie.id,
-                        'title': pref.movie.title,
-                        'poster_url': getattr(pref.movie, 'poster_url', ''),
-                        'vote_average': getattr(pref.movie, 'vote_average', 0),
-                        'release_date': pref.movie.release_date,
-                    },
-                    'rating': pref.rating,
-                    'created_at': pref.created_at.isoformat(),
-                })
+            # 최근 평가 순 (created_at, id) 키셋 페이지네이션 - 평점이 많은 사용자도 응답 크기 고정
+            try:
+                preferences, next_cursor = keyset_page(
+                    preference_list_rows(request.user), 'created_at', request.GET.get('cursor'),
+                    page_size_from(request))
+            except InvalidCursor as e:
+                return Response({'success': False, 'error': str(e), 'count': 0, 'results': []}, status=400)
+
+            preference_data = [serialize_preference_row(row) for row in preferences]
 
             response_data = {
                 'success': True,
                 'count': len(preference_data),
-                'results': preference_data
+                'results': preference_data,
+                'next_cursor': next_cursor,
             }
 
             print(f"✅ GET 선호도 응답: {len(preference_data)}개")
@@ -318,12 +337,13 @@ def preferences_handler(request):
             print(f"📝 POST 요청 데이터: {request.data}")
 
             movie_id = request.data.get('movie_id')
+            tmdb_id = request.data.get('tmdb_id')
             rating = request.data.get('rating')
 
-            if not movie_id or not rating:
+            if not (movie_id or tmdb_id) or not rating:
                 return Response({
                     'success': False,
-                    'error': 'movie_id와 rating이 필요합니다.'
+                    'error': 'movie_id(또는 tmdb_id)와 rating이 필요합니다.'
                 }, status=400)
 
             try:
@@ -336,20 +356,27 @@ def preferences_handler(request):
                     'error': 'rating은 1-5 사이의 정수여야 합니다.'
                 }, status=400)
 
-            try:
-                movie = Movie.objects.get(id=movie_id)
-                print(f"🎬 영화 확인: {movie.title}")
-            except Movie.DoesNotExist:
-                return Response({
-                    'success': False,
-                    'error': '존재하지 않는 영화입니다.'
-                }, status=404)
-
-            preference, created = UserMoviePreference.objects.update_or_create(
-                user=request.user,
-                movie=movie,
-                defaults={'rating': rating}
-            )
+            if movie_id:
+                try:
+                    movie = Movie.objects.get(id=movie_id)
+                    print(f"🎬 영화 확인: {movie.title}")
+                except Movie.DoesNotExist:
+                    return Response({
+                        'success': False,
+                        'error': '존재하지 않는 영화입니다.'
+                    }, status=404)
+            else:
+                # DB에 없는 TMDB 영화는 임시 영화로 바로 저장 (상세 정보는 워커가 나중에 채움)
+                try:
+                    movie, _ = get_or_create_placeholder(tmdb_id)
+                except (ValueError, TypeError):
+                    return Response({
+                        'success': False,
+                        'error': 'tmdb_id는 양의 정수여야 합니다.'
+                    }, status=400)
+
+            # 평점 저장 + 성격 프로필 증분 갱신
+            preference, created = save_rating(request.user, movie, rating)
 
             response_data = {
                 'success': True,
@@ -374,3 +401,105 @@ def preferences_handler(request):
             'success': False,
             'error': f'요청 처리 실패: {str(e)}'
         }, status=500)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def recommend_movies(request):
+    """평점 기반 추천 - 평가한 영화와 비슷하게 평가된(item-item) 아직 보지 않은 영화"""
+    try:
+        limit = max(1, min(int(request.GET.get('limit', 20)), getattr(settings, 'MAX_PAGE_SIZE', 100)))
+    except ValueError:
+        limit = 20
+
+    try:
+        recommendations = recommend_for_user(request.user, limit=limit)
+    except Exception as e:
+        print(f"❌ 추천 오류: {e}")
+        traceback.print_exc()
+        return Response({'success': False, 'error': f'추천 실패: {str(e)}', 'results': []}, status=500)
+
+    results = [{**serialize_movie(movie), 'score': round(score, 4)} for movie, score in recommendations]
+    return Response({'success': True, 'count': len(results), 'results': results})
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def similar_movies(request, movie_id):
+    """장르/카테고리가 비슷한 영화 - build_similar_movies가 미리 계산한 이웃을 순위대로"""
+    try:
+        limit = max(1, min(int(request.GET.get('limit', 10)), getattr(settings, 'SIMILAR_MOVIES_NEIGHBORS', 20)))
+    except ValueError:
+        limit = 10
+
+    results = [
+        {**serialize_movie(movie), 'score': round(score, 4)} for movie, score in similar_movies_for(movie_id, limit)
+    ]
+    if not results and not Movie.objects.filter(id=movie_id).exists():
+        return Response({'success': False, 'error': '영화를 찾을 수 없습니다.', 'results': []}, status=404)
+    return Response({'success': True, 'movie_id': movie_id, 'count': len(results), 'results': results})
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def similar_users(request):
+    """Big Five 점수가 나와 가까운 사용자 - ?limit=로 상위 k명, ?radius=(점수 거리)를 주면 그 안의 사용자만"""
+    try:
+        limit = int(request.GET.get('limit', 10))
+        radius = request.GET.get('radius')
+        radius = float(radius) if radius else None
+    except ValueError:
+        return Response({'success': False, 'error': 'limit과 radius는 숫자여야 합니다.'}, status=400)
+
+    try:
+        results = similar_users_index.similar_to(get_profile(request.user), limit=limit, radius=radius)
+    except NotEnoughRatings as e:
+        return Response({'success': False, 'error': str(e), 'current_count': e.count}, status=400)
+    except Exception as e:
+        print(f"❌ 유사 사용자 조회 오류: {e}")
+        traceback.print_exc()
+        return Response({'success': False, 'error': f'유사 사용자 조회 실패: {str(e)}', 'results': []}, status=500)
+
+    return Response({'success': True, 'count': len(results), 'results': results})
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def import_preferences(request):
+    """평점 일괄 가져오기 - JSONL(기본) 또는 CSV(?file_format=csv / Content-Type: text/csv) 본문을 줄 단위로 처리
+
+    각 줄: {"movie_id": 1, "rating": 4} 또는 {"tmdb_id": 496243, "rating": 4.5, "watch_date": "2024-01-31"}
+    """
+    fmt = request_format(request)
+    if fmt is None:
+        return Response({'success': False, 'error': 'file_format은 jsonl 또는 csv여야 합니다.'}, status=400)
+    if request.stream is None:
+        return Response({'success': False, 'error': '가져올 평점이 없습니다.'}, status=400)
+
+    try:
+        # request.data 대신 원본 스트림을 읽어 본문 전체를 메모리에 올리지 않는다
+        summary = import_ratings(request.user, parse_lines(request.stream, fmt))
+    except (RatingImportError, UnicodeDecodeError, csv.Error) as e:
+        return Response({'success': False, 'error': f'가져오기 실패: {e}'}, status=400)
+    except Exception as e:
+        print(f"❌ 평점 가져오기 오류: {e}")
+        traceback.print_exc()
+        return Response({'success': False, 'error': f'가져오기 실패: {str(e)}'}, status=500)
+
+    print(f"✅ 평점 가져오기 - {request.user}: 새로 {summary['created']}개, 수정 {summary['updated']}개, "
+          f"건너뜀 {summary['skipped']}개")
+    return Response({'success': True, **summary})
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def export_preferences(request):
+    """평점 전체 내보내기 (JSONL 기본, ?file_format=csv) - 가져오기와 같은 형식으로 스트리밍"""
+    fmt = request_format(request)
+    if fmt is None:
+        return Response({'success': False, 'error': 'file_format은 jsonl 또는 csv여야 합니다.'}, status=400)
+
+    content_type = 'text/csv; charset=utf-8' if fmt == 'csv' else 'application/x-ndjson; charset=utf-8'
+    response = StreamingHttpResponse(export_lines(request.user, fmt), content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="ratings.{fmt}"'
+    return response